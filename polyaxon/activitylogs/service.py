@@ -9,10 +9,10 @@ class ActivityLogService(EventService):
     def __init__(self):
         self.activity_log = None
 
-    def record_event(self, event):
+    def get_activity_log(self, event):
         assert event.actor_id is not None
         actor_id = event.data[event.actor_id]
-        return self.activity_log.objects.create(
+        return self.activity_log(
             event_type=event.event_type,
             actor_id=actor_id if actor_id != user_system.USER_SYSTEM_ID else None,
             context=event.data,
@@ -21,6 +21,15 @@ class ActivityLogService(EventService):
             content_type_id=event.instance_contenttype
         )
 
+    def record_event(self, event):
+        activity_log = self.get_activity_log(event)
+        activity_log.save()
+        return activity_log
+
+    def record_batch(self, events):
+        return self.activity_log.objects.bulk_create(
+            [self.get_activity_log(event) for event in events])
+
     def setup(self):
         super().setup()
         # Load default event types
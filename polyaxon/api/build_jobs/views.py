@@ -1,8 +1,4 @@
 import logging
-import mimetypes
-import os
-
-from wsgiref.util import FileWrapper
 
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
@@ -16,8 +12,6 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
-from django.http import StreamingHttpResponse
-
 import auditor
 
 from api.build_jobs import queries
@@ -32,6 +26,7 @@ from api.filters import OrderingFilter, QueryFilter
 from api.utils.views.auditor_mixin import AuditorMixinView
 from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
 from api.utils.views.list_create import ListCreateAPIView
+from api.utils.views.logs import LogsViewMixin
 from api.utils.views.post import PostAPIView
 from db.models.build_jobs import BuildJob, BuildJobStatus
 from db.redis.heartbeat import RedisHeartBeat
@@ -172,7 +167,7 @@ class BuildStatusDetailView(BuildViewMixin, RetrieveAPIView):
     lookup_field = 'uuid'
 
 
-class BuildLogsView(BuildViewMixin, RetrieveAPIView):
+class BuildLogsView(BuildViewMixin, LogsViewMixin, RetrieveAPIView):
     """Get build logs."""
     permission_classes = (IsAuthenticated,)
 
@@ -183,20 +178,7 @@ class BuildLogsView(BuildViewMixin, RetrieveAPIView):
                        actor_id=request.user.id,
                        actor_name=request.user.username)
         log_path = get_job_logs_path(job.unique_name)
-
-        filename = os.path.basename(log_path)
-        chunk_size = 8192
-        try:
-            wrapped_file = FileWrapper(open(log_path, 'rb'), chunk_size)
-            response = StreamingHttpResponse(wrapped_file,
-                                             content_type=mimetypes.guess_type(log_path)[0])
-            response['Content-Length'] = os.path.getsize(log_path)
-            response['Content-Disposition'] = "attachment; filename={}".format(filename)
-            return response
-        except FileNotFoundError:
-            _logger.warning('Log file not found: log_path=%s', log_path)
-            return Response(status=status.HTTP_404_NOT_FOUND,
-                            data='Log file not found: log_path={}'.format(log_path))
+        return self.get_logs_response(log_path=log_path)
 
 
 class BuildStopView(CreateAPIView):
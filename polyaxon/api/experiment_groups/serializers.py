@@ -91,25 +91,25 @@ class ExperimentGroupDetailSerializer(BookmarkedExperimentGroupSerializer, TagsS
         )
 
     def get_num_experiments(self, obj):
-        return obj.group_experiments.count()
+        return obj.experiments_stats['num_experiments']
 
     def get_num_pending_experiments(self, obj):
-        return obj.pending_experiments.count()
+        return obj.experiments_stats['num_pending_experiments']
 
     def get_num_running_experiments(self, obj):
-        return obj.running_experiments.count()
+        return obj.experiments_stats['num_running_experiments']
 
     def get_num_scheduled_experiments(self, obj):
-        return obj.scheduled_experiments.count()
+        return obj.experiments_stats['num_scheduled_experiments']
 
     def get_num_succeeded_experiments(self, obj):
-        return obj.succeeded_experiments.count()
+        return obj.experiments_stats['num_succeeded_experiments']
 
     def get_num_failed_experiments(self, obj):
-        return obj.failed_experiments.count()
+        return obj.experiments_stats['num_failed_experiments']
 
     def get_num_stopped_experiments(self, obj):
-        return obj.stopped_experiments.count()
+        return obj.experiments_stats['num_stopped_experiments']
 
     def get_current_iteration(self, obj):
         return obj.iterations.count()
@@ -12,6 +12,7 @@ from db.models.experiments import (
     ExperimentMetric,
     ExperimentStatus
 )
+from db.models.resources_metrics import ResourcesMetric
 from libs.spec_validation import validate_experiment_spec_config
 
 
@@ -63,6 +64,25 @@ class ExperimentStatusSerializer(serializers.ModelSerializer):
         extra_kwargs = {'experiment': {'read_only': True}}
 
 
+class ExperimentMetricListSerializer(serializers.ListSerializer):
+    """Creates a batch of metrics with bulk inserts.
+
+    The experiment's last metric is updated, and the new metric event is recorded,
+    once per batch instead of once per metric.
+    """
+    BATCH_SIZE = 1000
+
+    def create(self, validated_data):
+        if not validated_data:
+            return []
+        experiment = validated_data[0]['experiment']
+        metrics = ExperimentMetric.objects.bulk_create(
+            [ExperimentMetric(**attrs) for attrs in validated_data],
+            batch_size=self.BATCH_SIZE)
+        experiment.update_last_metric(metrics=[metric.values for metric in metrics])
+        return metrics
+
+
 class ExperimentMetricSerializer(serializers.ModelSerializer):
     uuid = fields.UUIDField(format='hex', read_only=True)
 
@@ -70,6 +90,23 @@ class ExperimentMetricSerializer(serializers.ModelSerializer):
         model = ExperimentMetric
         exclude = []
         extra_kwargs = {'experiment': {'read_only': True}}
+        list_serializer_class = ExperimentMetricListSerializer
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Only return the requested metrics
+        metrics = self.context.get('metrics')
+        if metrics and data.get('values'):
+            data['values'] = {
+                key: value for key, value in data['values'].items() if key in metrics
+            }
+        return data
+
+
+class ResourcesMetricSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ResourcesMetric
+        exclude = ['id']
 
 
 class ExperimentChartViewSerializer(serializers.ModelSerializer):
@@ -43,6 +43,9 @@ experiments_urlpatterns = [
     re_path(r'^{}/{}/experiments/{}/metrics/?$'.format(
         USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN),
         views.ExperimentMetricListView.as_view()),
+    re_path(r'^{}/{}/experiments/{}/resources/?$'.format(
+        USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN),
+        views.ExperimentResourcesMetricListView.as_view()),
     re_path(r'^{}/{}/experiments/{}/chartviews/?$'.format(
         USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN),
         views.ExperimentChartViewListView.as_view()),
@@ -91,6 +94,9 @@ jobs_urlpatterns = [
         USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN, ID_PATTERN,
         UUID_PATTERN),
         views.ExperimentJobStatusDetailView.as_view()),
+    re_path(r'^{}/{}/experiments/{}/jobs/{}/resources/?$'.format(
+        USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN, ID_PATTERN),
+        views.ExperimentJobResourcesMetricListView.as_view()),
 ]
 
 urlpatterns = format_suffix_patterns(experiments_urlpatterns + jobs_urlpatterns)
@@ -20,7 +20,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
+from django.contrib.postgres.fields.jsonb import KeyTextTransform, KeyTransform
+from django.db.models import CharField, F, FloatField, Func, Window
+from django.db.models.functions import Cast, Ntile
 from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
 
 import auditor
 
@@ -38,12 +42,15 @@ from api.experiments.serializers import (
     ExperimentLastMetricSerializer,
     ExperimentMetricSerializer,
     ExperimentSerializer,
-    ExperimentStatusSerializer
+    ExperimentStatusSerializer,
+    ResourcesMetricSerializer
 )
 from api.filters import OrderingFilter, QueryFilter
 from api.paginator import LargeLimitOffsetPagination
 from api.utils.views.auditor_mixin import AuditorMixinView
+from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
 from api.utils.views.list_create import ListCreateAPIView
+from api.utils.views.logs import LogsViewMixin
 from api.utils.views.post import PostAPIView
 from api.utils.views.protected import ProtectedView
 from constants.experiments import ExperimentLifeCycle
@@ -56,6 +63,7 @@ from db.models.experiments import (
     ExperimentStatus
 )
 from db.models.projects import Project
+from db.models.resources_metrics import ResourcesMetric, ResourcesMetricResolution
 from db.redis.ephemeral_tokens import RedisEphemeralTokens
 from db.redis.heartbeat import RedisHeartBeat
 from db.redis.tll import RedisTTL
@@ -84,6 +92,7 @@ from event_manager.events.project import PROJECT_EXPERIMENTS_VIEWED
 from libs.archive import archive_experiment_outputs, archive_outputs_file
 from libs.authentication.ephemeral import EphemeralAuthentication
 from libs.authentication.internal import InternalAuthentication
+from libs.downsampling import DownsamplingMethods, downsample, min_max_buckets
 from libs.paths.exceptions import VolumeNotFoundError
 from libs.paths.experiments import get_experiment_logs_path, get_experiment_outputs_path
 from libs.permissions.ephemeral import IsEphemeral
@@ -104,7 +113,7 @@ class ExperimentListView(ListAPIView):
     permission_classes = (IsAuthenticated,)
 
 
-class ProjectExperimentListView(ListCreateAPIView):
+class ProjectExperimentListView(BookmarkedListMixinView, ListCreateAPIView):
     """
     get:
         List experiments under a project.
@@ -456,10 +465,78 @@ class ExperimentStatusListView(ExperimentViewMixin, ListCreateAPIView):
         return response
 
 
+def filter_created_at_range(queryset, query_params):
+    """Filters the queryset by the time range `start`/`end`."""
+    for param, lookup in (('start', 'created_at__gte'), ('end', 'created_at__lte')):
+        value = query_params.get(param)
+        if not value:
+            continue
+        try:
+            value = parse_datetime(value)
+        except ValueError:
+            value = None
+        if not value:
+            raise ValidationError('`{}` must be a valid datetime.'.format(param))
+        queryset = queryset.filter(**{lookup: value})
+    return queryset
+
+
+def get_metrics_names(query_params):
+    metrics = query_params.get('metrics')
+    if not metrics:
+        return None
+    return {metric.strip() for metric in metrics.split(',') if metric.strip()} or None
+
+
+def get_metric_points(queryset, name):
+    """Filters the rows having a numeric value for the metric, and selects this value only."""
+    return queryset.filter(values__has_key=name).annotate(
+        value_type=Func(KeyTransform(name, 'values'),
+                        function='jsonb_typeof',
+                        output_field=CharField())
+    ).filter(value_type='number').annotate(
+        value=Cast(KeyTextTransform(name, 'values'), FloatField()))
+
+
+def downsample_metrics(queryset, metrics, max_points, method):
+    """Returns the ids of the rows to keep when downsampling every metric to `max_points`.
+
+    Only the metric's value is read from the rows' values, one metric at a time,
+    and the min-max buckets are computed by the database.
+    """
+    queryset = queryset.order_by()
+    if not metrics:
+        metrics = queryset.annotate(
+            name=Func(F('values'), function='jsonb_object_keys', output_field=CharField())
+        ).values_list('name', flat=True).distinct()
+
+    selected_ids = set()
+    for name in metrics:
+        metric_points = get_metric_points(queryset=queryset, name=name).order_by('created_at')
+        if method == DownsamplingMethods.MIN_MAX and max_points >= 2:
+            metric_points = metric_points.annotate(
+                bucket=Window(expression=Ntile(max_points // 2), order_by=F('created_at').asc()))
+            selected_ids |= min_max_buckets(
+                metric_points.values_list('bucket', 'id', 'value').iterator())
+            continue
+
+        ids = []
+        points = []
+        for metric_id, created_at, value in metric_points.values_list(
+                'id', 'created_at', 'value').iterator():
+            ids.append(metric_id)
+            points.append((created_at.timestamp(), value))
+        indices = downsample(points=points, threshold=max_points, method=method)
+        selected_ids.update(ids[i] for i in indices)
+    return selected_ids
+
+
 class ExperimentMetricListView(ExperimentViewMixin, ListCreateAPIView):
     """
     get:
-        List all metrics of an experiment.
+        List all metrics of an experiment,
+        can be filtered by `metrics` names, `start`, `end`,
+        and downsampled to `max_points` per metric with `downsampling` (lttb or minmax).
     post:
         Create an experiment metric.
     """
@@ -472,6 +549,38 @@ class ExperimentMetricListView(ExperimentViewMixin, ListCreateAPIView):
     pagination_class = LargeLimitOffsetPagination
     throttle_scope = 'high'
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['metrics'] = get_metrics_names(self.request.query_params)
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        query_params = self.request.query_params
+        queryset = filter_created_at_range(queryset=queryset, query_params=query_params)
+        metrics = get_metrics_names(query_params)
+        if metrics:
+            queryset = queryset.filter(values__has_any_keys=list(metrics))
+
+        max_points = query_params.get('max_points')
+        if not max_points:
+            return queryset
+        try:
+            max_points = int(max_points)
+        except (TypeError, ValueError):
+            max_points = 0
+        if max_points <= 0:
+            raise ValidationError('`max_points` must be a positive integer.')
+        method = query_params.get('downsampling', DownsamplingMethods.LTTB)
+        if method not in DownsamplingMethods.VALUES:
+            raise ValidationError(
+                '`downsampling` must be one of {}.'.format(sorted(DownsamplingMethods.VALUES)))
+        selected_ids = downsample_metrics(queryset=queryset,
+                                          metrics=metrics,
+                                          max_points=max_points,
+                                          method=method)
+        return queryset.filter(id__in=selected_ids)
+
     def perform_create(self, serializer):
         serializer.save(experiment=self.get_experiment())
 
@@ -554,7 +663,7 @@ class ExperimentJobDetailView(AuditorMixinView, ExperimentViewMixin, RetrieveUpd
     get_event = EXPERIMENT_JOB_VIEWED
 
 
-class ExperimentLogsView(ExperimentViewMixin, RetrieveAPIView, PostAPIView):
+class ExperimentLogsView(ExperimentViewMixin, LogsViewMixin, RetrieveAPIView, PostAPIView):
     """
     get:
         Get experiment logs.
@@ -570,20 +679,7 @@ class ExperimentLogsView(ExperimentViewMixin, RetrieveAPIView, PostAPIView):
                        actor_id=request.user.id,
                        actor_name=request.user.username)
         log_path = get_experiment_logs_path(experiment.unique_name)
-
-        filename = os.path.basename(log_path)
-        chunk_size = 8192
-        try:
-            wrapped_file = FileWrapper(open(log_path, 'rb'), chunk_size)
-            response = StreamingHttpResponse(wrapped_file,
-                                             content_type=mimetypes.guess_type(log_path)[0])
-            response['Content-Length'] = os.path.getsize(log_path)
-            response['Content-Disposition'] = "attachment; filename={}".format(filename)
-            return response
-        except FileNotFoundError:
-            _logger.warning('Log file not found: log_path=%s', log_path)
-            return Response(status=status.HTTP_404_NOT_FOUND,
-                            data='Log file not found: log_path={}'.format(log_path))
+        return self.get_logs_response(log_path=log_path)
 
     def post(self, request, *args, **kwargs):
         experiment = self.get_experiment()
@@ -666,6 +762,22 @@ class ExperimentJobStatusListView(ExperimentJobViewMixin, ListCreateAPIView):
         return response
 
 
+class ExperimentJobResourcesMetricListView(ExperimentJobViewMixin, ListAPIView):
+    """
+    get:
+        List the resources metrics of an experiment job,
+        can be filtered by `start`, `end` and `resolution`.
+    """
+    queryset = ResourcesMetric.objects.all()
+    serializer_class = ResourcesMetricSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = LargeLimitOffsetPagination
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return filter_resources_metrics(queryset=queryset, query_params=self.request.query_params)
+
+
 class ExperimentJobStatusDetailView(ExperimentJobViewMixin, RetrieveUpdateAPIView):
     """
     get:
@@ -822,6 +934,34 @@ class ExperimentScopeTokenView(PostAPIView):
         return Response({'token': token.key}, status=status.HTTP_200_OK)
 
 
+def filter_resources_metrics(queryset, query_params):
+    """Filters the resources metrics by time range `start`/`end` and `resolution`."""
+    queryset = filter_created_at_range(queryset=queryset, query_params=query_params)
+    resolution = query_params.get('resolution')
+    if resolution:
+        resolutions = {label: value for value, label in ResourcesMetricResolution.CHOICES}
+        if resolution not in resolutions:
+            raise ValidationError('`resolution` must be one of {}.'.format(sorted(resolutions)))
+        queryset = queryset.filter(resolution=resolutions[resolution])
+    return queryset
+
+
+class ExperimentResourcesMetricListView(ExperimentViewMixin, ListAPIView):
+    """
+    get:
+        List the resources metrics of all jobs of an experiment,
+        can be filtered by `start`, `end` and `resolution`.
+    """
+    queryset = ResourcesMetric.objects.all()
+    serializer_class = ResourcesMetricSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = LargeLimitOffsetPagination
+
+    def filter_queryset(self, queryset):
+        queryset = queryset.filter(job__experiment=self.get_experiment())
+        return filter_resources_metrics(queryset=queryset, query_params=self.request.query_params)
+
+
 class ExperimentChartViewListView(ExperimentViewMixin, ListCreateAPIView):
     """
     get:
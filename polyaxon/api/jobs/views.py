@@ -31,7 +31,9 @@ from api.jobs.serializers import (
     JobStatusSerializer
 )
 from api.utils.views.auditor_mixin import AuditorMixinView
+from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
 from api.utils.views.list_create import ListCreateAPIView
+from api.utils.views.logs import LogsViewMixin
 from api.utils.views.post import PostAPIView
 from api.utils.views.protected import ProtectedView
 from db.models.jobs import Job, JobStatus
@@ -63,7 +65,7 @@ from polyaxon.settings import SchedulerCeleryTasks
 _logger = logging.getLogger("polyaxon.views.jobs")
 
 
-class ProjectJobListView(ListCreateAPIView):
+class ProjectJobListView(BookmarkedListMixinView, ListCreateAPIView):
     """
     get:
         List jobs under a project.
@@ -238,7 +240,7 @@ class JobStatusDetailView(JobViewMixin, RetrieveAPIView):
     lookup_field = 'uuid'
 
 
-class JobLogsView(JobViewMixin, RetrieveAPIView):
+class JobLogsView(JobViewMixin, LogsViewMixin, RetrieveAPIView):
     """Get job logs."""
     permission_classes = (IsAuthenticated,)
 
@@ -249,20 +251,7 @@ class JobLogsView(JobViewMixin, RetrieveAPIView):
                        actor_id=request.user.id,
                        actor_name=request.user.username)
         log_path = get_job_logs_path(job.unique_name)
-
-        filename = os.path.basename(log_path)
-        chunk_size = 8192
-        try:
-            wrapped_file = FileWrapper(open(log_path, 'rb'), chunk_size)
-            response = StreamingHttpResponse(wrapped_file,
-                                             content_type=mimetypes.guess_type(log_path)[0])
-            response['Content-Length'] = os.path.getsize(log_path)
-            response['Content-Disposition'] = "attachment; filename={}".format(filename)
-            return response
-        except FileNotFoundError:
-            _logger.warning('Log file not found: log_path=%s', log_path)
-            return Response(status=status.HTTP_404_NOT_FOUND,
-                            data='Log file not found: log_path={}'.format(log_path))
+        return self.get_logs_response(log_path=log_path)
 
 
 class JobStopView(CreateAPIView):
@@ -11,6 +11,7 @@ from api.projects.serializers import (
     ProjectSerializer
 )
 from api.utils.views.auditor_mixin import AuditorMixinView
+from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
 from db.models.projects import Project
 from event_manager.events.project import (
     PROJECT_CREATED,
@@ -36,7 +37,7 @@ class ProjectCreateView(CreateAPIView):
         auditor.record(event_type=PROJECT_CREATED, instance=instance)
 
 
-class ProjectListView(ListAPIView):
+class ProjectListView(BookmarkedListMixinView, ListAPIView):
     """List projects for a user."""
     queryset = queries.projects.order_by('-updated_at')
     serializer_class = BookmarkedProjectSerializer
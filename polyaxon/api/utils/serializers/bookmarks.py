@@ -1,6 +1,17 @@
 from rest_framework import serializers
 
-from db.models.bookmarks import Bookmark
+from db.getters.bookmarks import get_bookmarked_ids
+
+
+def get_request_bookmarks(request, content_type):
+    """Returns the ids of the objects bookmarked by the request's user, fetched once per request."""
+    if not hasattr(request, '_bookmarked_ids'):
+        request._bookmarked_ids = {}
+    if content_type not in request._bookmarked_ids:
+        request._bookmarked_ids[content_type] = get_bookmarked_ids(
+            user_id=request.user.id,
+            content_type=content_type)
+    return request._bookmarked_ids[content_type]
 
 
 class BookmarkedSerializerMixin(serializers.Serializer):
@@ -11,15 +22,11 @@ class BookmarkedSerializerMixin(serializers.Serializer):
     def get_bookmarked(self, obj):
         bookmarks = self.context.get('bookmarks', None)
 
-        if bookmarks is not None:
-            return obj.id in bookmarks
-        else:
+        if bookmarks is None:
             # Get the requesting user if set in the context
             request = self.context.get('request', None)
-            if request:
-                return Bookmark.objects.filter(
-                    user=request.user,
-                    content_type__model=self.bookmarked_model,
-                    object_id=obj.id,
-                    enabled=True).exists()
-        return False
+            if not request:
+                return False
+            bookmarks = get_request_bookmarks(request=request,
+                                              content_type=self.bookmarked_model)
+        return obj.id in bookmarks
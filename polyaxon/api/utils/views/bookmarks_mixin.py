@@ -1,29 +1,15 @@
-from api.utils.serializers.bookmarks import BookmarkedSerializerMixin
-from db.models.bookmarks import Bookmark
+from api.utils.serializers.bookmarks import BookmarkedSerializerMixin, get_request_bookmarks
 
 
 class BookmarkedListMixinView(object):
     def get_serializer(self, *args, **kwargs):
         serializer_class = self.get_serializer_class()
-        if not isinstance(serializer_class, BookmarkedSerializerMixin):
+        if not issubclass(serializer_class, BookmarkedSerializerMixin):
             return super().get_serializer(*args, **kwargs)
 
-        queryset = args[0]
-
-        if not queryset:
-            return super().get_serializer(*args, **kwargs)
-
-        object_ids = [o.id for o in queryset]
-
-        # Batch-get all the bookmarks for the objects in the queryset
-        # and pass them on to the serializer
-        bookmarks = Bookmark.objects.filter(
-            user=self.request.user,
-            content_type__model=self.serializer_class.bookmarked_model,
-            object_id__in=object_ids,
-            enabled=True).values_list('id', flat=True)
-
+        # Get all the bookmarks of the user once and pass them on to the serializer
         context = self.get_serializer_context()
-        context['bookmarks'] = list(bookmarks)
+        context['bookmarks'] = get_request_bookmarks(request=self.request,
+                                                     content_type=serializer_class.bookmarked_model)
         kwargs['context'] = context
         return serializer_class(*args, **kwargs)
@@ -0,0 +1,93 @@
+import logging
+import mimetypes
+import os
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+
+from libs.logs_store import get_logs_store
+
+_logger = logging.getLogger('polyaxon.views.logs')
+
+
+def get_int_param(query_params, param):
+    value = query_params.get(param)
+    if value is None or value == '':
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = -1
+    if value < 0:
+        raise ValidationError('`{}` must be a positive integer.'.format(param))
+    return value
+
+
+def get_timestamp_param(query_params, param):
+    value = query_params.get(param)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        value = parse_datetime(value)
+    except ValueError:
+        value = None
+    if not value:
+        raise ValidationError('`{}` must be a valid datetime or timestamp.'.format(param))
+    return value.timestamp()
+
+
+class LogsViewMixin(object):
+    """A mixin to read logs.
+
+    By default the whole logs are streamed as an attachment,
+    a selection can be requested with one of:
+        * `tail`: the last n lines.
+        * `start_line` and/or `end_line`: a range of lines, line numbers start at 0.
+        * `since`: the lines logged since a datetime or a timestamp.
+    """
+
+    @staticmethod
+    def _get_lines_response(lines):
+        return StreamingHttpResponse((line + '\n' for line in lines),
+                                     content_type='text/plain')
+
+    def get_logs_response(self, log_path):
+        query_params = self.request.query_params
+        tail = get_int_param(query_params, 'tail')
+        start_line = get_int_param(query_params, 'start_line')
+        end_line = get_int_param(query_params, 'end_line')
+        since = get_timestamp_param(query_params, 'since')
+        is_range = start_line is not None or end_line is not None
+        if len([1 for selection in [tail is not None, is_range, since is not None]
+                if selection]) > 1:
+            raise ValidationError('Only one of `tail`, `start_line/end_line` or `since` '
+                                  'could be requested.')
+
+        logs_store = get_logs_store(log_path)
+        if not logs_store.exists():
+            _logger.warning('Log file not found: log_path=%s', log_path)
+            return Response(status=status.HTTP_404_NOT_FOUND,
+                            data='Log file not found: log_path={}'.format(log_path))
+
+        if tail is not None:
+            return self._get_lines_response(logs_store.tail(num_lines=tail))
+        if is_range:
+            return self._get_lines_response(logs_store.read_range(start_line=start_line,
+                                                                  end_line=end_line))
+        if since is not None:
+            return self._get_lines_response(logs_store.read_since(timestamp=since))
+
+        filename = os.path.basename(log_path)
+        response = StreamingHttpResponse(logs_store.iter_chunks(),
+                                         content_type=mimetypes.guess_type(log_path)[0])
+        response['Content-Length'] = logs_store.get_size()
+        response['Content-Disposition'] = "attachment; filename={}".format(filename)
+        return response
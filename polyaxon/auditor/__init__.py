@@ -1,11 +1,20 @@
+from django.conf import settings
+
 from hestia.service_interface import LazyServiceWrapper
 
 from auditor.manager import default_manager
 from auditor.service import AuditorService
 
+
+def get_auditor_backend():
+    if settings.AUDITOR_BACKEND == settings.AUDITOR_BACKEND_BATCH:
+        return 'auditor.batch_auditor.BatchAuditorService'
+    return 'auditor.service.AuditorService'
+
+
 backend = LazyServiceWrapper(
     backend_base=AuditorService,
-    backend_path='auditor.service.AuditorService',
+    backend_path=get_auditor_backend(),
     options={}
 )
 backend.expose(locals())
@@ -0,0 +1,22 @@
+from django.conf import settings
+
+from auditor.service import AuditorService
+from db.redis.auditor import RedisAuditor
+
+
+class BatchAuditorService(AuditorService):
+    """An auditor service that buffers the events in redis.
+
+    Instead of sending three tasks per event, the events are drained in batches
+    by a single task, that tracks, logs and notifies them in bulk.
+    """
+
+    def record_event(self, event):
+        from polyaxon.celery_api import celery_app
+        from polyaxon.settings import EventsCeleryTasks
+
+        event = event.serialize(dumps=False, include_actor_name=True, include_instance_info=True)
+
+        if RedisAuditor.push_event(event):
+            celery_app.send_task(EventsCeleryTasks.EVENTS_RECORD_BATCH,
+                                 countdown=settings.AUDITOR_BATCH_INTERVAL)
@@ -4,7 +4,8 @@ from event_manager.event_service import EventService
 
 class AuditorService(EventService):
     """An service that just passes the event to author services."""
-    __all__ = EventService.__all__ + ('log', 'notify', 'track')
+    __all__ = EventService.__all__ + (
+        'log', 'notify', 'track', 'log_events', 'notify_events', 'track_events')
 
     event_manager = default_manager
 
@@ -35,6 +36,15 @@ class AuditorService(EventService):
     def log(self, event):
         self.activitylogs.record(event_type=event['type'], event_data=event)
 
+    def notify_events(self, events):
+        self.notifier.record_events(events)
+
+    def track_events(self, events):
+        self.tracker.record_events(events)
+
+    def log_events(self, events):
+        self.activitylogs.record_events(events)
+
     def setup(self):
         super().setup()
         # Load default event types
@@ -1,7 +1,11 @@
 from datetime import datetime, timedelta
 
+from django.utils import timezone
+
 from db.models.activitylogs import ActivityLog
 from db.models.notification import NotificationEvent
+from db.models.resources_metrics import ResourcesMetric, ResourcesMetricResolution
+from libs.resources_metrics import rollup_resources_metrics
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import CleaningIntervals, CronsCeleryTasks
 
@@ -16,3 +20,18 @@ def clean_activity_logs():
 def clean_notifications():
     last_date = datetime.today() - timedelta(days=CleaningIntervals.NOTIFICATIONS)
     NotificationEvent.objects.filter(created_at__lte=last_date).delete()
+
+
+@celery_app.task(name=CronsCeleryTasks.CLEAN_RESOURCES_METRICS, ignore_result=True)
+def clean_resources_metrics():
+    now = datetime.now(tz=timezone.utc)
+    rollup_resources_metrics(
+        source_resolution=ResourcesMetricResolution.RAW,
+        resolution=ResourcesMetricResolution.MINUTE,
+        older_than=now - timedelta(hours=CleaningIntervals.RESOURCES_METRICS_RAW))
+    rollup_resources_metrics(
+        source_resolution=ResourcesMetricResolution.MINUTE,
+        resolution=ResourcesMetricResolution.HOUR,
+        older_than=now - timedelta(days=CleaningIntervals.RESOURCES_METRICS_MINUTE))
+    last_date = now - timedelta(days=CleaningIntervals.RESOURCES_METRICS)
+    ResourcesMetric.objects.filter(created_at__lte=last_date).delete()
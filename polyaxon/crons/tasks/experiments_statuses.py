@@ -2,6 +2,7 @@ from django.db.models import Count
 
 from constants.experiments import ExperimentLifeCycle
 from db.models.experiments import Experiment
+from db.redis.statuses import RedisStatuses
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import CronsCeleryTasks, SchedulerCeleryTasks
 
@@ -11,7 +12,10 @@ def experiments_sync_jobs_statuses():
     experiments = Experiment.objects.exclude(
         status__status__in=ExperimentLifeCycle.DONE_STATUS)
     experiments = experiments.annotate(num_jobs=Count('jobs')).filter(num_jobs__gt=0)
-    for experiment in experiments:
-        celery_app.send_task(
-            SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
-            kwargs={'experiment_id': experiment.id})
+    experiment_ids = list(experiments.values_list('id', flat=True))
+    if not experiment_ids:
+        return
+
+    # The drain is scheduled regardless of any pending one, this also recovers lost drains
+    RedisStatuses.mark_experiments(experiment_ids=experiment_ids)
+    celery_app.send_task(SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUSES)
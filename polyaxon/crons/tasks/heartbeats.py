@@ -3,32 +3,39 @@ from constants.jobs import JobLifeCycle
 from db.models.build_jobs import BuildJob
 from db.models.experiments import Experiment
 from db.models.jobs import Job
+from db.redis.heartbeat import RedisHeartBeat
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import CronsCeleryTasks, SchedulerCeleryTasks
 
 
 @celery_app.task(name=CronsCeleryTasks.HEARTBEAT_EXPERIMENTS, ignore_result=True)
 def heartbeat_experiments():
-    experiments = Experiment.objects.filter(status__status__in=ExperimentLifeCycle.HEARTBEAT_STATUS)
-    for experiment in experiments:
+    experiment_ids = Experiment.objects.filter(
+        status__status__in=ExperimentLifeCycle.HEARTBEAT_STATUS).values_list('id', flat=True)
+    experiment_ids = RedisHeartBeat.get_dead_experiments(experiment_ids=experiment_ids)
+    if experiment_ids:
         celery_app.send_task(
-            SchedulerCeleryTasks.EXPERIMENTS_CHECK_HEARTBEAT,
-            kwargs={'experiment_id': experiment.id})
+            SchedulerCeleryTasks.EXPERIMENTS_CHECK_HEARTBEATS,
+            kwargs={'experiment_ids': experiment_ids})
 
 
 @celery_app.task(name=CronsCeleryTasks.HEARTBEAT_JOBS, ignore_result=True)
 def heartbeat_jobs():
-    jobs = Job.objects.filter(status__status__in=JobLifeCycle.HEARTBEAT_STATUS)
-    for job in jobs:
+    job_ids = Job.objects.filter(
+        status__status__in=JobLifeCycle.HEARTBEAT_STATUS).values_list('id', flat=True)
+    job_ids = RedisHeartBeat.get_dead_jobs(job_ids=job_ids)
+    if job_ids:
         celery_app.send_task(
-            SchedulerCeleryTasks.JOBS_CHECK_HEARTBEAT,
-            kwargs={'job_id': job.id})
+            SchedulerCeleryTasks.JOBS_CHECK_HEARTBEATS,
+            kwargs={'job_ids': job_ids})
 
 
 @celery_app.task(name=CronsCeleryTasks.HEARTBEAT_BUILDS, ignore_result=True)
 def heartbeat_builds():
-    build_jobs = BuildJob.objects.filter(status__status__in=JobLifeCycle.HEARTBEAT_STATUS)
-    for build_job in build_jobs:
+    build_job_ids = BuildJob.objects.filter(
+        status__status__in=JobLifeCycle.HEARTBEAT_STATUS).values_list('id', flat=True)
+    build_job_ids = RedisHeartBeat.get_dead_builds(build_ids=build_job_ids)
+    if build_job_ids:
         celery_app.send_task(
-            SchedulerCeleryTasks.BUILD_JOBS_CHECK_HEARTBEAT,
-            kwargs={'build_job_id': build_job.id})
+            SchedulerCeleryTasks.BUILD_JOBS_CHECK_HEARTBEATS,
+            kwargs={'build_job_ids': build_job_ids})
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from db.models.build_jobs import BuildJob
+from db.models.experiments import Experiment
+from db.models.jobs import Job
+from polyaxon.celery_api import celery_app
+from polyaxon.settings import CleaningIntervals, CronsCeleryTasks, Intervals, SchedulerCeleryTasks
+
+
+@celery_app.task(name=CronsCeleryTasks.ARCHIVE_LOGS, ignore_result=True)
+def archive_logs():
+    """Archives the logs of the experiments and jobs done since the previous passes.
+
+    The window spans several passes so that a delayed pass does not skip any logs,
+    archiving already archived logs is a no-op.
+    """
+    last_date = datetime.now(tz=timezone.utc) - timedelta(minutes=CleaningIntervals.LOGS_ARCHIVE)
+    first_date = last_date - timedelta(seconds=3 * Intervals.ARCHIVE_LOGS)
+    finished_filters = {'finished_at__gt': first_date, 'finished_at__lte': last_date}
+
+    experiments = Experiment.objects.filter(**finished_filters).select_related(
+        'project__user', 'experiment_group__project__user')
+    experiment_names = [experiment.unique_name for experiment in experiments]
+    if experiment_names:
+        celery_app.send_task(
+            SchedulerCeleryTasks.EXPERIMENTS_ARCHIVE_LOGS,
+            kwargs={'experiment_names': experiment_names})
+
+    job_names = []
+    for model in (Job, BuildJob):
+        jobs = model.objects.filter(**finished_filters).select_related('project__user')
+        job_names += [job.unique_name for job in jobs]
+    if job_names:
+        celery_app.send_task(
+            SchedulerCeleryTasks.JOBS_ARCHIVE_LOGS,
+            kwargs={'job_names': job_names})
@@ -0,0 +1,9 @@
+from db.models.bookmarks import Bookmark
+
+
+def get_bookmarked_ids(user_id, content_type):
+    """Returns the ids of the objects of a content type bookmarked by a user."""
+    return set(Bookmark.objects.filter(
+        user_id=user_id,
+        content_type__model=content_type,
+        enabled=True).values_list('object_id', flat=True))
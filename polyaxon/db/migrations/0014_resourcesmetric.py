@@ -0,0 +1,43 @@
+# Generated by Django 2.1.3 on 2018-11-12 10:21
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0013_auto_20181107_1718'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourcesMetric',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('resolution', models.PositiveIntegerField(choices=[(0, 'raw'), (60, 'minute'), (3600, 'hour')], default=0)),
+                ('n_cpus', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('cpu_percentage', models.FloatField()),
+                ('cpu_percentage_max', models.FloatField()),
+                ('memory_used', models.BigIntegerField()),
+                ('memory_used_max', models.BigIntegerField()),
+                ('memory_limit', models.BigIntegerField()),
+                ('gpu_utilization', models.FloatField(blank=True, null=True)),
+                ('gpu_utilization_max', models.FloatField(blank=True, null=True)),
+                ('gpu_memory_used', models.BigIntegerField(blank=True, null=True)),
+                ('gpu_memory_used_max', models.BigIntegerField(blank=True, null=True)),
+                ('gpu_resources', django.contrib.postgres.fields.jsonb.JSONField(blank=True, help_text='The detailed gpu resources, only kept for raw samples.', null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resources_metrics', to='db.ExperimentJob')),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='resourcesmetric',
+            index_together={('job', 'resolution', 'created_at')},
+        ),
+    ]
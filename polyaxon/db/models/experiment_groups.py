@@ -8,7 +8,7 @@ from django.conf import settings
 from django.contrib.postgres.fields import JSONField
 from django.contrib.postgres.fields.jsonb import KeyTransform
 from django.db import models
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils.functional import cached_property
 
 from constants.experiment_groups import ExperimentGroupLifeCycle
@@ -223,6 +223,21 @@ class ExperimentGroup(DiffModel,
         return self.group_experiments.exclude(
             status__status__in=ExperimentLifeCycle.DONE_STATUS).distinct()
 
+    @cached_property
+    def experiments_stats(self):
+        """The number of experiments of the group, total and by status, computed in one query."""
+        def count_statuses(statuses):
+            return Count('id', filter=Q(status__status__in=statuses))
+
+        return self.group_experiments.aggregate(
+            num_experiments=Count('id'),
+            num_pending_experiments=count_statuses(ExperimentLifeCycle.PENDING_STATUS),
+            num_running_experiments=count_statuses(ExperimentLifeCycle.RUNNING_STATUS),
+            num_scheduled_experiments=count_statuses({ExperimentLifeCycle.SCHEDULED}),
+            num_succeeded_experiments=count_statuses({ExperimentLifeCycle.SUCCEEDED}),
+            num_failed_experiments=count_statuses({ExperimentLifeCycle.FAILED}),
+            num_stopped_experiments=count_statuses({ExperimentLifeCycle.STOPPED}))
+
     @property
     def n_experiments_to_start(self):
         """We need to check if we are allowed to start the experiment
@@ -304,9 +319,15 @@ class ExperimentGroup(DiffModel,
     def get_suggestions(self):
         iteration_config = self.iteration_config
         if iteration_config:
-            return self.search_manager.get_suggestions(iteration_config=iteration_config)
+            return self.iteration_manager.get_suggestions(iteration_config=iteration_config)
         return self.search_manager.get_suggestions()
 
+    def iter_suggestions(self):
+        """Yields the suggestions, lazily if the search manager can generate them lazily."""
+        if self.iteration_config:
+            return iter(self.get_suggestions() or [])
+        return self.search_manager.iter_suggestions()
+
 
 class ExperimentGroupIteration(DiffModel):
     experiment_group = models.ForeignKey(
@@ -29,6 +29,7 @@ from db.models.utils import (
 from db.redis.heartbeat import RedisHeartBeat
 from event_manager.events.experiment import (
     EXPERIMENT_COPIED,
+    EXPERIMENT_NEW_METRIC,
     EXPERIMENT_RESTARTED,
     EXPERIMENT_RESUMED
 )
@@ -173,16 +174,21 @@ class Experiment(DiffModel,
         """"Return a boolean indicating if the experiment has any running jobs"""
         return self.jobs.exclude(status__status__in=ExperimentLifeCycle.DONE_STATUS).exists()
 
-    @property
-    def calculated_status(self):
-        master_status = self.jobs.filter(role=TaskType.MASTER)[0].last_status
+    def get_calculated_status(self, master_status, job_statuses):
+        """Calculates the status of the experiment based on the statuses of its jobs."""
         calculated_status = master_status if JobLifeCycle.is_done(master_status) else None
         if calculated_status is None:
-            calculated_status = ExperimentLifeCycle.jobs_status(self.last_job_statuses)
+            calculated_status = ExperimentLifeCycle.jobs_status(job_statuses)
         if calculated_status is None:
             return self.last_status
         return calculated_status
 
+    @property
+    def calculated_status(self):
+        master_status = self.jobs.filter(role=TaskType.MASTER)[0].last_status
+        return self.get_calculated_status(master_status=master_status,
+                                          job_statuses=self.last_job_statuses)
+
     @property
     def is_clone(self):
         return self.original_experiment is not None
@@ -208,15 +214,25 @@ class Experiment(DiffModel,
         """If the experiment belongs to a experiment_group or is independently created."""
         return self.experiment_group is None
 
-    def update_status(self):
+    def update_status(self, calculated_status=None):
         current_status = self.last_status
-        calculated_status = self.calculated_status
+        if calculated_status is None:
+            calculated_status = self.calculated_status
         if calculated_status != current_status:
             # Add new status to the experiment
             self.set_status(calculated_status)
             return True
         return False
 
+    def update_last_metric(self, metrics):
+        """Folds the values of the new metrics, in order, into the last metric."""
+        last_metric = self.last_metric or {}
+        for values in metrics:
+            last_metric.update(values)
+        self.last_metric = last_metric
+        self.save(update_fields=['last_metric'])
+        auditor.record(event_type=EXPERIMENT_NEW_METRIC, instance=self)
+
     def set_status(self, status, message=None, traceback=None, **kwargs):
         if status in ExperimentLifeCycle.HEARTBEAT_STATUS:
             RedisHeartBeat.experiment_ping(self.id)
@@ -0,0 +1,61 @@
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+from django.utils import timezone
+
+
+class ResourcesMetricResolution(object):
+    """The resolution, in seconds, of the resources metrics.
+
+    Raw samples are rolled up to minute then hour buckets as they get older.
+    """
+    RAW = 0
+    MINUTE = 60
+    HOUR = 3600
+
+    VALUES = {RAW, MINUTE, HOUR}
+    CHOICES = (
+        (RAW, 'raw'),
+        (MINUTE, 'minute'),
+        (HOUR, 'hour'),
+    )
+
+
+class ResourcesMetric(models.Model):
+    """A model that represents the resources used by an experiment job at a certain time.
+
+    For rollups, the values are the averages of the bucket,
+    and the `*_max` values are the maximum values observed during the bucket.
+
+    The gpu utilization is the average utilization of the job's gpus,
+    and the gpu memory used is the total memory used on the job's gpus.
+    """
+    job = models.ForeignKey(
+        'db.ExperimentJob',
+        on_delete=models.CASCADE,
+        related_name='resources_metrics')
+    created_at = models.DateTimeField(default=timezone.now)
+    resolution = models.PositiveIntegerField(
+        default=ResourcesMetricResolution.RAW,
+        choices=ResourcesMetricResolution.CHOICES)
+    n_cpus = models.PositiveSmallIntegerField(null=True, blank=True)
+    cpu_percentage = models.FloatField()
+    cpu_percentage_max = models.FloatField()
+    memory_used = models.BigIntegerField()
+    memory_used_max = models.BigIntegerField()
+    memory_limit = models.BigIntegerField()
+    gpu_utilization = models.FloatField(null=True, blank=True)
+    gpu_utilization_max = models.FloatField(null=True, blank=True)
+    gpu_memory_used = models.BigIntegerField(null=True, blank=True)
+    gpu_memory_used_max = models.BigIntegerField(null=True, blank=True)
+    gpu_resources = JSONField(
+        null=True,
+        blank=True,
+        help_text='The detailed gpu resources, only kept for raw samples.')
+
+    class Meta:
+        app_label = 'db'
+        ordering = ['created_at']
+        index_together = [['job', 'resolution', 'created_at']]
+
+    def __str__(self):
+        return '{} <{}>'.format(self.job_id, self.created_at)
@@ -0,0 +1,67 @@
+import json
+
+from db.redis.base import BaseRedisDb
+from polyaxon.settings import RedisPools
+
+
+class RedisAuditor(BaseRedisDb):
+    """
+    RedisAuditor buffers the serialized auditor events.
+
+    The events are pushed to a redis list and drained in batches by a single task,
+    so that recording an event does not send any task while a drain is pending or running.
+    """
+    KEY_EVENTS = 'auditor.events'  # Redis list: serialized events
+    KEY_EVENTS_SCHEDULED = 'auditor.events.scheduled'  # Set while a drain is pending or running
+
+    # In case the drain task is lost, another one could be scheduled after this value
+    SCHEDULED_TIMEOUT = 30
+    REDIS_POOL = RedisPools.HEARTBEAT
+
+    @classmethod
+    def push_event(cls, event):
+        """Buffers a serialized event.
+
+        Returns True if the caller should schedule a drain, i.e. no drain is pending.
+        """
+        red = cls._get_redis()
+        pipe = red.pipeline()
+        pipe.rpush(cls.KEY_EVENTS, json.dumps(event))
+        pipe.set(cls.KEY_EVENTS_SCHEDULED, 1, ex=cls.SCHEDULED_TIMEOUT, nx=True)
+        _, should_schedule = pipe.execute()
+        return bool(should_schedule)
+
+    @classmethod
+    def get_events(cls, count):
+        """Returns up to `count` of the oldest buffered events without removing them.
+
+        The events are only removed with `remove_events` once they are handled,
+        this also keeps the pending drain from expiring while it's running.
+        """
+        red = cls._get_redis()
+        pipe = red.pipeline()
+        pipe.lrange(cls.KEY_EVENTS, 0, count - 1)
+        pipe.expire(cls.KEY_EVENTS_SCHEDULED, cls.SCHEDULED_TIMEOUT)
+        events, _ = pipe.execute()
+        return [json.loads(event.decode('utf-8')) for event in events]
+
+    @classmethod
+    def remove_events(cls, count):
+        """Removes the `count` oldest buffered events."""
+        cls._get_redis().ltrim(cls.KEY_EVENTS, count, -1)
+
+    @classmethod
+    def release(cls):
+        """Allows scheduling a new drain.
+
+        Returns True if the caller should schedule a drain,
+        i.e. some events were buffered after the last batch was read.
+        """
+        red = cls._get_redis()
+        pipe = red.pipeline()
+        pipe.delete(cls.KEY_EVENTS_SCHEDULED)
+        pipe.llen(cls.KEY_EVENTS)
+        _, remaining = pipe.execute()
+        if not remaining:
+            return False
+        return bool(red.set(cls.KEY_EVENTS_SCHEDULED, 1, ex=cls.SCHEDULED_TIMEOUT, nx=True))
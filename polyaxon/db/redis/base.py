@@ -4,9 +4,16 @@ from polyaxon.settings import redis
 class BaseRedisDb(object):
     REDIS_POOL = None
 
+    # Redis clients are thread safe, a single client is reused per connection pool
+    _clients = {}
+
     @classmethod
     def _get_redis(cls):
-        return redis.StrictRedis(connection_pool=cls.REDIS_POOL)
+        client = BaseRedisDb._clients.get(cls.REDIS_POOL)
+        if client is None:
+            client = redis.StrictRedis(connection_pool=cls.REDIS_POOL)
+            BaseRedisDb._clients[cls.REDIS_POOL] = client
+        return client
 
     @classmethod
     def connection(cls):
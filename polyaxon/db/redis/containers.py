@@ -39,6 +39,38 @@ class RedisJobContainers(BaseRedisDb):
             return job_uuid, experiment_uuid
         return None, None
 
+    @classmethod
+    def get_containers_jobs(cls):
+        """Returns a snapshot mapping every monitored container to its (job, experiment).
+
+        The snapshot is fetched in two pipelined round trips,
+        regardless of the number of containers.
+        """
+        red = cls._get_redis()
+        pipe = red.pipeline(transaction=False)
+        pipe.smembers(cls.KEY_CONTAINERS)
+        pipe.hgetall(cls.KEY_CONTAINERS_TO_JOBS)
+        container_ids, containers_to_jobs = pipe.execute()
+
+        containers_jobs = {}
+        for container_id in container_ids:
+            job_uuid = containers_to_jobs.get(container_id)
+            if job_uuid:
+                containers_jobs[container_id.decode('utf-8')] = job_uuid.decode('utf-8')
+        if not containers_jobs:
+            return {}
+
+        job_uuids = list(set(containers_jobs.values()))
+        experiment_uuids = red.hmget(cls.KEY_JOBS_TO_EXPERIMENTS, job_uuids)
+        jobs_to_experiments = {
+            job_uuid: experiment_uuid.decode('utf-8') if experiment_uuid else None
+            for job_uuid, experiment_uuid in zip(job_uuids, experiment_uuids)
+        }
+        return {
+            container_id: (job_uuid, jobs_to_experiments[job_uuid])
+            for container_id, job_uuid in containers_jobs.items()
+        }
+
     @classmethod
     def remove_container(cls, container_id, red=None):
         red = red or cls._get_redis()
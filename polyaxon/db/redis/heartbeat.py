@@ -98,3 +98,25 @@ class RedisHeartBeat(BaseRedisDb):
     def build_is_alive(cls, build_id):
         heart_beat = RedisHeartBeat(build=build_id)
         return heart_beat.is_alive()
+
+    @classmethod
+    def _get_dead(cls, key, object_ids):
+        """Returns the ids that did not report a heartbeat, checked with a single `MGET`."""
+        object_ids = list(object_ids)
+        if not object_ids:
+            return []
+        red = cls._get_redis()
+        values = red.mget([key.format(object_id) for object_id in object_ids])
+        return [object_id for object_id, value in zip(object_ids, values) if not value]
+
+    @classmethod
+    def get_dead_experiments(cls, experiment_ids):
+        return cls._get_dead(cls.KEY_EXPERIMENT, experiment_ids)
+
+    @classmethod
+    def get_dead_jobs(cls, job_ids):
+        return cls._get_dead(cls.KEY_JOB, job_ids)
+
+    @classmethod
+    def get_dead_builds(cls, build_ids):
+        return cls._get_dead(cls.KEY_BUILD, build_ids)
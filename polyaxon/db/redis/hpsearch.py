@@ -0,0 +1,37 @@
+import pickle
+
+from db.redis.base import BaseRedisDb
+from polyaxon.settings import RedisPools
+
+
+class RedisHPSearchStates(BaseRedisDb):
+    """
+    RedisHPSearchStates keeps the state of the search algorithm of an experiment group.
+
+    The state is shared by all the hpsearch workers, so that every iteration of a group
+    updates the state of the previous one, whichever worker handles it.
+    """
+    KEY_STATE = 'hpsearch.state:{}'  # Pickled state of a group's search algorithm
+
+    REDIS_POOL = RedisPools.HEARTBEAT
+
+    @classmethod
+    def get_state(cls, experiment_group_id):
+        state = cls._get_redis().get(cls.KEY_STATE.format(experiment_group_id))
+        if not state:
+            return None
+        try:
+            return pickle.loads(state)
+        except (pickle.UnpicklingError, AttributeError, EOFError, ImportError, IndexError):
+            # e.g. a state pickled by a previous version, it's fitted again
+            return None
+
+    @classmethod
+    def set_state(cls, experiment_group_id, state, ttl):
+        cls._get_redis().set(cls.KEY_STATE.format(experiment_group_id),
+                             pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL),
+                             ex=ttl)
+
+    @classmethod
+    def clear_state(cls, experiment_group_id):
+        cls._get_redis().delete(cls.KEY_STATE.format(experiment_group_id))
@@ -0,0 +1,87 @@
+from db.redis.base import BaseRedisDb
+from polyaxon.settings import RedisPools
+
+
+class RedisStatuses(BaseRedisDb):
+    """
+    RedisStatuses tracks the experiments that need to recompute their status.
+
+    Experiments are marked as dirty every time one of their jobs changes status,
+    and the dirty set is drained by a single task, so that a burst of jobs updates
+    results in a single status recomputation per experiment.
+
+    It also keeps the state of the statuses monitor, i.e. the last pods resource version
+    and the last state handled per pod, so that a restarted monitor resumes its watch.
+    """
+    KEY_EXPERIMENTS = 'statuses.experiments'  # Redis set: dirty experiment ids
+    KEY_EXPERIMENTS_SCHEDULED = 'statuses.experiments.scheduled'  # Set while a drain is pending
+    KEY_PODS_RESOURCE_VERSION = 'statuses.pods.resource_version'  # Last watched resource version
+    KEY_PODS_STATES = 'statuses.pods.states'  # Redis hash, maps pods to their last handled state
+
+    # In case the drain task is lost, another one could be scheduled after this value
+    SCHEDULED_TIMEOUT = 30
+    REDIS_POOL = RedisPools.HEARTBEAT
+
+    @classmethod
+    def mark_experiments(cls, experiment_ids):
+        """Marks the experiments as dirty.
+
+        Returns True if the caller should schedule a drain, i.e. no drain is pending.
+        """
+        experiment_ids = list(experiment_ids)
+        if not experiment_ids:
+            return False
+        red = cls._get_redis()
+        pipe = red.pipeline()
+        pipe.sadd(cls.KEY_EXPERIMENTS, *experiment_ids)
+        pipe.set(cls.KEY_EXPERIMENTS_SCHEDULED, 1, ex=cls.SCHEDULED_TIMEOUT, nx=True)
+        _, should_schedule = pipe.execute()
+        return bool(should_schedule)
+
+    @classmethod
+    def mark_experiment(cls, experiment_id):
+        return cls.mark_experiments([experiment_id])
+
+    @classmethod
+    def pop_experiments(cls):
+        """Returns and clears the dirty experiment ids, and allows scheduling a new drain."""
+        red = cls._get_redis()
+        pipe = red.pipeline()
+        pipe.delete(cls.KEY_EXPERIMENTS_SCHEDULED)
+        pipe.smembers(cls.KEY_EXPERIMENTS)
+        pipe.delete(cls.KEY_EXPERIMENTS)
+        _, experiment_ids, _ = pipe.execute()
+        return [int(experiment_id) for experiment_id in experiment_ids]
+
+    @classmethod
+    def get_pods_resource_version(cls):
+        resource_version = cls._get_redis().get(cls.KEY_PODS_RESOURCE_VERSION)
+        return resource_version.decode('utf-8') if resource_version else None
+
+    @classmethod
+    def set_pods_resource_version(cls, resource_version):
+        red = cls._get_redis()
+        if resource_version:
+            red.set(cls.KEY_PODS_RESOURCE_VERSION, resource_version)
+        else:
+            red.delete(cls.KEY_PODS_RESOURCE_VERSION)
+
+    @classmethod
+    def get_pods_states(cls):
+        states = cls._get_redis().hgetall(cls.KEY_PODS_STATES)
+        return {pod.decode('utf-8'): state.decode('utf-8') for pod, state in states.items()}
+
+    @classmethod
+    def set_pod_state(cls, pod, state):
+        cls._get_redis().hset(cls.KEY_PODS_STATES, pod, state)
+
+    @classmethod
+    def set_pods_states(cls, states):
+        if states:
+            cls._get_redis().hmset(cls.KEY_PODS_STATES, states)
+
+    @classmethod
+    def remove_pod_states(cls, pods):
+        pods = list(pods)
+        if pods:
+            cls._get_redis().hdel(cls.KEY_PODS_STATES, *pods)
@@ -63,6 +63,28 @@ class RedisToStream(BaseRedisDb):
     def is_monitored_experiment_logs(cls, experiment_uuid):
         return cls._is_monitored(cls.KEY_EXPERIMENT_LOGS, experiment_uuid)
 
+    @classmethod
+    def _get_monitored(cls, jobs_key, experiments_key):
+        red = cls._get_redis()
+        pipe = red.pipeline(transaction=False)
+        pipe.smembers(jobs_key)
+        pipe.smembers(experiments_key)
+        job_uuids, experiment_uuids = pipe.execute()
+        return ({job_uuid.decode('utf-8') for job_uuid in job_uuids},
+                {experiment_uuid.decode('utf-8') for experiment_uuid in experiment_uuids})
+
+    @classmethod
+    def get_monitored_resources(cls):
+        """Returns the sets of jobs and experiments to stream resources for in one round trip."""
+        return cls._get_monitored(jobs_key=cls.KEY_JOB_RESOURCES,
+                                  experiments_key=cls.KEY_EXPERIMENT_RESOURCES)
+
+    @classmethod
+    def get_monitored_logs(cls):
+        """Returns the sets of jobs and experiments to stream logs for in one round trip."""
+        return cls._get_monitored(jobs_key=cls.KEY_JOB_LOGS,
+                                  experiments_key=cls.KEY_EXPERIMENT_LOGS)
+
     @classmethod
     def _remove_object(cls, key, object_id):
         red = cls._get_redis()
@@ -84,29 +106,46 @@ class RedisToStream(BaseRedisDb):
     def remove_experiment_logs(cls, experiment_uuid):
         cls._remove_object(cls.KEY_EXPERIMENT_LOGS, experiment_uuid)
 
+    @staticmethod
+    def _get_job_resources(resources, job_name):
+        resources = json.loads(resources.decode('utf-8'))
+        resources['job_name'] = job_name
+        return resources
+
     @classmethod
     def get_latest_job_resources(cls, job, job_name, as_json=False):
         red = cls._get_redis()
         resources = red.hget(cls.KEY_JOB_LATEST_STATS, job)
         if resources:
-            resources = resources.decode('utf-8')
-            resources = json.loads(resources)
-            resources['job_name'] = job_name
+            resources = cls._get_job_resources(resources=resources, job_name=job_name)
             return resources if as_json else json.dumps(resources)
         return None
 
+    @classmethod
+    def get_latest_jobs_resources(cls, jobs):
+        """Gets the latest resources of several jobs with a single `HMGET`."""
+        if not jobs:
+            return []
+        red = cls._get_redis()
+        values = red.hmget(cls.KEY_JOB_LATEST_STATS, [job['uuid'] for job in jobs])
+        return [cls._get_job_resources(resources=resources, job_name=job['name'])
+                for job, resources in zip(jobs, values) if resources]
+
     @classmethod
     def get_latest_experiment_resources(cls, jobs, as_json=False):
-        stats = []
-        for job in jobs:
-            job_resources = cls.get_latest_job_resources(job=job['uuid'],
-                                                         job_name=job['name'],
-                                                         as_json=True)
-            if job_resources:
-                stats.append(job_resources)
+        stats = cls.get_latest_jobs_resources(jobs=jobs)
         return stats if as_json else json.dumps(stats)
 
     @classmethod
     def set_latest_job_resources(cls, job, payload):
         red = cls._get_redis()
         red.hset(cls.KEY_JOB_LATEST_STATS, job, json.dumps(payload))
+
+    @classmethod
+    def set_latest_jobs_resources(cls, payloads):
+        """Sets the latest resources of several jobs with a single `HMSET`."""
+        if not payloads:
+            return
+        red = cls._get_redis()
+        red.hmset(cls.KEY_JOB_LATEST_STATS,
+                  {job: json.dumps(payload) for job, payload in payloads.items()})
@@ -2,7 +2,7 @@ from hestia.service_interface import Service
 
 
 class EventService(Service):
-    __all__ = ('record', 'setup')
+    __all__ = ('record', 'record_events', 'setup')
 
     event_manager = None
 
@@ -35,9 +35,30 @@ class EventService(Service):
         self.record_event(event)
         return event
 
+    def record_events(self, events):
+        """ Validate and record many serialized events at once.
+
+        >>> record_events([{'type': 'event.action', ...}])
+        """
+        if not self.is_setup:
+            return
+        events = [self.get_event(event_type=event['type'], event_data=event)
+                  for event in events if self.can_handle(event_type=event['type'])]
+        if events:
+            self.record_batch(events)
+        return events
+
     def record_event(self, event):
         """ Record an event.
 
         >>> record_event(Event())
         """
         pass
+
+    def record_batch(self, events):
+        """ Record many events, services that can record events in bulk should override it.
+
+        >>> record_batch([Event()])
+        """
+        for event in events:
+            self.record_event(event)
@@ -1,8 +1,22 @@
+import logging
+
+from django.conf import settings
+
 import auditor
 
+from db.redis.auditor import RedisAuditor
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import EventsCeleryTasks
 
+_logger = logging.getLogger('polyaxon.events_handlers')
+
+# The bulk auditor handler and the per event task to fall back to when it fails
+BATCH_CONSUMERS = (
+    ('track_events', EventsCeleryTasks.EVENTS_TRACK),
+    ('log_events', EventsCeleryTasks.EVENTS_LOG),
+    ('notify_events', EventsCeleryTasks.EVENTS_NOTIFY),
+)
+
 
 @celery_app.task(name=EventsCeleryTasks.EVENTS_NOTIFY, ignore_result=True)
 def events_notify(event):
@@ -17,3 +31,29 @@ def events_log(event):
 @celery_app.task(name=EventsCeleryTasks.EVENTS_TRACK, ignore_result=True)
 def events_track(event):
     auditor.track(event)
+
+
+@celery_app.task(name=EventsCeleryTasks.EVENTS_RECORD_BATCH, ignore_result=True)
+def events_record_batch():
+    """Drains the events buffered by the batch auditor.
+
+    A batch is only removed from the buffer once it's handled, and a failing consumer
+    falls back to the per event tasks without dropping the batch for the other consumers.
+    """
+    events = RedisAuditor.get_events(settings.AUDITOR_BATCH_SIZE)
+    while events:
+        for consumer, task in BATCH_CONSUMERS:
+            try:
+                getattr(auditor, consumer)(events)
+            except Exception:
+                _logger.exception('Could not %s a batch of %s events, sending them one by one.',
+                                  consumer, len(events))
+                for event in events:
+                    celery_app.send_task(task, kwargs={'event': event})
+        RedisAuditor.remove_events(len(events))
+        events = RedisAuditor.get_events(settings.AUDITOR_BATCH_SIZE)
+
+    # Events buffered while draining did not schedule a drain
+    if RedisAuditor.release():
+        celery_app.send_task(EventsCeleryTasks.EVENTS_RECORD_BATCH,
+                             countdown=settings.AUDITOR_BATCH_INTERVAL)
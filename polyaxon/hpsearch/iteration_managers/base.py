@@ -17,6 +17,10 @@ class BaseIterationManger(object):
             return None
         return iteration_config
 
+    def get_suggestions(self, iteration_config):
+        return self.experiment_group.search_manager.get_suggestions(
+            iteration_config=iteration_config)
+
     def _update_config(self, iteration_config):
         iteration = self.experiment_group.iteration
         iteration.data = iteration_config.to_dict()
@@ -7,31 +7,50 @@ class BOIterationManager(BaseIterationManger):
         return self.experiment_group.hptuning_config.bo.metric.name
 
     def create_iteration(self, experiment_ids, experiments_configs):
-        """Create an iteration for the experiment group."""
+        """Create an iteration for the experiment group.
+
+        The iteration only references its own experiments,
+        the observations of the previous iterations are read from the group's experiments.
+        """
         from db.models.experiment_groups import ExperimentGroupIteration
 
         iteration_config = self.experiment_group.iteration_config
-
-        if iteration_config is None:
-            iteration = 0
-            old_experiment_ids = None
-            old_experiments_configs = None
-            old_experiments_metrics = None
-        else:
-            iteration = iteration_config.iteration + 1
-            old_experiment_ids = iteration_config.combined_experiment_ids
-            old_experiments_configs = iteration_config.combined_experiments_configs
-            old_experiments_metrics = iteration_config.combined_experiments_metrics
+        iteration = 0 if iteration_config is None else iteration_config.iteration + 1
 
         # Create a new iteration config
         iteration_config = BOIterationConfig(
             iteration=iteration,
-            old_experiment_ids=old_experiment_ids,
-            old_experiments_configs=old_experiments_configs,
-            old_experiments_metrics=old_experiments_metrics,
             experiment_ids=experiment_ids,
             experiments_configs=experiments_configs,
         )
         return ExperimentGroupIteration.objects.create(
             experiment_group=self.experiment_group,
             data=iteration_config.to_dict())
+
+    def add_old_observations(self, iteration_config):
+        """Sets the configs and metrics of the experiments of the previous iterations,
+        ordered by creation, on the iteration config.
+        """
+        if iteration_config.old_experiment_ids is not None:
+            # The iteration already has a copy of the previous observations
+            return iteration_config
+
+        metric = self.get_metric_name()
+        experiments = self.experiment_group.get_annotated_experiments_with_metric(metric=metric)
+        experiments = experiments.exclude(
+            id__in=iteration_config.experiment_ids or []).order_by('id')
+        iteration_config.old_experiment_ids = []
+        iteration_config.old_experiments_configs = []
+        iteration_config.old_experiments_metrics = []
+        for experiment_id, declarations, value in experiments.values_list(
+                'id', 'declarations', metric):
+            iteration_config.old_experiment_ids.append(experiment_id)
+            iteration_config.old_experiments_configs.append([experiment_id, declarations])
+            if value is not None:
+                iteration_config.old_experiments_metrics.append([experiment_id, value])
+        return iteration_config
+
+    def get_suggestions(self, iteration_config):
+        return self.experiment_group.search_manager.get_suggestions(
+            iteration_config=self.add_old_observations(iteration_config),
+            experiment_group_id=self.experiment_group.id)
@@ -53,18 +53,12 @@ class BOIterationConfig(BaseConfig):
 
     @property
     def combined_experiment_ids(self):
-        experiment_ids = self.old_experiment_ids or []
-        experiment_ids += self.experiment_ids or []
-        return experiment_ids
+        return (self.old_experiment_ids or []) + (self.experiment_ids or [])
 
     @property
     def combined_experiments_configs(self):
-        experiments_configs = self.old_experiments_configs or []
-        experiments_configs += self.experiments_configs or []
-        return experiments_configs
+        return (self.old_experiments_configs or []) + (self.experiments_configs or [])
 
     @property
     def combined_experiments_metrics(self):
-        experiments_metrics = self.old_experiments_metrics or []
-        experiments_metrics += self.experiments_metrics or []
-        return experiments_metrics
+        return (self.old_experiments_metrics or []) + (self.experiments_metrics or [])
@@ -11,3 +11,8 @@ class BaseSearchAlgorithmManager(object):
 
     def get_suggestions(self, iteration_config=None):
         raise NotImplemented  # noqa
+
+    def iter_suggestions(self, iteration_config=None):
+        """Yields the suggestions, managers that can generate them lazily should override it."""
+        for suggestion in self.get_suggestions(iteration_config=iteration_config) or []:
+            yield suggestion
@@ -1,6 +1,8 @@
 import numpy as np
 
+from scipy.linalg import LinAlgError, cho_solve, cholesky, solve_triangular
 from scipy.optimize import minimize
+from scipy.special import gamma, kv
 from scipy.stats import norm
 from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.gaussian_process.kernels import RBF, Matern
@@ -15,6 +17,13 @@ from schemas.hptuning import (
 
 
 class UtilityFunction(object):
+    # Variances below this value are considered null, i.e. the point was observed
+    MIN_VARIANCE = 1e-12
+    # Optima closer than this fraction of the bounds range are considered the same
+    OPTIMA_TOLERANCE = 1e-4
+    # The kernel hyperparameters of a previous fit are optimized again
+    # once the number of observations grew by this ratio
+    REFIT_RATIO = 1.2
 
     def __init__(self, config, seed=None):
         if not isinstance(config, UtilityFunctionConfig):
@@ -45,17 +54,135 @@ class UtilityFunction(object):
             random_state=random_generator
         )
 
+    def condition(self, x, y):
+        """Refits the gaussian process on the observations, e.g. including fantasized ones,
+        with the kernel hyperparameters of the last fit instead of optimizing them again.
+        """
+        kernel = self.gaussian_process.kernel
+        optimizer = self.gaussian_process.optimizer
+        self.gaussian_process.set_params(kernel=self.gaussian_process.kernel_, optimizer=None)
+        try:
+            self.gaussian_process.fit(x, y)
+        finally:
+            self.gaussian_process.set_params(kernel=kernel, optimizer=optimizer)
+
+    def fit(self, x, y, state=None):
+        """Fits the gaussian process on the observations, returns the state of the fit.
+
+        Given the `state` of a previous fit, the kernel hyperparameters are reused
+        until the number of observations grew by `REFIT_RATIO`,
+        and if the new observations were appended to the previous ones,
+        the Cholesky decomposition is extended instead of being computed again.
+        """
+        if self._is_state_valid(x=x, state=state):
+            try:
+                self._set_posterior(x=x, y=y, kernel=state['kernel'], L=self._get_cholesky(
+                    x=x, kernel=state['kernel'], x_state=state['x'], L_state=state['L']))
+                return self.get_state(n_optimized=state['n_optimized'])
+            except LinAlgError:
+                pass
+        self.gaussian_process.fit(x, y)
+        return self.get_state(n_optimized=len(x))
+
+    def get_state(self, n_optimized):
+        return {
+            'x': self.gaussian_process.X_train_,
+            'kernel': self.gaussian_process.kernel_,
+            'L': self.gaussian_process.L_,
+            'n_optimized': n_optimized,
+        }
+
+    def _is_state_valid(self, x, state):
+        if not state:
+            return False
+        return (type(state['kernel']) is type(self.gaussian_process.kernel) and
+                state['x'].shape[1] == x.shape[1] and
+                len(x) < state['n_optimized'] * self.REFIT_RATIO)
+
+    def _get_cholesky(self, x, kernel, x_state, L_state):
+        """Returns the lower Cholesky factor of the kernel matrix of the points `x`."""
+        n_state = len(x_state)
+        if n_state > len(x) or not np.array_equal(x[:n_state], x_state):
+            K = kernel(x)
+            K[np.diag_indices_from(K)] += self.gaussian_process.alpha
+            return cholesky(K, lower=True)
+
+        # [[L, 0], [l_cross^T, L_new]] with L l_cross = k(x_state, x_new)
+        # and L_new L_new^T = k(x_new, x_new) - l_cross^T l_cross
+        x_new = x[n_state:]
+        if not len(x_new):
+            return L_state
+        l_cross = solve_triangular(L_state, kernel(x_state, x_new), lower=True)
+        K_new = kernel(x_new) - l_cross.T.dot(l_cross)
+        K_new[np.diag_indices_from(K_new)] += self.gaussian_process.alpha
+        L_new = cholesky(K_new, lower=True)
+        return np.block([[L_state, np.zeros((n_state, len(x_new)))], [l_cross.T, L_new]])
+
+    def _set_posterior(self, x, y, kernel, L):
+        """Sets the fitted attributes of the gaussian process, as its `fit` does."""
+        gp = self.gaussian_process
+        gp.X_train_ = np.copy(x)
+        gp.y_train_ = np.copy(y)
+        gp.kernel_ = kernel
+        gp.L_ = L
+        gp.alpha_ = cho_solve((L, True), y)
+        gp._y_train_mean = np.zeros(1)
+        gp._y_train_std = np.ones(1)
+        gp._K_inv = None
+
+    def _predict_with_gradient(self, x):
+        """Returns the posterior mean and std of the gaussian process at the points `x`,
+        and their gradients w.r.t. the points.
+        """
+        gp = self.gaussian_process
+        y_train_std = getattr(gp, '_y_train_std', 1.)
+        k = gp.kernel_(x, gp.X_train_)
+        k_gradient = self._get_kernel_gradient(x=x, k=k)
+        mean = k.dot(gp.alpha_) * y_train_std + gp._y_train_mean
+        mean_gradient = np.einsum('nmd,m->nd', k_gradient, gp.alpha_) * y_train_std
+
+        # K^-1 k(X_train, x)
+        v = cho_solve((gp.L_, True), k.T)
+        var = gp.kernel_.diag(x) - np.einsum('nm,mn->n', k, v)
+        var_gradient = -2 * np.einsum('nmd,mn->nd', k_gradient, v)
+        is_valid = var > self.MIN_VARIANCE
+        std = np.sqrt(np.where(is_valid, var, self.MIN_VARIANCE))
+        std_gradient = np.where(is_valid[:, np.newaxis], var_gradient / (2 * std[:, np.newaxis]), 0)
+        return mean, std * y_train_std, mean_gradient, std_gradient * y_train_std
+
+    def _get_kernel_gradient(self, x, k):
+        """Returns the gradient of the kernel `k` between the points `x` and the training points,
+        w.r.t. the points, with shape (n_points, n_training_points, n_dims).
+        """
+        kernel = self.gaussian_process.kernel_
+        length_scale = np.asarray(kernel.length_scale, dtype=float)
+        diff = (x[:, np.newaxis, :] - self.gaussian_process.X_train_[np.newaxis, :, :])
+        diff /= length_scale ** 2
+        if isinstance(kernel, Matern) and np.isfinite(kernel.nu):
+            # d/dt (t^nu K_nu(t)) = -t^nu K_{nu - 1}(t), with t = sqrt(2 nu) r
+            nu = kernel.nu
+            dists = np.sqrt(np.sum((diff * length_scale) ** 2, axis=-1))
+            t = np.sqrt(2 * nu) * dists
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                dk = -(2 ** (1. - nu) / gamma(nu)) * 2 * nu * t ** (nu - 1) * kv(nu - 1, t)
+            dk = np.where(np.isfinite(dk) & (dists > 0), dk, 0)
+            return dk[:, :, np.newaxis] * diff
+        # RBF, or Matern with an infinite nu
+        return -k[:, :, np.newaxis] * diff
+
     def _compute_ucb(self, x):
         mean, std = self.gaussian_process.predict(x, return_std=True)
         return mean + self.kappa * std
 
     def _compute_ei(self, x, y_max):
         mean, std = self.gaussian_process.predict(x, return_std=True)
+        std = np.maximum(std, np.sqrt(self.MIN_VARIANCE))
         z = (mean - y_max - self.eps) / std
         return (mean - y_max - self.eps) * norm.cdf(z) + std * norm.pdf(z)
 
     def _compute_poi(self, x, y_max):
         mean, std = self.gaussian_process.predict(x, return_std=True)
+        std = np.maximum(std, np.sqrt(self.MIN_VARIANCE))
         z = (mean - y_max - self.eps) / std
         return norm.cdf(z)
 
@@ -67,13 +194,67 @@ class UtilityFunction(object):
         if AcquisitionFunctions.is_poi(self.acquisition_function):
             return self._compute_poi(x=x, y_max=y_max)
 
-    def max_compute(self, y_max, bounds, n_warmup=100000, n_iter=250):
-        """A function to find the maximum of the acquisition function
+    def compute_with_gradient(self, x, y_max):
+        """Returns the acquisition values of a batch of points and their gradients."""
+        mean, std, mean_gradient, std_gradient = self._predict_with_gradient(x)
+        if AcquisitionFunctions.is_ucb(self.acquisition_function):
+            return mean + self.kappa * std, mean_gradient + self.kappa * std_gradient
+
+        improvement = mean - y_max - self.eps
+        z = improvement / std
+        cdf = norm.cdf(z)
+        pdf = norm.pdf(z)
+        if AcquisitionFunctions.is_ei(self.acquisition_function):
+            values = improvement * cdf + std * pdf
+            gradients = cdf[:, np.newaxis] * mean_gradient + pdf[:, np.newaxis] * std_gradient
+            return values, gradients
+        if AcquisitionFunctions.is_poi(self.acquisition_function):
+            gradients = (pdf / std)[:, np.newaxis] * (
+                mean_gradient - z[:, np.newaxis] * std_gradient)
+            return cdf, gradients
+
+    def _optimize(self, x_seeds, y_max, bounds):
+        """Runs L-BFGS-B from all the seeds at once.
 
-        It uses a combination of random sampling (cheap) and the 'L-BFGS-B' optimization method.
+        The seeds are optimized jointly as one problem, the sum of their acquisition values,
+        which is separable, so that every step evaluates the acquisition function
+        and its gradient on the batch of seeds instead of once per seed.
+        """
+        n_seeds, dim = x_seeds.shape
+
+        def objective(x):
+            values, gradients = self.compute_with_gradient(x.reshape(n_seeds, dim), y_max=y_max)
+            return -values.sum(), -gradients.ravel()
+
+        res = minimize(objective,
+                       x_seeds.ravel(),
+                       jac=True,
+                       bounds=np.tile(bounds, (n_seeds, 1)),
+                       method="L-BFGS-B")
+        return np.clip(res.x.reshape(n_seeds, dim), bounds[:, 0], bounds[:, 1])
+
+    def get_unique_optima(self, x, ys, bounds):
+        """Returns the points sorted by acquisition value, without the points converged
+        to the same optimum, i.e. equal up to `OPTIMA_TOLERANCE` of the bounds range.
+        """
+        order = np.argsort(-ys, kind='mergesort')
+        x, ys = x[order], ys[order]
+        scale = bounds[:, 1] - bounds[:, 0]
+        scale[scale == 0] = 1
+        keys = np.round((x - bounds[:, 0]) / scale / self.OPTIMA_TOLERANCE)
+        _, indices = np.unique(keys, axis=0, return_index=True)
+        indices = np.sort(indices)
+        return x[indices], ys[indices]
+
+    def max_compute_candidates(self, y_max, bounds, n_warmup=100000, n_iter=250):
+        """Returns the local maxima of the acquisition function, sorted by value.
+
+        It uses a combination of random sampling (cheap) and the 'L-BFGS-B' optimization method,
+        with the analytic gradients of the acquisition function.
 
         First by sampling `n_warmup` (1e5) points at random,
-        and then running L-BFGS-B from `n_iter` (250) random starting points.
+        and then running L-BFGS-B from `n_iter` (250) random starting points
+        and from the best warm up point.
 
         Params:
             y_max: The current maximum known value of the target function.
@@ -82,34 +263,40 @@ class UtilityFunction(object):
             n_iter: The number of times to run scipy.minimize
 
         Returns
-            x_max: The arg max of the acquisition function.
+            (x, ys): The distinct local maxima of the acquisition function and their values.
         """
         # Warm up with random points
         x_tries = self.random_generator.uniform(bounds[:, 0], bounds[:, 1],
                                                 size=(n_warmup, bounds.shape[0]))
         ys = self.compute(x_tries, y_max=y_max)
         x_max = x_tries[ys.argmax()]
-        max_acq = ys.max()
 
         # Explore the parameter space more throughly
         x_seeds = self.random_generator.uniform(bounds[:, 0], bounds[:, 1],
                                                 size=(n_iter, bounds.shape[0]))
-        for x_try in x_seeds:
-            # Find the minimum of minus the acquisition function
-            res = minimize(lambda x: -self.compute(x.reshape(1, -1), y_max=y_max),
-                           x_try.reshape(1, -1),
-                           bounds=bounds,
-                           method="L-BFGS-B")
-
-            # See if success
-            if not res.success:
-                continue
-
-            # Store it if better than previous minimum(maximum).
-            if max_acq is None or -res.fun[0] >= max_acq:
-                x_max = res.x
-                max_acq = -res.fun[0]
-
-        # Clip output to make sure it lies within the bounds. Due to floating
-        # point technicalities this is not always the case.
-        return np.clip(x_max, bounds[:, 0], bounds[:, 1])
+        x_seeds = np.vstack([x_max, x_seeds])
+        x_optima = self._optimize(x_seeds=x_seeds, y_max=y_max, bounds=bounds)
+
+        # Keep the warm up max in case the optimization diverged
+        x_optima = np.vstack([x_max, x_optima])
+        return self.get_unique_optima(x=x_optima,
+                                      ys=self.compute(x_optima, y_max=y_max),
+                                      bounds=bounds)
+
+    def max_compute(self, y_max, bounds, n_warmup=100000, n_iter=250):
+        """A function to find the maximum of the acquisition function
+
+        Params:
+            y_max: The current maximum known value of the target function.
+            bounds: The variables bounds to limit the search of the acq max.
+            n_warmup: The number of times to randomly sample the acquisition function
+            n_iter: The number of times to run scipy.minimize
+
+        Returns
+            x_max: The arg max of the acquisition function.
+        """
+        x_optima, _ = self.max_compute_candidates(y_max=y_max,
+                                                  bounds=bounds,
+                                                  n_warmup=n_warmup,
+                                                  n_iter=n_iter)
+        return x_optima[0]
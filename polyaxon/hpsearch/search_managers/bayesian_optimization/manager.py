@@ -1,3 +1,6 @@
+from django.conf import settings
+
+from db.redis.hpsearch import RedisHPSearchStates
 from hpsearch.search_managers.base import BaseSearchAlgorithmManager
 from hpsearch.search_managers.bayesian_optimization.optimizer import BOOptimizer
 from hpsearch.search_managers.utils import get_random_suggestions
@@ -13,8 +16,16 @@ class BOSearchManager(BaseSearchAlgorithmManager):
         super().__init__(hptuning_config=hptuning_config)
         self.n_initial_trials = self.hptuning_config.bo.n_initial_trials
         self.n_iterations = self.hptuning_config.bo.n_iterations
+        # Every iteration suggests enough experiments to fill the group's concurrency
+        self.n_suggestions = self.hptuning_config.concurrency or 1
+        self.batch_strategy = settings.HPSEARCH_BO_BATCH_STRATEGY
+
+    def get_suggestions(self, iteration_config=None, experiment_group_id=None):
+        """Returns the suggestions of the iteration.
 
-    def get_suggestions(self, iteration_config=None):
+        The state of the gaussian process is kept in redis for the experiment group,
+        so that the next iteration updates it instead of fitting it from scratch.
+        """
         if not iteration_config:
             return get_random_suggestions(matrix=self.hptuning_config.matrix,
                                           n_suggestions=self.n_initial_trials,
@@ -27,10 +38,21 @@ class BOSearchManager(BaseSearchAlgorithmManager):
         for key in experiments_metrics.keys():
             configs.append(experiments_configs[key])
             metrics.append(experiments_metrics[key])
-        optimizer = BOOptimizer(hptuning_config=self.hptuning_config)
+        # The experiments without metrics are fantasized, so that they are not suggested again
+        pending_configs = [config for key, config in experiments_configs.items()
+                           if key not in experiments_metrics]
+        state = (RedisHPSearchStates.get_state(experiment_group_id=experiment_group_id)
+                 if experiment_group_id else None)
+        optimizer = BOOptimizer(hptuning_config=self.hptuning_config, state=state)
         optimizer.add_observations(configs=configs, metrics=metrics)
-        suggestion = optimizer.get_suggestion()
-        return [suggestion] if suggestion else None
+        suggestions = optimizer.get_suggestions(n_suggestions=self.n_suggestions,
+                                                strategy=self.batch_strategy,
+                                                pending_configs=pending_configs)
+        if experiment_group_id and optimizer.state:
+            RedisHPSearchStates.set_state(experiment_group_id=experiment_group_id,
+                                          state=optimizer.state,
+                                          ttl=settings.HPSEARCH_BO_STATE_TTL)
+        return suggestions or None
 
     def should_reschedule(self, iteration):
         """Return a boolean to indicate if we need to reschedule another iteration."""
@@ -1,11 +1,39 @@
+import numpy as np
+
 from hpsearch.search_managers.bayesian_optimization.acquisition_function import UtilityFunction
 from hpsearch.search_managers.bayesian_optimization.space import SearchSpace
 
 
+class BatchStrategies(object):
+    """Strategies to suggest several points from a single fit of the gaussian process.
+
+    After every suggestion, the suggested point is added as a fantasized observation,
+    so that the next suggestion moves away from it:
+        * kriging believer: the fantasized metric is the predicted mean of the point.
+        * constant liar: the fantasized metric is the worst observed metric.
+    """
+    KRIGING_BELIEVER = 'kriging_believer'
+    CONSTANT_LIAR = 'constant_liar'
+
+    VALUES = {KRIGING_BELIEVER, CONSTANT_LIAR}
+
+    @classmethod
+    def is_kriging_believer(cls, value):
+        return value == cls.KRIGING_BELIEVER
+
+    @classmethod
+    def is_constant_liar(cls, value):
+        return value == cls.CONSTANT_LIAR
+
+
 class BOOptimizer(object):
+    # Number of random candidates to fall back on when all the maxima were already suggested
+    N_RANDOM_CANDIDATES = 1000
 
-    def __init__(self, hptuning_config):
+    def __init__(self, hptuning_config, state=None):
         self.hptuning_config = hptuning_config
+        # The state of a previous fit of the gaussian process, see `UtilityFunction.fit`
+        self.state = state
         self.n_initial_trials = self.hptuning_config.bo.n_initial_trials
         self.space = SearchSpace(hptuning_config=hptuning_config)
         self.utility_function = UtilityFunction(
@@ -13,21 +41,89 @@ class BOOptimizer(object):
         self.n_warmup = hptuning_config.bo.utility_function.n_warmup or 5
         self.n_iter = hptuning_config.bo.utility_function.n_iter or 10
 
-    def _maximize(self):
-        """ Find argmax of the acquisition function."""
-        if not self.space.is_observations_valid():
-            return None
-        y_max = self.space.y.max()
-        self.utility_function.gaussian_process.fit(self.space.x, self.space.y)
-        return self.utility_function.max_compute(y_max=y_max,
-                                                 bounds=self.space.bounds,
-                                                 n_warmup=self.n_warmup,
-                                                 n_iter=self.n_iter)
+    def _get_candidates(self, y_max):
+        """Yields the maxima of the acquisition function sorted by value,
+        then random points sorted by value, in case all the maxima are snapped to known points.
+        """
+        bounds = self.space.bounds
+        x_optima, _ = self.utility_function.max_compute_candidates(y_max=y_max,
+                                                                   bounds=bounds,
+                                                                   n_warmup=self.n_warmup,
+                                                                   n_iter=self.n_iter)
+        for x_optimum in x_optima:
+            yield x_optimum
+
+        x_tries = self.utility_function.random_generator.uniform(
+            bounds[:, 0], bounds[:, 1], size=(self.N_RANDOM_CANDIDATES, bounds.shape[0]))
+        ys = self.utility_function.compute(x_tries, y_max=y_max)
+        for x_try in x_tries[np.argsort(-ys)]:
+            yield x_try
+
+    def _get_fantasy(self, x, strategy):
+        if BatchStrategies.is_constant_liar(strategy):
+            return self.space.y.min()
+        return self.utility_function.gaussian_process.predict(x.reshape(1, -1))[0]
 
     def add_observations(self, configs, metrics):
         # Turn configs and metrics into data points
         self.space.add_observations(configs=configs, metrics=metrics)
 
+    def get_suggestions(self, n_suggestions=1, strategy=None, pending_configs=None):
+        """Returns up to `n_suggestions` distinct suggestions from a single fit
+        of the gaussian process.
+
+        The pending configs, e.g. of the experiments still running,
+        and every suggestion made, are added as fantasized observations
+        with the batch `strategy` before looking for the next suggestion.
+        """
+        if not self.space.is_observations_valid():
+            return []
+
+        strategy = strategy or BatchStrategies.KRIGING_BELIEVER
+        x = self.space.x
+        y = self.space.y
+        y_max = y.max()
+        self.state = self.utility_function.fit(x, y, state=self.state)
+
+        known = {tuple(x_observed) for x_observed in x}
+        fantasies_x = []
+        fantasies_y = []
+
+        def add_fantasy(x_fantasy):
+            known.add(tuple(x_fantasy))
+            fantasies_x.append(x_fantasy)
+            fantasies_y.append(self._get_fantasy(x=x_fantasy, strategy=strategy))
+
+        def condition():
+            self.utility_function.condition(x=np.vstack([x, fantasies_x]),
+                                            y=np.concatenate([y, fantasies_y]))
+
+        for x_pending in self.space.parse_x(configs=pending_configs) if pending_configs else []:
+            add_fantasy(x_pending)
+        if fantasies_x:
+            condition()
+
+        suggestions = []
+        while len(suggestions) < n_suggestions:
+            # The candidates are snapped to the discrete and categorical values,
+            # only the best candidate that was not observed or suggested yet is kept
+            best_suggestion = None
+            for candidate in self._get_candidates(y_max=y_max):
+                suggestion = self.space.get_suggestion(candidate)
+                best_suggestion = best_suggestion or suggestion
+                x_suggestion = self.space.parse_x(configs=[suggestion])[0]
+                if tuple(x_suggestion) not in known:
+                    break
+            else:
+                if not suggestions:  # Suggest the best known point rather than nothing
+                    suggestions.append(best_suggestion)
+                break
+            suggestions.append(suggestion)
+            if len(suggestions) < n_suggestions:
+                add_fantasy(x_suggestion)
+                condition()
+        return suggestions
+
     def get_suggestion(self):
-        x = self._maximize()
-        return self.space.get_suggestion(x)
+        suggestions = self.get_suggestions(n_suggestions=1)
+        return suggestions[0] if suggestions else None
@@ -9,6 +9,20 @@ class GridSearchManager(BaseSearchAlgorithmManager):
 
     NAME = SearchAlgorithms.GRID
 
+    def iter_suggestions(self, iteration_config=None):
+        """Yields the suggestions based on grid search lazily,
+        the grid is not materialized beyond the `n_experiments` suggestions.
+        """
+        matrix = self.hptuning_config.matrix
+
+        keys = list(matrix.keys())
+        values = [v.to_numpy() for v in matrix.values()]
+        n_suggestions = None
+        if self.hptuning_config.grid_search:
+            n_suggestions = self.hptuning_config.grid_search.n_experiments or None
+        for v in itertools.islice(itertools.product(*values), n_suggestions):
+            yield dict(zip(keys, v))
+
     def get_suggestions(self, iteration_config=None):
         """Return a list of suggestions based on grid search.
 
@@ -16,16 +30,4 @@ class GridSearchManager(BaseSearchAlgorithmManager):
             matrix: `dict` representing the {hyperparam: hyperparam matrix config}.
             n_suggestions: number of suggestions to make.
         """
-        matrix = self.hptuning_config.matrix
-
-        suggestions = []
-        keys = list(matrix.keys())
-        values = [v.to_numpy() for v in matrix.values()]
-        for v in itertools.product(*values):
-            suggestions.append(dict(zip(keys, v)))
-
-        if self.hptuning_config.grid_search:
-            n_suggestions = self.hptuning_config.grid_search.n_experiments
-            if n_suggestions:
-                return suggestions[:n_suggestions]
-        return suggestions
+        return list(self.iter_suggestions(iteration_config=iteration_config))
@@ -1,64 +1,92 @@
 import copy
 import numpy as np
-import uuid
 
+from collections.abc import Hashable
 from functools import reduce
 from operator import mul
 
 
-class Suggestion(object):
-    """A structure that defines an experiment hyperparam suggestion."""
+def get_random_generator(seed=None):
+    return np.random.RandomState(seed) if seed else np.random
 
-    def __init__(self, params):
-        self.params = params
 
-    def __eq__(self, other):
-        if self.params.keys() != other.params.keys():
-            return False
+class RandomSampler(object):
+    """Samples distinct suggestions from a matrix in vectorized batches.
 
-        for key, value in self.params.items():
-            if value != other.params[key]:
-                return False
+    Every dimension is sampled for a whole batch at once, the discrete dimensions
+    as indices of their values, and the distributions with `sample`.
+    The duplicates are detected with a set of the suggestions' values.
 
-        return True
+    When the matrix is discrete and the suggestions cover a large part of its space,
+    rejecting duplicates becomes slow, the suggestions are drawn without replacement
+    from the indices of the space instead, the `pvalues` probabilities are ignored then.
+    """
+    # Fraction of a discrete space above which the suggestions are drawn without replacement
+    EXHAUSTIVE_RATIO = 0.5
+    # Minimum number of samples drawn per batch
+    MIN_BATCH_SIZE = 16
 
-    def __repr__(self):
-        return ','.join([
-            '{}:{}'.format(key, val)
-            for (key, val) in sorted(self.params.items())])
+    def __init__(self, matrix, seed=None):
+        self.keys = list(matrix.keys())
+        self.matrix = [matrix[key] for key in self.keys]
+        self.rand_generator = get_random_generator(seed=seed)
+        self.is_discrete = not any(v.is_continuous for v in self.matrix)
+        self.values = [None if v.is_distribution else v.to_numpy() for v in self.matrix]
+        self.space = None
+        if self.is_discrete:
+            self.space = reduce(mul, [len(v.to_numpy()) for v in self.matrix])
 
-    def __hash__(self):
-        return hash(self.__repr__())
+    @staticmethod
+    def get_key(suggestion):
+        return tuple(value if isinstance(value, Hashable) else repr(value)
+                     for value in suggestion)
 
-    def uuid(self):
-        return uuid.uuid5(uuid.NAMESPACE_DNS, self.__repr__())
+    def sample_batch(self, size):
+        columns = []
+        for v, values in zip(self.matrix, self.values):
+            if values is None:
+                columns.append(np.atleast_1d(v.sample(size=size,
+                                                      rand_generator=self.rand_generator)))
+            else:
+                indices = self.rand_generator.randint(len(values), size=size)
+                columns.append([values[i] for i in indices])
+        return zip(*columns)
 
+    def sample_without_replacement(self, size):
+        values = [v.to_numpy() for v in self.matrix]
+        indices = self.rand_generator.choice(self.space, size=size, replace=False)
+        columns = np.unravel_index(indices, [len(v) for v in values])
+        return [tuple(v[i] for v, i in zip(values, suggestion_indices))
+                for suggestion_indices in zip(*columns)]
 
-def get_random_generator(seed=None):
-    return np.random.RandomState(seed) if seed else np.random
+    def sample(self, n_suggestions):
+        if self.is_discrete:
+            n_suggestions = min(n_suggestions, self.space)
+            if n_suggestions >= self.EXHAUSTIVE_RATIO * self.space:
+                return self.sample_without_replacement(size=n_suggestions)
+
+        suggestions = []
+        keys = set()
+        while len(suggestions) < n_suggestions:
+            size = max(2 * (n_suggestions - len(suggestions)), self.MIN_BATCH_SIZE)
+            for suggestion in self.sample_batch(size=size):
+                key = self.get_key(suggestion)
+                if key not in keys:
+                    keys.add(key)
+                    suggestions.append(suggestion)
+                    if len(suggestions) == n_suggestions:
+                        break
+        return suggestions
 
 
 def get_random_suggestions(matrix, n_suggestions, suggestion_params=None, seed=None):
     if not n_suggestions:
         raise ValueError('This search algorithm requires `n_experiments`.')
-    suggestions = []
     suggestion_params = suggestion_params or {}
-    rand_generator = get_random_generator(seed=seed)
-    # Validate number of suggestions and total space
-    all_discrete = True
-    for v in matrix.values():
-        if v.is_continuous:
-            all_discrete = False
-            break
-    if all_discrete:
-        space = reduce(mul, [len(v.to_numpy()) for v in matrix.values()])
-        n_suggestions = n_suggestions if n_suggestions <= space else space
-
-    while n_suggestions > 0:
-        params = copy.deepcopy(suggestion_params)
-        params.update({k: v.sample(rand_generator=rand_generator) for k, v in matrix.items()})
-        suggestion = Suggestion(params=params)
-        if suggestion not in suggestions:
-            suggestions.append(suggestion)
-            n_suggestions -= 1
-    return [suggestion.params for suggestion in suggestions]
+    sampler = RandomSampler(matrix=matrix, seed=seed)
+    suggestions = []
+    for suggestion in sampler.sample(n_suggestions=n_suggestions):
+        params = copy.copy(suggestion_params)
+        params.update(zip(sampler.keys, suggestion))
+        suggestions.append(params)
+    return suggestions
@@ -1,31 +1,142 @@
-from db.models.experiments import Experiment
+import itertools
+import json
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+import auditor
+
+from constants.experiments import ExperimentLifeCycle
+from db.models.experiments import Experiment, ExperimentStatus
+from event_manager.events.experiment import EXPERIMENT_NEW_STATUS
 from hpsearch.tasks.logger import logger
+from libs.repos.utils import assign_code_reference
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import SchedulerCeleryTasks
+from signals.outputs import set_outputs
+from signals.utils import set_persistence, set_tags
+
+# Number of suggestions turned into experiments per bulk insert
+CREATE_EXPERIMENTS_BATCH_SIZE = 500
+
+
+def get_template_key(experiment_spec):
+    """Returns a key of the sections of the spec that the experiment's pre save signal reads."""
+    sections = [experiment_spec.tags] + [
+        section.to_dict() if section else None
+        for section in (experiment_spec.persistence, experiment_spec.outputs, experiment_spec.build)
+    ]
+    return json.dumps(sections, sort_keys=True)
+
+
+def get_experiment_template(experiment_group, experiment_spec):
+    """Returns the attributes set by the experiment's pre save signal,
+    that are shared by the experiments with the same template key.
+
+    Returns None if the experiments need their own outputs refs,
+    in which case they must be created one by one.
+    """
+    experiment = Experiment(project=experiment_group.project,
+                            user_id=experiment_group.user_id,
+                            experiment_group=experiment_group,
+                            config=experiment_spec.parsed_data,
+                            code_reference_id=experiment_group.code_reference_id)
+    set_tags(instance=experiment)
+    set_persistence(instance=experiment)
+    set_outputs(instance=experiment)
+    if experiment.outputs_jobs or experiment.outputs_experiments:
+        return None
+    if experiment_spec.build:
+        assign_code_reference(experiment)
+    return {
+        'tags': experiment.tags,
+        'persistence': experiment.persistence,
+        'outputs': experiment.outputs,
+        'code_reference_id': experiment.code_reference_id,
+    }
+
+
+def bulk_create_group_experiments(experiment_group, experiments_specs, templates):
+    """Creates the experiments of a group with their `created` status in bulk.
+
+    Instead of running the experiment's signals for every experiment,
+    their attributes are computed once per template, see `get_template_key`,
+    the experiments and their statuses are inserted with one query each,
+    and the experiments are linked to their statuses with one update.
+    """
+    experiments = []
+    new_experiments = []
+    for experiment_spec in experiments_specs:
+        key = get_template_key(experiment_spec)
+        if key not in templates:
+            templates[key] = get_experiment_template(experiment_group=experiment_group,
+                                                     experiment_spec=experiment_spec)
+        template = templates[key]
+        if template is None:
+            experiment = Experiment.objects.create(
+                project_id=experiment_group.project_id,
+                user_id=experiment_group.user_id,
+                experiment_group=experiment_group,
+                config=experiment_spec.parsed_data,
+                code_reference_id=experiment_group.code_reference_id)
+        else:
+            experiment = Experiment(project_id=experiment_group.project_id,
+                                    user_id=experiment_group.user_id,
+                                    experiment_group=experiment_group,
+                                    config=experiment_spec.parsed_data,
+                                    declarations=experiment_spec.declarations,
+                                    **template)
+            new_experiments.append(experiment)
+        experiments.append(experiment)
+
+    if not new_experiments:
+        return experiments
+
+    with transaction.atomic():
+        # Postgres returns the ids of the inserted experiments and statuses
+        Experiment.objects.bulk_create(new_experiments)
+        statuses = ExperimentStatus.objects.bulk_create([
+            ExperimentStatus(experiment=experiment, status=ExperimentLifeCycle.CREATED)
+            for experiment in new_experiments
+        ])
+        Experiment.objects.filter(id__in=[experiment.id for experiment in new_experiments]).update(
+            status=Subquery(ExperimentStatus.objects.filter(
+                experiment=OuterRef('id')).values('id')[:1]))
+
+    for experiment, status in zip(new_experiments, statuses):
+        experiment.status = status
+        auditor.record(event_type=EXPERIMENT_NEW_STATUS,
+                       instance=experiment,
+                       previous_status=None)
+    return experiments
 
 
 def create_group_experiments(experiment_group):
     # Parse polyaxonfile content and create the experiments
     specification = experiment_group.specification
-    suggestions = experiment_group.get_suggestions()
+    # The suggestions are consumed in batches, e.g. a grid is never fully materialized
+    suggestions = experiment_group.iter_suggestions()
 
-    if not suggestions:
+    experiments = []
+    templates = {}
+    while True:
+        suggestions_batch = list(itertools.islice(suggestions, CREATE_EXPERIMENTS_BATCH_SIZE))
+        if not suggestions_batch:
+            break
+        experiments_specs = [
+            specification.get_experiment_spec(matrix_declaration=suggestion)
+            for suggestion in suggestions_batch
+        ]
+        experiments += bulk_create_group_experiments(experiment_group=experiment_group,
+                                                     experiments_specs=experiments_specs,
+                                                     templates=templates)
+
+    if not experiments:
         logger.error('Search algorithm `%s` could not make any suggestions.',
                      specification.search_algorithm,
                      extra={'stack': True})
         return
 
-    experiments = []
-    for suggestion in suggestions:
-        # We need to check if we should create or restart
-        experiment = Experiment.objects.create(
-            project_id=experiment_group.project_id,
-            user_id=experiment_group.user_id,
-            experiment_group=experiment_group,
-            config=specification.get_experiment_spec(matrix_declaration=suggestion).parsed_data,
-            code_reference_id=experiment_group.code_reference_id)
-        experiments.append(experiment)
-
     return experiments
 
 
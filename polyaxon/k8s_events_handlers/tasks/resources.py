@@ -1,10 +1,11 @@
 from k8s_events_handlers.tasks.logger import logger
+from libs.resources_metrics import create_resources_metrics
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import K8SEventsCeleryTasks
 
 
 @celery_app.task(name=K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_RESOURCES, ignore_result=True)
-def k8s_handle_events_resources(payload, persist):
-    # here we must persist resources if requested
-    logger.info('handling events resources with persist:%s', persist)
-    logger.info(payload)
+def k8s_handle_events_resources(payloads, persist, timestamp=None):
+    logger.debug('handling %s events resources with persist:%s', len(payloads), persist)
+    if persist and payloads:
+        create_resources_metrics(payloads=payloads, timestamp=timestamp)
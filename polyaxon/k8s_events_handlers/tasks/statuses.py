@@ -1,16 +1,25 @@
+import uuid
+
+from collections import OrderedDict
+
 from django.conf import settings
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, DateTimeField, IntegerField, Value, When
 
+from constants.jobs import JobLifeCycle
 from db.models.build_jobs import BuildJob
-from db.models.experiment_jobs import ExperimentJob
+from db.models.experiment_jobs import ExperimentJob, ExperimentJobStatus
 from db.models.experiments import Experiment
 from db.models.jobs import Job
 from db.models.notebooks import NotebookJob
 from db.models.projects import Project
 from db.models.tensorboards import TensorboardJob
+from db.redis.containers import RedisJobContainers
+from db.redis.statuses import RedisStatuses
 from k8s_events_handlers.tasks.logger import logger
 from polyaxon.celery_api import celery_app
-from polyaxon.settings import Intervals, K8SEventsCeleryTasks
+from polyaxon.settings import Intervals, K8SEventsCeleryTasks, SchedulerCeleryTasks
+from signals.run_time import set_job_finished_at, set_job_started_at
 
 
 def set_node_scheduling(job, node_name):
@@ -60,6 +69,107 @@ def k8s_events_handle_experiment_job_statuses(self, payload):
         self.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
 
 
+def get_case(values, output_field):
+    return Case(*[When(id=key, then=Value(value)) for key, value in values.items()],
+                output_field=output_field)
+
+
+def handle_experiment_jobs_statuses(payloads, defer_new_jobs=True):
+    """Sets the statuses of many experiment jobs at once.
+
+    The jobs are loaded in one query, the transitions are validated in memory,
+    the new statuses are bulk inserted and the jobs are updated with one query.
+    The statuses of the affected experiments are recomputed once.
+
+    Returns the payloads of the jobs without a status yet,
+    if they should be deferred until the job is created.
+    """
+    jobs_payloads = OrderedDict()
+    for payload in payloads:
+        job_uuid = uuid.UUID(payload['details']['labels']['job_uuid']).hex
+        jobs_payloads.setdefault(job_uuid, []).append(payload)
+
+    jobs = ExperimentJob.objects.filter(uuid__in=list(jobs_payloads.keys())).select_related(
+        'status', 'experiment', 'experiment__status')
+    deferred = []
+    new_statuses = []
+    updated_jobs = {}
+    for job in jobs:
+        job_payloads = jobs_payloads[job.uuid.hex]
+        if job.last_status is None and defer_new_jobs:
+            deferred += job_payloads
+            continue
+        current_status = job.last_status
+        for payload in job_payloads:
+            if JobLifeCycle.is_done(current_status):
+                break
+            details = payload['details']
+            if not job.node_scheduled and details.get('node_name'):
+                job.node_scheduled = details['node_name']
+                updated_jobs[job.id] = job
+            if not JobLifeCycle.can_transition(status_from=current_status,
+                                               status_to=payload['status']):
+                continue
+            job_status = ExperimentJobStatus(job=job,
+                                             status=payload['status'],
+                                             message=payload['message'],
+                                             traceback=payload.get('traceback'),
+                                             details=details)
+            new_statuses.append(job_status)
+            current_status = job_status.status
+            set_job_started_at(instance=job, status=current_status)
+            set_job_finished_at(instance=job, status=current_status)
+            updated_jobs[job.id] = job
+
+    if not updated_jobs:
+        return deferred
+
+    with transaction.atomic():
+        # Postgres returns the ids of the inserted statuses
+        ExperimentJobStatus.objects.bulk_create(new_statuses)
+        for job_status in new_statuses:
+            job_status.job.status = job_status
+
+        jobs = updated_jobs.values()
+        ExperimentJob.objects.filter(id__in=list(updated_jobs.keys())).update(
+            status=get_case({job.id: job.status_id for job in jobs}, IntegerField()),
+            started_at=get_case({job.id: job.started_at for job in jobs}, DateTimeField()),
+            finished_at=get_case({job.id: job.finished_at for job in jobs}, DateTimeField()),
+            node_scheduled=get_case({job.id: job.node_scheduled for job in jobs}, CharField()))
+
+    for job in updated_jobs.values():
+        if job.is_done:
+            RedisJobContainers.remove_job(job.uuid.hex)
+
+    experiment_ids = {job_status.job.experiment_id for job_status in new_statuses
+                      if not job_status.job.experiment.is_done}
+    # The statuses are recomputed once for all the jobs updates happening in a short period
+    if RedisStatuses.mark_experiments(experiment_ids=experiment_ids):
+        celery_app.send_task(
+            SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUSES,
+            countdown=1)
+    logger.debug('%s statuses are set for %s jobs', len(new_statuses), len(updated_jobs))
+    return deferred
+
+
+@celery_app.task(name=K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_EXPERIMENT_JOBS_STATUSES,
+                 bind=True,
+                 max_retries=3,
+                 ignore_result=True)
+def k8s_events_handle_experiment_jobs_statuses(self, payloads):
+    """Experiment jobs statuses in batch"""
+    try:
+        deferred = handle_experiment_jobs_statuses(payloads=payloads,
+                                                   defer_new_jobs=self.request.retries < 2)
+    except IntegrityError:
+        # Due to concurrency this could happen, we just retry it
+        logger.info('Retry %s jobs statuses handling', len(payloads))
+        self.retry(countdown=1)
+
+    if deferred:
+        self.retry(kwargs={'payloads': deferred}, countdown=1)
+
+
 @celery_app.task(name=K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_JOB_STATUSES,
                  bind=True,
                  max_retries=3,
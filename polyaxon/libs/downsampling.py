@@ -0,0 +1,96 @@
+import math
+
+
+class DownsamplingMethods(object):
+    LTTB = 'lttb'
+    MIN_MAX = 'minmax'
+
+    VALUES = {LTTB, MIN_MAX}
+
+
+def lttb(points, threshold):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of the selected points, `points` is a list of (x, y) sorted by x.
+    """
+    n_points = len(points)
+    if threshold >= n_points:
+        return list(range(n_points))
+    if threshold <= 2:
+        return [0, n_points - 1][:max(threshold, 0)]
+
+    every = (n_points - 2) / (threshold - 2)
+    indices = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # The average point of the next bucket
+        avg_start = int(math.floor((i + 1) * every)) + 1
+        avg_end = min(int(math.floor((i + 2) * every)) + 1, n_points)
+        avg_length = avg_end - avg_start
+        avg_x = sum(points[j][0] for j in range(avg_start, avg_end)) / avg_length
+        avg_y = sum(points[j][1] for j in range(avg_start, avg_end)) / avg_length
+
+        # The point of the current bucket forming the largest triangle
+        range_start = int(math.floor(i * every)) + 1
+        range_end = int(math.floor((i + 1) * every)) + 1
+        a_x, a_y = points[a]
+        max_area = -1
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs((a_x - avg_x) * (points[j][1] - a_y) - (a_x - points[j][0]) * (avg_y - a_y))
+            if area > max_area:
+                max_area = area
+                next_a = j
+        indices.append(next_a)
+        a = next_a
+
+    indices.append(n_points - 1)
+    return indices
+
+
+def min_max(points, threshold):
+    """Min-max buckets downsampling.
+
+    Returns the indices of the min and max points of every bucket,
+    `points` is a list of (x, y) sorted by x.
+    """
+    n_points = len(points)
+    if threshold >= n_points:
+        return list(range(n_points))
+    if threshold < 2:
+        # A bucket has 2 points
+        return [0][:max(threshold, 0)]
+    n_buckets = threshold // 2
+    bucket_size = int(math.ceil(n_points / n_buckets))
+    indices = []
+    for start in range(0, n_points, bucket_size):
+        bucket = range(start, min(start + bucket_size, n_points))
+        min_index = min(bucket, key=lambda j: points[j][1])
+        max_index = max(bucket, key=lambda j: points[j][1])
+        indices.extend(sorted({min_index, max_index}))
+    return indices
+
+
+def min_max_buckets(points):
+    """Min-max downsampling of points already assigned to their buckets.
+
+    `points` is an iterable of (bucket, key, y), that is only iterated once,
+    returns the keys of the min and max points of every bucket.
+    """
+    buckets = {}
+    for bucket, key, y in points:
+        if bucket not in buckets:
+            buckets[bucket] = [(y, key), (y, key)]
+            continue
+        bucket_min, bucket_max = buckets[bucket]
+        if y < bucket_min[0]:
+            buckets[bucket][0] = (y, key)
+        elif y > bucket_max[0]:
+            buckets[bucket][1] = (y, key)
+    return {key for bucket_min_max in buckets.values() for _, key in bucket_min_max}
+
+
+def downsample(points, threshold, method=DownsamplingMethods.LTTB):
+    if method == DownsamplingMethods.MIN_MAX:
+        return min_max(points=points, threshold=threshold)
+    return lttb(points=points, threshold=threshold)
@@ -0,0 +1,452 @@
+import fcntl
+import gzip
+import os
+import re
+import struct
+import time
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+from django.conf import settings
+
+IndexEntry = namedtuple('IndexEntry', ['line', 'offset', 'timestamp'])
+
+CHUNK_SIZE = 8192
+
+
+def count_lines(file_obj, start, end):
+    """Counts the lines between the offsets `start` and `end` of a file."""
+    file_obj.seek(start)
+    lines = 0
+    remaining = end - start
+    while remaining > 0:
+        data = file_obj.read(min(CHUNK_SIZE * 8, remaining))
+        if not data:
+            break
+        lines += data.count(b'\n')
+        remaining -= len(data)
+    return lines
+
+
+class LogsStore(object):
+    """Segmented storage for the logs of an experiment or a job.
+
+    The logs are appended to the current segment stored at `log_path`,
+    once it reaches the segment size, it is sealed and renamed to `<log_path>.<n>`.
+
+    Every segment has a sparse index `<segment>.index`, with an entry `line offset timestamp`
+    written every index interval (in bytes or seconds), the index allows reading
+    a range of lines, the tail, or the lines logged since a timestamp
+    without reading the whole logs. Segments without an index (e.g. logs written before
+    the index was introduced) are still readable, but need to be scanned.
+
+    Once the logs are done, they are archived: the sealed segments are compressed
+    to `<segment>.gz` as a sequence of independent gzip members, one per index entry,
+    the index of a compressed segment points to the members, so that it can still be read
+    from an index entry without decompressing the whole segment.
+    """
+    INDEX_SUFFIX = '.index'
+    COMPRESSED_SUFFIX = '.gz'
+    # Max uncompressed size of a gzip member, for the ranges not covered by the index
+    MAX_MEMBER_SIZE = 1024 * 1024
+
+    def __init__(self,
+                 log_path,
+                 segment_size=None,
+                 index_interval_bytes=None,
+                 index_interval_seconds=None,
+                 compression_level=None):
+        self.log_path = log_path
+        self.segment_size = segment_size or settings.LOGS_SEGMENT_SIZE
+        self.index_interval_bytes = index_interval_bytes or settings.LOGS_INDEX_INTERVAL_BYTES
+        self.index_interval_seconds = (index_interval_seconds or
+                                       settings.LOGS_INDEX_INTERVAL_SECONDS)
+        self.compression_level = compression_level or settings.LOGS_COMPRESSION_LEVEL
+
+    @classmethod
+    def get_index_path(cls, segment_path):
+        return segment_path + cls.INDEX_SUFFIX
+
+    @classmethod
+    def is_compressed(cls, segment_path):
+        return segment_path.endswith(cls.COMPRESSED_SUFFIX)
+
+    def _get_numbered_sealed_segments(self):
+        """Returns the sealed segments by number."""
+        dirname, basename = os.path.split(self.log_path)
+        try:
+            filenames = os.listdir(dirname)
+        except FileNotFoundError:
+            return {}
+        pattern = re.compile(r'^{}\.(?P<number>[0-9]+)(?P<compressed>{})?$'.format(
+            re.escape(basename), re.escape(self.COMPRESSED_SUFFIX)))
+        segments = {}
+        for filename in filenames:
+            match = pattern.match(filename)
+            if not match:
+                continue
+            number = int(match.group('number'))
+            # While a segment is being archived, the uncompressed segment is used
+            if match.group('compressed') and number in segments:
+                continue
+            segments[number] = os.path.join(dirname, filename)
+        return segments
+
+    def get_sealed_segments(self):
+        """Returns the sealed segments ordered from the oldest to the newest."""
+        segments = self._get_numbered_sealed_segments()
+        return [segments[number] for number in sorted(segments)]
+
+    def get_segments(self):
+        segments = self.get_sealed_segments()
+        if os.path.exists(self.log_path):
+            segments.append(self.log_path)
+        return segments
+
+    def exists(self):
+        return bool(self.get_segments())
+
+    @classmethod
+    def get_segment_size(cls, segment_path):
+        """Returns the uncompressed size of a segment."""
+        if not cls.is_compressed(segment_path):
+            return os.path.getsize(segment_path)
+        # Every member ends with its uncompressed size
+        entries = cls.read_index(segment_path)
+        size = 0
+        with open(segment_path, 'rb') as segment_file:
+            for entry, next_entry in zip(entries, entries[1:]):
+                if next_entry.offset > entry.offset:
+                    segment_file.seek(next_entry.offset - 4)
+                    size += struct.unpack('<I', segment_file.read(4))[0]
+        return size
+
+    def get_size(self):
+        return sum(self.get_segment_size(segment) for segment in self.get_segments())
+
+    def get_paths(self):
+        """All the paths used by the logs, segments and indexes."""
+        paths = []
+        for segment in self.get_sealed_segments() + [self.log_path]:
+            for path in (segment, self.get_index_path(segment)):
+                if os.path.exists(path):
+                    paths.append(path)
+        return paths
+
+    def delete(self):
+        for path in self.get_paths():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    # Index
+
+    @classmethod
+    def read_index(cls, segment_path):
+        entries = []
+        try:
+            with open(cls.get_index_path(segment_path), 'r') as index_file:
+                for line in index_file:
+                    values = line.split()
+                    if len(values) != 3:
+                        continue
+                    entries.append(IndexEntry(int(values[0]), int(values[1]), float(values[2])))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    @classmethod
+    def read_last_index_entry(cls, segment_path):
+        try:
+            with open(cls.get_index_path(segment_path), 'rb') as index_file:
+                index_file.seek(0, os.SEEK_END)
+                size = index_file.tell()
+                index_file.seek(max(size - 256, 0))
+                lines = index_file.read().split(b'\n')
+        except FileNotFoundError:
+            return None
+        for line in reversed(lines):
+            values = line.split()
+            if len(values) == 3:
+                return IndexEntry(int(values[0]), int(values[1]), float(values[2]))
+        return None
+
+    @classmethod
+    def write_index_entry(cls, segment_path, entry):
+        with open(cls.get_index_path(segment_path), 'a') as index_file:
+            index_file.write('{} {} {}\n'.format(entry.line, entry.offset, entry.timestamp))
+
+    def _update_index(self, log_file, offset, now):
+        """Adds an index entry for the lines about to be written at `offset`, if needed."""
+        last_entry = self.read_last_index_entry(self.log_path)
+        if last_entry is None:
+            # New segment, or a segment written before the index was introduced
+            line = count_lines(log_file, 0, offset) if offset else 0
+        elif (offset - last_entry.offset >= self.index_interval_bytes or
+              now - last_entry.timestamp >= self.index_interval_seconds):
+            line = last_entry.line + count_lines(log_file, last_entry.offset, offset)
+        else:
+            return
+        self.write_index_entry(self.log_path, IndexEntry(line, offset, now))
+
+    def _seal(self, log_file, size, now):
+        """Seals the current segment, its last index entry holds the number of lines."""
+        last_entry = self.read_last_index_entry(self.log_path) or IndexEntry(0, 0, now)
+        lines = last_entry.line + count_lines(log_file, last_entry.offset, size)
+        self.write_index_entry(self.log_path, IndexEntry(lines, size, now))
+
+        # The newest sealed segment could be compressed, i.e. `<log_path>.<n>.gz`
+        number = max(self._get_numbered_sealed_segments(), default=0) + 1
+        segment_path = '{}.{}'.format(self.log_path, number)
+        os.rename(self.get_index_path(self.log_path), self.get_index_path(segment_path))
+        os.rename(self.log_path, segment_path)
+
+    def _is_current(self, log_file):
+        try:
+            return os.fstat(log_file.fileno()).st_ino == os.stat(self.log_path).st_ino
+        except FileNotFoundError:
+            return False
+
+    def append(self, log_lines):
+        data = (log_lines + '\n').encode('utf-8')
+        while True:
+            with open(self.log_path, 'a+b') as log_file:
+                fcntl.flock(log_file, fcntl.LOCK_EX)
+                try:
+                    if not self._is_current(log_file):
+                        # The segment was sealed while waiting for the lock
+                        continue
+                    now = time.time()
+                    offset = os.fstat(log_file.fileno()).st_size
+                    self._update_index(log_file=log_file, offset=offset, now=now)
+                    log_file.write(data)
+                    log_file.flush()
+                    if offset + len(data) >= self.segment_size:
+                        self._seal(log_file=log_file, size=offset + len(data), now=now)
+                finally:
+                    fcntl.flock(log_file, fcntl.LOCK_UN)
+            return
+
+    # Archives
+
+    def _compress_segment(self, segment_path):
+        """Compresses a sealed segment, with a gzip member per index entry."""
+        entries = self.read_index(segment_path)
+        size = os.path.getsize(segment_path)
+        if not entries or entries[0].offset != 0:
+            timestamp = entries[0].timestamp if entries else os.path.getmtime(segment_path)
+            entries = [IndexEntry(0, 0, timestamp)] + entries
+
+        compressed_path = segment_path + self.COMPRESSED_SUFFIX
+        compressed_entries = []
+        line = 0
+        with open(segment_path, 'rb') as segment_file:
+            with open(compressed_path + '.tmp', 'wb') as compressed_file:
+                for entry, next_entry in zip(entries, entries[1:] + [None]):
+                    end = next_entry.offset if next_entry else size
+                    segment_file.seek(entry.offset)
+                    line = entry.line
+                    remaining = end - entry.offset
+                    while remaining > 0:
+                        data = segment_file.read(min(self.MAX_MEMBER_SIZE, remaining))
+                        if not data:
+                            break
+                        # The members must start at the beginning of a line
+                        cut = data.rfind(b'\n') + 1
+                        while not cut and len(data) < remaining:
+                            # A line longer than the member size
+                            more = segment_file.read(min(self.MAX_MEMBER_SIZE,
+                                                         remaining - len(data)))
+                            if not more:
+                                break
+                            data += more
+                            cut = data.rfind(b'\n') + 1
+                        if len(data) < remaining and 0 < cut < len(data):
+                            segment_file.seek(cut - len(data), os.SEEK_CUR)
+                            data = data[:cut]
+                        remaining -= len(data)
+                        compressed_entries.append(
+                            IndexEntry(line, compressed_file.tell(), entry.timestamp))
+                        compressed_file.write(
+                            gzip.compress(data, compresslevel=self.compression_level))
+                        line += data.count(b'\n')
+                compressed_entries.append(
+                    IndexEntry(line, compressed_file.tell(), entries[-1].timestamp))
+
+        index_path = self.get_index_path(compressed_path)
+        with open(index_path + '.tmp', 'w') as index_file:
+            for entry in compressed_entries:
+                index_file.write('{} {} {}\n'.format(entry.line, entry.offset, entry.timestamp))
+        os.rename(index_path + '.tmp', index_path)
+        os.rename(compressed_path + '.tmp', compressed_path)
+        os.remove(segment_path)
+        try:
+            os.remove(self.get_index_path(segment_path))
+        except FileNotFoundError:
+            pass
+
+    def archive(self):
+        """Seals the current segment and compresses all sealed segments.
+
+        Should be called once no more logs are expected, logs appended afterwards
+        are written to a new current segment.
+        """
+        try:
+            with open(self.log_path, 'r+b') as log_file:
+                fcntl.flock(log_file, fcntl.LOCK_EX)
+                try:
+                    if self._is_current(log_file):
+                        size = os.fstat(log_file.fileno()).st_size
+                        if size:
+                            self._seal(log_file=log_file, size=size, now=time.time())
+                finally:
+                    fcntl.flock(log_file, fcntl.LOCK_UN)
+        except FileNotFoundError:
+            pass
+
+        for segment in self.get_sealed_segments():
+            if not self.is_compressed(segment):
+                self._compress_segment(segment)
+
+    # Reads
+
+    @classmethod
+    @contextmanager
+    def _open_segment(cls, segment_path, offset=0):
+        """Opens a segment for reading its uncompressed content from an index entry offset."""
+        with open(segment_path, 'rb') as segment_file:
+            segment_file.seek(offset)
+            if cls.is_compressed(segment_path):
+                with gzip.GzipFile(fileobj=segment_file, mode='rb') as compressed_file:
+                    yield compressed_file
+            else:
+                yield segment_file
+
+    def get_segment_lines(self, segment_path):
+        """Returns the number of lines of a segment."""
+        last_entry = self.read_last_index_entry(segment_path) or IndexEntry(0, 0, 0)
+        if self.is_compressed(segment_path):
+            # Compressed segments always end with an entry holding the number of lines
+            return last_entry.line
+        with open(segment_path, 'rb') as segment_file:
+            segment_file.seek(0, os.SEEK_END)
+            size = segment_file.tell()
+            return last_entry.line + count_lines(segment_file, last_entry.offset, size)
+
+    @classmethod
+    def _iter_segment_lines(cls, segment_path, offset=0):
+        with cls._open_segment(segment_path, offset) as segment_file:
+            for line in segment_file:
+                yield line.rstrip(b'\n').decode('utf-8', errors='replace')
+
+    def iter_chunks(self, chunk_size=CHUNK_SIZE):
+        """Yields the uncompressed content of all segments."""
+        for segment in self.get_segments():
+            with self._open_segment(segment) as segment_file:
+                while True:
+                    data = segment_file.read(chunk_size)
+                    if not data:
+                        break
+                    yield data
+
+    @classmethod
+    def _tail_compressed_segment(cls, segment_path, num_lines):
+        entries = cls.read_index(segment_path)
+        if not entries:
+            return []
+        start_entry = entries[0]
+        for entry in entries[:-1]:
+            if entry.line > entries[-1].line - num_lines:
+                break
+            start_entry = entry
+        lines = list(cls._iter_segment_lines(segment_path, start_entry.offset))
+        return lines[-num_lines:]
+
+    @classmethod
+    def _tail_segment(cls, segment_path, num_lines):
+        if cls.is_compressed(segment_path):
+            return cls._tail_compressed_segment(segment_path, num_lines)
+        with open(segment_path, 'rb') as segment_file:
+            segment_file.seek(0, os.SEEK_END)
+            position = segment_file.tell()
+            data = b''
+            while position > 0 and data.count(b'\n') <= num_lines:
+                read_size = min(CHUNK_SIZE, position)
+                position -= read_size
+                segment_file.seek(position)
+                data = segment_file.read(read_size) + data
+        lines = data.split(b'\n')
+        if lines and not lines[-1]:
+            lines.pop()
+        if position > 0:
+            # The first line is not complete
+            lines = lines[1:]
+        return [line.decode('utf-8', errors='replace') for line in lines[-num_lines:]]
+
+    def tail(self, num_lines):
+        """Returns the last `num_lines` lines, only the end of the logs is read."""
+        lines = []
+        if num_lines <= 0:
+            return lines
+        for segment in reversed(self.get_segments()):
+            if len(lines) >= num_lines:
+                break
+            lines = self._tail_segment(segment, num_lines - len(lines)) + lines
+        return lines
+
+    def read_range(self, start_line=0, end_line=None):
+        """Yields the lines in [start_line, end_line), line numbers start at 0."""
+        start_line = max(start_line or 0, 0)
+        segment_start = 0
+        for segment in self.get_segments():
+            if end_line is not None and segment_start >= end_line:
+                return
+            segment_lines = self.get_segment_lines(segment)
+            segment_end = segment_start + segment_lines
+            if segment_end <= start_line:
+                segment_start = segment_end
+                continue
+
+            local_start = max(start_line - segment_start, 0)
+            entry = IndexEntry(0, 0, 0)
+            for index_entry in self.read_index(segment):
+                if index_entry.line > local_start:
+                    break
+                entry = index_entry
+            line_number = segment_start + entry.line
+            for line in self._iter_segment_lines(segment, entry.offset):
+                if end_line is not None and line_number >= end_line:
+                    return
+                if line_number >= start_line:
+                    yield line
+                line_number += 1
+            segment_start = segment_end
+
+    def read_since(self, timestamp):
+        """Yields the lines logged since `timestamp`.
+
+        The lines are selected with the granularity of the index interval,
+        i.e. some lines logged slightly before the timestamp could be returned.
+        """
+        started = False
+        for segment in self.get_segments():
+            offset = 0
+            if not started:
+                entries = self.read_index(segment)
+                is_sealed = segment != self.log_path
+                if is_sealed and entries and entries[-1].timestamp < timestamp:
+                    # All the lines of this segment were logged before the timestamp
+                    continue
+                for entry in entries:
+                    if entry.timestamp > timestamp:
+                        break
+                    offset = entry.offset
+                started = True
+            for line in self._iter_segment_lines(segment, offset):
+                yield line
+
+
+def get_logs_store(log_path):
+    return LogsStore(log_path=log_path)
@@ -4,6 +4,7 @@ import shutil
 from django.conf import settings
 
 from db.models.cloning_strategies import CloningStrategy
+from libs.logs_store import get_logs_store
 from libs.paths.outputs_paths import get_outputs_paths
 from libs.paths.utils import create_path, delete_path
 
@@ -35,6 +36,12 @@ def get_experiment_logs_path(experiment_name):
 def delete_experiment_logs(experiment_name):
     path = get_experiment_logs_path(experiment_name)
     delete_path(path)
+    # Sealed segments and indexes
+    get_logs_store(path).delete()
+
+
+def archive_experiment_logs(experiment_name):
+    get_logs_store(get_experiment_logs_path(experiment_name)).archive()
 
 
 def delete_experiment_outputs(persistence_outputs, experiment_name):
@@ -2,6 +2,7 @@ import os
 
 from django.conf import settings
 
+from libs.logs_store import get_logs_store
 from libs.paths.outputs_paths import get_outputs_paths
 from libs.paths.utils import create_path, delete_path
 
@@ -23,6 +24,12 @@ def delete_job_outputs(persistence_outputs, job_name):
 def delete_job_logs(job_name):
     path = get_job_logs_path(job_name)
     delete_path(path)
+    # Sealed segments and indexes
+    get_logs_store(path).delete()
+
+
+def archive_job_logs(job_name):
+    get_logs_store(get_job_logs_path(job_name)).archive()
 
 
 def create_job_path(job_name, path):
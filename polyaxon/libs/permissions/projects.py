@@ -13,7 +13,7 @@ _logger = logging.getLogger(__name__)
 def has_project_permissions(user, project, request_method):
     """This logic is extracted here to be used also with Sanic api."""
     # Superusers and the creator is allowed to do everything
-    if user.is_staff or project.user == user:
+    if user.is_staff or project.user_id == user.id:
         return True
 
     # Other user
@@ -51,8 +51,11 @@ class IsItemProjectOwnerOrPublicReadOnly(permissions.BasePermission):
                 extra={'stack': True})
             return False
 
+        # The project was most likely resolved already by the view
+        project = get_request_project(request=request,
+                                      project_id=getattr(obj, 'project_id', None)) or obj.project
         return has_project_permissions(user=request.user,
-                                       project=obj.project,
+                                       project=project,
                                        request_method=request.method)
 
 
@@ -71,12 +74,32 @@ def check_access_project_item(view, request, project):
         )
 
 
+def get_request_project(request, project_id):
+    """Returns the project with this id if it was already resolved during the request."""
+    for project in getattr(request, '_permissible_projects', {}).values():
+        if project.id == project_id:
+            return project
+    return None
+
+
 def get_permissible_project(view):
+    """Returns the project of the view's url after checking the user's access to it.
+
+    The project is resolved once per request.
+    """
     username = view.kwargs['username']
     project_name = view.kwargs['name']
+    request = view.request
+    if not hasattr(request, '_permissible_projects'):
+        request._permissible_projects = {}
+    project = request._permissible_projects.get((username, project_name))
+    if project is not None:
+        return project
+
     project = get_object_or_404(Project, name=project_name, user__username=username)
 
     # Check project permissions
-    check_access_project_item(view=view, request=view.request, project=project)
+    check_access_project_item(view=view, request=request, project=project)
 
+    request._permissible_projects[(username, project_name)] = project
     return project
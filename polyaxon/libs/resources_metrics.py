@@ -0,0 +1,115 @@
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Avg, Max
+from django.db.models.functions import TruncHour, TruncMinute
+from django.utils import timezone
+
+from db.models.experiment_jobs import ExperimentJob
+from db.models.resources_metrics import ResourcesMetric, ResourcesMetricResolution
+
+BATCH_SIZE = 1000
+
+TRUNCATE_FUNCTIONS = {
+    ResourcesMetricResolution.MINUTE: TruncMinute,
+    ResourcesMetricResolution.HOUR: TruncHour,
+}
+
+
+def get_gpu_stats(gpu_resources):
+    """Returns the average gpu utilization and the total gpu memory used."""
+    if not gpu_resources:
+        return None, None
+    utilization = [gpu.get('utilization_gpu') or 0 for gpu in gpu_resources]
+    memory_used = [gpu.get('memory_used') or 0 for gpu in gpu_resources]
+    return sum(utilization) / len(utilization), sum(memory_used)
+
+
+def create_resources_metrics(payloads, timestamp=None):
+    """Persists a batch of `ContainerResourcesConfig` payloads with a single insert."""
+    created_at = (datetime.fromtimestamp(timestamp, tz=timezone.utc)
+                  if timestamp else timezone.now())
+    job_uuids = {payload['job_uuid'] for payload in payloads}
+    jobs = {
+        job_uuid.hex: job_id for job_uuid, job_id in
+        ExperimentJob.objects.filter(uuid__in=job_uuids).values_list('uuid', 'id')
+    }
+
+    metrics = []
+    for payload in payloads:
+        job_id = jobs.get(payload['job_uuid'])
+        if not job_id:
+            continue
+        gpu_utilization, gpu_memory_used = get_gpu_stats(payload.get('gpu_resources'))
+        metrics.append(ResourcesMetric(
+            job_id=job_id,
+            created_at=created_at,
+            n_cpus=payload.get('n_cpus'),
+            cpu_percentage=payload['cpu_percentage'],
+            cpu_percentage_max=payload['cpu_percentage'],
+            memory_used=payload['memory_used'],
+            memory_used_max=payload['memory_used'],
+            memory_limit=payload['memory_limit'],
+            gpu_utilization=gpu_utilization,
+            gpu_utilization_max=gpu_utilization,
+            gpu_memory_used=gpu_memory_used,
+            gpu_memory_used_max=gpu_memory_used,
+            gpu_resources=payload.get('gpu_resources')))
+
+    return ResourcesMetric.objects.bulk_create(metrics, batch_size=BATCH_SIZE)
+
+
+def get_bucket_start(value, resolution):
+    value = value.replace(second=0, microsecond=0)
+    if resolution == ResourcesMetricResolution.HOUR:
+        value = value.replace(minute=0)
+    return value
+
+
+def rollup_resources_metrics(source_resolution, resolution, older_than):
+    """Aggregates the metrics older than a date into buckets of a lower resolution.
+
+    Only complete buckets are aggregated, the aggregated metrics are then deleted.
+    """
+    cutoff = get_bucket_start(older_than, resolution)
+    queryset = ResourcesMetric.objects.filter(resolution=source_resolution,
+                                              created_at__lt=cutoff)
+    buckets = queryset.annotate(
+        bucket=TRUNCATE_FUNCTIONS[resolution]('created_at')
+    ).values('job_id', 'bucket').annotate(
+        avg_cpu_percentage=Avg('cpu_percentage'),
+        max_cpu_percentage=Max('cpu_percentage_max'),
+        avg_memory_used=Avg('memory_used'),
+        max_memory_used=Max('memory_used_max'),
+        max_memory_limit=Max('memory_limit'),
+        max_n_cpus=Max('n_cpus'),
+        avg_gpu_utilization=Avg('gpu_utilization'),
+        max_gpu_utilization=Max('gpu_utilization_max'),
+        avg_gpu_memory_used=Avg('gpu_memory_used'),
+        max_gpu_memory_used=Max('gpu_memory_used_max'),
+    ).order_by()
+
+    def to_int(value):
+        return int(value) if value is not None else None
+
+    with transaction.atomic():
+        metrics = [
+            ResourcesMetric(
+                job_id=bucket['job_id'],
+                created_at=bucket['bucket'],
+                resolution=resolution,
+                n_cpus=bucket['max_n_cpus'],
+                cpu_percentage=bucket['avg_cpu_percentage'],
+                cpu_percentage_max=bucket['max_cpu_percentage'],
+                memory_used=to_int(bucket['avg_memory_used']),
+                memory_used_max=bucket['max_memory_used'],
+                memory_limit=bucket['max_memory_limit'],
+                gpu_utilization=bucket['avg_gpu_utilization'],
+                gpu_utilization_max=bucket['max_gpu_utilization'],
+                gpu_memory_used=to_int(bucket['avg_gpu_memory_used']),
+                gpu_memory_used_max=bucket['max_gpu_memory_used'])
+            for bucket in buckets.iterator()
+        ]
+        ResourcesMetric.objects.bulk_create(metrics, batch_size=BATCH_SIZE)
+        queryset.delete()
+    return len(metrics)
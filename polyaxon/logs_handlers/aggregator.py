@@ -0,0 +1,309 @@
+import logging
+import time
+import uuid
+
+from collections import OrderedDict, namedtuple
+
+from kombu import Consumer, Exchange, Queue
+from kombu.mixins import ConsumerMixin
+from redis import RedisError
+
+from django.conf import settings
+
+import publisher
+
+from db.models.build_jobs import BuildJob
+from db.models.experiments import Experiment
+from db.models.jobs import Job
+from db.redis.to_stream import RedisToStream
+from logs_handlers.utils import safe_log_experiment_job, safe_log_job
+from polyaxon.settings import CeleryQueues, LogsCeleryTasks, RoutingKeys
+
+logger = logging.getLogger('polyaxon.logs_handlers.aggregator')
+
+LogEntry = namedtuple('LogEntry',
+                      ['kind', 'object_uuid', 'object_name', 'job_uuid', 'log_lines', 'stream'])
+
+
+class LogKinds(object):
+    EXPERIMENT = 'experiment'
+    JOB = 'job'
+    BUILD = 'build'
+
+    MODELS = {
+        EXPERIMENT: Experiment,
+        JOB: Job,
+        BUILD: BuildJob,
+    }
+
+
+# Maps the logs tasks to the kind of logs they handle and whether they should be streamed
+LOGS_TASKS = {
+    LogsCeleryTasks.LOGS_SIDECARS_EXPERIMENTS: (LogKinds.EXPERIMENT, True),
+    LogsCeleryTasks.LOGS_HANDLE_EXPERIMENT_JOB: (LogKinds.EXPERIMENT, False),
+    LogsCeleryTasks.LOGS_SIDECARS_JOBS: (LogKinds.JOB, True),
+    LogsCeleryTasks.LOGS_HANDLE_JOB: (LogKinds.JOB, False),
+    LogsCeleryTasks.LOGS_SIDECARS_BUILDS: (LogKinds.BUILD, True),
+    LogsCeleryTasks.LOGS_HANDLE_BUILD_JOB: (LogKinds.BUILD, False),
+}
+
+
+class TTLCache(object):
+    """A minimal in memory cache with a fixed time to live per value."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._values = {}
+
+    def get(self, key, default=None):
+        value = self._values.get(key)
+        if value is None:
+            return default
+        value, expires_at = value
+        if expires_at < time.monotonic():
+            self._values.pop(key, None)
+            return default
+        return value
+
+    def set(self, key, value):
+        self._values[key] = (value, time.monotonic() + self.ttl)
+
+    def purge(self):
+        now = time.monotonic()
+        self._values = {key: value for key, value in self._values.items() if value[1] >= now}
+
+
+class LogsAggregator(object):
+    """Buffers the logs of experiments, jobs and builds, and flushes them in bulk.
+
+    A flush:
+        * checks the existence of all the buffered objects with one query per kind,
+          the results are cached for the existence ttl.
+        * appends the buffered logs of every file at once.
+        * streams the logs of the monitored objects, the monitored objects are
+          cached for the monitored ttl.
+    """
+
+    def __init__(self,
+                 flush_size=None,
+                 flush_interval=None,
+                 existence_ttl=None,
+                 monitored_ttl=None):
+        self.flush_size = flush_size or settings.LOGS_AGGREGATOR_FLUSH_SIZE
+        self.flush_interval = flush_interval or settings.LOGS_AGGREGATOR_FLUSH_INTERVAL
+        self._existing = TTLCache(ttl=existence_ttl or settings.LOGS_AGGREGATOR_EXISTENCE_TTL)
+        self._monitored = TTLCache(ttl=monitored_ttl or settings.LOGS_AGGREGATOR_MONITORED_TTL)
+        self._entries = []
+        self._size = 0
+        self._first_entry_at = None
+
+    @property
+    def is_empty(self):
+        return not self._entries
+
+    def clear(self):
+        self._entries = []
+        self._size = 0
+        self._first_entry_at = None
+
+    @staticmethod
+    def get_entry(task_name, kwargs):
+        if task_name not in LOGS_TASKS:
+            return None
+        kind, stream = LOGS_TASKS[task_name]
+        log_lines = kwargs.get('log_lines')
+        if isinstance(log_lines, (list, tuple)):
+            log_lines = '\n'.join(log_lines)
+        if not log_lines:
+            return None
+        if kind == LogKinds.EXPERIMENT:
+            return LogEntry(kind=kind,
+                            object_uuid=kwargs['experiment_uuid'],
+                            object_name=kwargs['experiment_name'],
+                            job_uuid=kwargs.get('job_uuid'),
+                            log_lines=log_lines,
+                            stream=stream)
+        return LogEntry(kind=kind,
+                        object_uuid=kwargs['job_uuid'],
+                        object_name=kwargs['job_name'],
+                        job_uuid=kwargs['job_uuid'],
+                        log_lines=log_lines,
+                        stream=stream)
+
+    def add(self, task_name, kwargs):
+        """Buffers the logs of a task, returns False if there are no logs to buffer."""
+        try:
+            entry = self.get_entry(task_name=task_name, kwargs=kwargs)
+        except KeyError:
+            logger.warning('Received logs task `%s` with missing arguments.', task_name)
+            return False
+        if entry is None:
+            return False
+        if self._first_entry_at is None:
+            self._first_entry_at = time.monotonic()
+        self._entries.append(entry)
+        self._size += len(entry.log_lines)
+        return True
+
+    def should_flush(self):
+        if self.is_empty:
+            return False
+        return (self._size >= self.flush_size or
+                time.monotonic() - self._first_entry_at >= self.flush_interval)
+
+    def get_existing(self, entries):
+        """Returns the set of (kind, uuid) of existing objects, and caches the result."""
+        existing = set()
+        missing = {}
+        for entry in entries:
+            key = (entry.kind, entry.object_uuid)
+            exists = self._existing.get(key)
+            if exists is None:
+                missing.setdefault(entry.kind, set()).add(entry.object_uuid)
+            elif exists:
+                existing.add(key)
+
+        for kind, object_uuids in missing.items():
+            valid_uuids = {}
+            for object_uuid in object_uuids:
+                try:
+                    valid_uuids[object_uuid] = uuid.UUID(object_uuid).hex
+                except (TypeError, ValueError, AttributeError):
+                    self._existing.set((kind, object_uuid), False)
+            found = {value.hex for value in LogKinds.MODELS[kind].objects.filter(
+                uuid__in=list(valid_uuids.values())).values_list('uuid', flat=True)}
+            for object_uuid, object_uuid_hex in valid_uuids.items():
+                exists = object_uuid_hex in found
+                self._existing.set((kind, object_uuid), exists)
+                if exists:
+                    existing.add((kind, object_uuid))
+        self._existing.purge()
+        return existing
+
+    def get_monitored(self):
+        """Returns the sets of jobs and experiments to stream logs for."""
+        monitored = self._monitored.get('logs')
+        if monitored is None:
+            try:
+                monitored = RedisToStream.get_monitored_logs()
+            except RedisError:
+                monitored = (set(), set())
+            self._monitored.set('logs', monitored)
+        return monitored
+
+    @staticmethod
+    def write(entries):
+        """Appends the logs of every file at once."""
+        files = OrderedDict()
+        for entry in entries:
+            files.setdefault((entry.kind, entry.object_name), []).append(entry.log_lines)
+        for (kind, object_name), log_lines in files.items():
+            log_lines = '\n'.join(log_lines)
+            if kind == LogKinds.EXPERIMENT:
+                safe_log_experiment_job(experiment_name=object_name, log_lines=log_lines)
+            else:
+                safe_log_job(job_name=object_name, log_lines=log_lines)
+
+    def stream(self, entries):
+        """Streams the logs of the monitored objects, coalesced per job."""
+        entries = [entry for entry in entries if entry.stream]
+        if not entries:
+            return
+        monitored_jobs, monitored_experiments = self.get_monitored()
+        streams = OrderedDict()
+        for entry in entries:
+            if entry.kind == LogKinds.EXPERIMENT:
+                is_monitored = (entry.job_uuid in monitored_jobs or
+                                entry.object_uuid in monitored_experiments)
+            else:
+                is_monitored = entry.object_uuid in monitored_jobs
+            if is_monitored:
+                key = (entry.kind, entry.object_uuid, entry.job_uuid)
+                streams.setdefault(key, []).append(entry.log_lines)
+
+        for (kind, object_uuid, job_uuid), log_lines in streams.items():
+            log_lines = '\n'.join(log_lines)
+            if kind == LogKinds.EXPERIMENT:
+                publisher.stream_experiment_job_log(log_lines=log_lines,
+                                                    experiment_uuid=object_uuid,
+                                                    job_uuid=job_uuid)
+            elif kind == LogKinds.JOB:
+                publisher.stream_job_log(log_lines=log_lines, job_uuid=job_uuid)
+            else:
+                publisher.stream_build_job_log(log_lines=log_lines, job_uuid=job_uuid)
+
+    def flush(self):
+        entries = self._entries
+        self.clear()
+        if not entries:
+            return
+        existing = self.get_existing(entries)
+        entries = [entry for entry in entries if (entry.kind, entry.object_uuid) in existing]
+        self.write(entries)
+        self.stream(entries)
+
+
+class LogsAggregatorConsumer(ConsumerMixin):
+    """Consumes the logs tasks in bulk from the logs queue, instead of running a task per message.
+
+    The messages are acknowledged once their logs are flushed,
+    if the worker dies before a flush, the messages are redelivered.
+    """
+
+    def __init__(self, connection, aggregator=None, prefetch_count=None):
+        self.connection = connection
+        self.aggregator = aggregator or LogsAggregator()
+        self.prefetch_count = prefetch_count or settings.LOGS_AGGREGATOR_PREFETCH_COUNT
+        self._messages = []
+
+    def get_consumers(self, _, channel):
+        queue = Queue(CeleryQueues.LOGS_SIDECARS,
+                      exchange=Exchange(settings.INTERNAL_EXCHANGE, 'topic'),
+                      routing_key=RoutingKeys.LOGS_SIDECARS)
+        return [Consumer(channel,
+                         queues=[queue],
+                         callbacks=[self.on_message],
+                         accept=['json'],
+                         prefetch_count=self.prefetch_count)]
+
+    @staticmethod
+    def get_task(body, message):
+        """Returns the task name and kwargs of a celery message (protocol 1 or 2)."""
+        if isinstance(body, dict):
+            return body.get('task'), body.get('kwargs') or {}
+        task_name = message.headers.get('task')
+        try:
+            return task_name, body[1] or {}
+        except (IndexError, TypeError):
+            return task_name, {}
+
+    def on_message(self, body, message):
+        task_name, kwargs = self.get_task(body=body, message=message)
+        if task_name not in LOGS_TASKS:
+            logger.warning('Received an unexpected task `%s`, the message is discarded.',
+                           task_name)
+        if not self.aggregator.add(task_name=task_name, kwargs=kwargs):
+            message.ack()
+            return
+        self._messages.append(message)
+        if self.aggregator.should_flush():
+            self.flush()
+
+    def on_iteration(self):
+        if self.aggregator.should_flush():
+            self.flush()
+
+    def on_connection_revived(self):
+        # The unacknowledged messages are redelivered on the new connection
+        self.aggregator.clear()
+        self._messages = []
+
+    def flush(self):
+        started_at = time.monotonic()
+        self.aggregator.flush()
+        messages = self._messages
+        self._messages = []
+        for message in messages:
+            message.ack()
+        logger.debug('Flushed %s logs messages in %.3fs',
+                     len(messages), time.monotonic() - started_at)
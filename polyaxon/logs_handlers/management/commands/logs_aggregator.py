@@ -0,0 +1,35 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db import InterfaceError, connection
+
+from logs_handlers.aggregator import LogsAggregator, LogsAggregatorConsumer, logger
+from polyaxon.celery_api import celery_app
+
+
+class Command(BaseCommand):
+    help = 'Consume the logs tasks in bulk and write them behind.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log_sleep_interval',
+                            type=int,
+                            default=1)
+
+    def handle(self, *args, **options):
+        log_sleep_interval = options['log_sleep_interval']
+        self.stdout.write("Started a new logs aggregator.", ending='\n')
+        while True:
+            try:
+                # A new connection on every restart, the unacknowledged messages are redelivered
+                with celery_app.connection() as broker_connection:
+                    LogsAggregatorConsumer(connection=broker_connection,
+                                           aggregator=LogsAggregator()).run()
+            except InterfaceError:
+                # The database connection was closed by the remote peer,
+                # make Django reconnect next time querying DB.
+                connection.close()
+                logger.warning(
+                    "Database connection is already closed by peer, discard old connection\n")
+            except Exception as e:
+                logger.exception("Unhandled exception occurred %s\n", e)
+            time.sleep(log_sleep_interval)
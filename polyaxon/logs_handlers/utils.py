@@ -1,14 +1,10 @@
-import fcntl
-
+from libs.logs_store import get_logs_store
 from libs.paths.experiments import create_experiment_logs_path, get_experiment_logs_path
 from libs.paths.jobs import create_job_logs_path, get_job_logs_path
 
 
 def _lock_log(log_path, log_lines):
-    with open(log_path, "a") as log_file:
-        fcntl.flock(log_file, fcntl.LOCK_EX)
-        log_file.write(log_lines + '\n')
-        fcntl.flock(log_file, fcntl.LOCK_UN)
+    get_logs_store(log_path).append(log_lines)
 
 
 def safe_log_job(job_name, log_lines):
@@ -0,0 +1,294 @@
+import json
+import logging
+import os
+
+from hestia.logging_utils import LogSpec
+
+from django.conf import settings
+
+from db.models.experiment_jobs import ExperimentJob
+from db.redis.containers import RedisJobContainers
+from polyaxon.celery_api import celery_app
+from polyaxon.settings import LogsCeleryTasks
+from scheduler.spawners.templates import constants
+
+logger = logging.getLogger('polyaxon.monitors.logs')
+
+
+def get_log_path(container_id):
+    """Returns the path of the docker `json-file` log of a container on the node."""
+    return os.path.join(settings.LOGS_COLLECTOR_CONTAINERS_PATH,
+                        container_id,
+                        '{}-json.log'.format(container_id))
+
+
+def get_container_task(container_id):
+    """Returns the (experiment, task type, task index) of an experiment job container.
+
+    The task is read from the container's docker config on the node,
+    so that containers that were never monitored in redis can be collected too.
+    """
+    path = os.path.join(settings.LOGS_COLLECTOR_CONTAINERS_PATH, container_id, 'config.v2.json')
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f).get('Config') or {}
+    except (OSError, ValueError):
+        return None
+    labels = config.get('Labels') or {}
+    if labels.get('io.kubernetes.container.name') != settings.CONTAINER_NAME_EXPERIMENT_JOB:
+        return None
+    env = dict(env_var.split('=', 1) for env_var in config.get('Env') or [] if '=' in env_var)
+    try:
+        experiment_uuid = json.loads(env[constants.CONFIG_MAP_EXPERIMENT_INFO_KEY_NAME])[
+            'experiment_uuid']
+        task_info = json.loads(env[constants.CONFIG_MAP_TASK_INFO_KEY_NAME])
+        return experiment_uuid, task_info['type'], int(task_info['index'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def parse_log_line(raw_line):
+    """Returns the message of a docker `json-file` or CRI log line, and whether it's partial.
+
+    Docker splits long lines into several entries without a trailing new line,
+    CRI marks them with a `P` tag.
+    """
+    raw_line = raw_line.decode('utf-8', errors='replace')
+    if raw_line.startswith('{'):
+        try:
+            log = json.loads(raw_line).get('log', '')
+        except ValueError:
+            return raw_line, False
+        return log.rstrip('\n'), not log.endswith('\n')
+    parts = raw_line.split(' ', 3)
+    if len(parts) == 4 and parts[2] in ('P', 'F'):
+        return parts[3], parts[2] == 'P'
+    return raw_line, False
+
+
+class ContainerLogFile(object):
+    """Tails the log file of a container from an offset."""
+
+    def __init__(self, container_id, path, offset=0):
+        self.container_id = container_id
+        self.path = path
+        self.offset = offset
+
+    def read(self, max_size, offset=None):
+        """Returns the complete lines written from an offset, and the offset following them.
+
+        The lines are read from the committed `offset` by default,
+        the caller commits the returned offset once the lines are handled.
+        The offset only moves past complete lines, including the partial entries of a line,
+        so that a line written across two reads is read once it's complete.
+        """
+        offset = self.offset if offset is None else offset
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return [], offset
+        if size < offset:  # The file was truncated or rotated
+            offset = 0
+        if size == offset:
+            return [], offset
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(max_size)
+        end = data.rfind(b'\n')
+        if end < 0:
+            return [], offset
+        log_lines = []
+        partial = ''
+        position = 0
+        read_size = 0
+        for raw_line in data[:end].split(b'\n'):
+            read_size += len(raw_line) + 1
+            if not raw_line:
+                if not partial:
+                    position = read_size
+                continue
+            log_line, is_partial = parse_log_line(raw_line)
+            if is_partial:
+                partial += log_line
+                continue
+            log_lines.append(partial + log_line)
+            partial = ''
+            position = read_size
+        if partial and not log_lines and len(data) >= max_size:
+            # The line is longer than the read size, it's sent in several parts
+            log_lines.append(partial)
+            position = read_size
+        return log_lines, offset + position
+
+
+class LogsCollector(object):
+    """Collects the logs of the experiment jobs containers of the node.
+
+    Instead of a sidecar per pod, the collector tails the log files of the containers
+    found on the node, and sends their logs to the logs handlers in one task per job and pass.
+    The containers are mapped to their jobs with `RedisJobContainers`, or with their docker
+    config for the containers that stopped before being monitored.
+    A container is tailed until its log file is deleted with its pod, and the containers
+    that are not running anymore are read until the end on every pass.
+    The containers and their offsets are checkpointed,
+    so that a restarted collector resumes where it stopped.
+    """
+
+    def __init__(self, checkpoint_path=None, read_size=None):
+        self.checkpoint_path = checkpoint_path or settings.LOGS_COLLECTOR_CHECKPOINT_PATH
+        self.read_size = read_size or settings.LOGS_COLLECTOR_READ_SIZE
+        self.files = {}
+        self.jobs = {}
+        self.containers_jobs = {}
+        self.ignored_containers = set()
+        self._checkpoint = self.load_checkpoint()
+        self.containers_jobs = {container_id: value['job_uuid']
+                                for container_id, value in self._checkpoint.items()}
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {container_id: value for container_id, value in checkpoint.items()
+                if isinstance(value, dict) and value.get('job_uuid')}
+
+    def save_checkpoint(self):
+        checkpoint = {
+            container_id: {'job_uuid': job_uuid, 'offset': self.files[container_id].offset}
+            for container_id, job_uuid in self.containers_jobs.items()
+            if container_id in self.files
+        }
+        if checkpoint == self._checkpoint:
+            return
+        tmp_path = '{}.tmp'.format(self.checkpoint_path)
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(checkpoint, f)
+            os.rename(tmp_path, self.checkpoint_path)
+        except OSError as e:
+            logger.warning('Could not save the logs collector checkpoint: %s', e)
+            return
+        self._checkpoint = checkpoint
+
+    def get_log_file(self, container_id):
+        if container_id not in self.files:
+            self.files[container_id] = ContainerLogFile(
+                container_id=container_id,
+                path=get_log_path(container_id),
+                offset=self._checkpoint.get(container_id, {}).get('offset', 0))
+        return self.files[container_id]
+
+    def get_node_containers(self):
+        """Returns the ids of the containers having a log file on the node."""
+        try:
+            container_ids = os.listdir(settings.LOGS_COLLECTOR_CONTAINERS_PATH)
+        except OSError as e:
+            logger.warning('Could not list the containers of the node: %s', e)
+            return set()
+        return {container_id for container_id in container_ids
+                if os.path.exists(get_log_path(container_id))}
+
+    def find_job(self, container_id):
+        """Returns the uuid of the job of a container that was not monitored in redis, if any."""
+        task = get_container_task(container_id)
+        if not task:
+            return None
+        experiment_uuid, task_type, task_idx = task
+        experiment_jobs = ExperimentJob.objects.filter(
+            experiment__uuid=experiment_uuid, role=task_type).order_by('-id')
+        for job in experiment_jobs:
+            labels = (job.definition or {}).get('metadata', {}).get('labels') or {}
+            if int(labels.get('task_idx', 0)) == task_idx:
+                return job.uuid.hex
+        return None
+
+    def update_containers(self, running):
+        """Tracks the containers of the node and drops the ones whose log file was deleted."""
+        node_containers = self.get_node_containers()
+        containers_jobs = {container_id: job_uuid
+                           for container_id, job_uuid in self.containers_jobs.items()
+                           if container_id in node_containers}
+        containers_jobs.update({container_id: job_uuid
+                                for container_id, job_uuid in running.items()
+                                if container_id in node_containers})
+        for container_id in node_containers - set(containers_jobs) - self.ignored_containers:
+            job_uuid = self.find_job(container_id)
+            if job_uuid:
+                containers_jobs[container_id] = job_uuid
+            else:
+                self.ignored_containers.add(container_id)
+        self.ignored_containers &= node_containers
+        self.containers_jobs = containers_jobs
+        self.files = {container_id: log_file for container_id, log_file in self.files.items()
+                      if container_id in containers_jobs}
+
+    def update_jobs(self, job_uuids):
+        """Fetches the experiment and the task of the new jobs in one query.
+
+        The jobs that are not found yet are fetched again on the next pass.
+        """
+        missing = [job_uuid for job_uuid in job_uuids if job_uuid not in self.jobs]
+        if missing:
+            experiment_jobs = ExperimentJob.objects.filter(
+                uuid__in=missing).select_related('experiment')
+            for job in experiment_jobs:
+                labels = (job.definition or {}).get('metadata', {}).get('labels') or {}
+                task_type = labels.get('task_type', job.role)
+                task_idx = int(labels.get('task_idx', 0))
+                self.jobs[job.uuid.hex] = (job.experiment.unique_name,
+                                           job.experiment.uuid.hex,
+                                           '{}.{}'.format(task_type, task_idx + 1))
+        self.jobs = {job_uuid: job for job_uuid, job in self.jobs.items() if job_uuid in job_uuids}
+
+    def publish(self, job_uuid, log_lines):
+        experiment_name, experiment_uuid, name = self.jobs[job_uuid]
+        log_lines = [LogSpec(log_line=log_line, name=name) for log_line in log_lines]
+        celery_app.send_task(
+            LogsCeleryTasks.LOGS_SIDECARS_EXPERIMENTS,
+            kwargs={
+                'experiment_name': experiment_name,
+                'experiment_uuid': experiment_uuid,
+                'job_uuid': job_uuid,
+                'log_lines': '\n'.join(log_lines)
+            })
+
+    def run(self):
+        """Collects the new logs of the node's containers, returns the number of lines sent."""
+        running = {
+            container_id: job_uuid
+            for container_id, (job_uuid, _) in RedisJobContainers.get_containers_jobs().items()
+        }
+        self.update_containers(running=running)
+        self.update_jobs(set(self.containers_jobs.values()))
+
+        jobs_logs = {}
+        jobs_offsets = {}
+        for container_id, job_uuid in self.containers_jobs.items():
+            log_file = self.get_log_file(container_id)
+            if job_uuid not in self.jobs:
+                # The lines are read once the job is found
+                continue
+            log_lines, offset = log_file.read(self.read_size)
+            # The containers that stopped are read until the end before their pod is deleted
+            while log_lines:
+                jobs_logs.setdefault(job_uuid, []).extend(log_lines)
+                jobs_offsets.setdefault(job_uuid, {})[container_id] = offset
+                if container_id in running:
+                    break
+                log_lines, offset = log_file.read(self.read_size, offset=offset)
+
+        count = 0
+        for job_uuid, log_lines in jobs_logs.items():
+            try:
+                self.publish(job_uuid=job_uuid, log_lines=log_lines)
+            except Exception as e:
+                # The offsets are not committed, the lines are read again on the next pass
+                logger.warning('Could not send the logs of job `%s`: %s', job_uuid, e)
+                continue
+            for container_id, offset in jobs_offsets[job_uuid].items():
+                self.files[container_id].offset = offset
+            count += len(log_lines)
+        self.save_checkpoint()
+        return count
@@ -0,0 +1,33 @@
+import time
+
+import redis
+
+from django.db import InterfaceError, OperationalError, ProgrammingError
+
+from libs.base_monitor import BaseMonitorCommand
+from monitor_resources.logs import LogsCollector, logger
+
+
+class Command(BaseMonitorCommand):
+    help = 'Collect the logs of the jobs/containers running on the node.'
+
+    def handle(self, *args, **options):
+        log_sleep_interval = options['log_sleep_interval']
+        self.stdout.write(
+            "Started a new logs collector with, "
+            "log sleep interval: `{}`".format(log_sleep_interval),
+            ending='\n')
+        collector = LogsCollector()
+        while True:
+            try:
+                count = collector.run()
+                logger.debug("Collected %s log lines", count)
+            except redis.exceptions.ConnectionError as e:
+                logger.warning("Redis connection is probably already closed %s\n", e)
+            except (InterfaceError, ProgrammingError, OperationalError) as e:
+                logger.exception("Database connection is probably already closed %s\n", e)
+                return
+            except Exception as e:
+                logger.exception("Unhandled exception occurred %s\n", e)
+
+            time.sleep(log_sleep_interval)
@@ -48,7 +48,11 @@ class Command(BaseMonitorCommand):
         while True:
             try:
                 if node:
-                    monitor.run(containers, node, persist)
+                    duration = monitor.run(containers, node, persist)
+                    if duration > log_sleep_interval:
+                        monitor.logger.warning(
+                            "Resources monitor pass took %.3fs, longer than the interval `%s`",
+                            duration, log_sleep_interval)
             except redis.exceptions.ConnectionError as e:
                 monitor.logger.warning("Redis connection is probably already closed %s\n", e)
             except Exception as e:
@@ -2,6 +2,9 @@ import json
 import logging
 import re
 import requests
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import docker
 
@@ -23,6 +26,16 @@ logger = logging.getLogger('polyaxon.monitors.resources')
 
 docker_client = docker.from_env(version="auto", timeout=10)
 
+_executor = None
+
+
+def get_executor():
+    """Lazily creates the pool used to sample the containers of a pass concurrently."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.RESOURCES_MONITOR_MAX_WORKERS)
+    return _executor
+
 
 def get_gpu_resources():
     try:
@@ -58,19 +71,13 @@ def get_container(containers, container_id):
     return container
 
 
-def get_container_resources(node, container, gpu_resources):
+def get_container_resources(node, container, gpu_resources, job_uuid, experiment_uuid):
     # Check if the container is running
     if container.status != ContainerStatuses.RUNNING:
         logger.debug("`%s` container is not running", container.name)
         RedisJobContainers.remove_container(container.id)
         return
 
-    job_uuid, experiment_uuid = RedisJobContainers.get_job(container.id)
-
-    if not job_uuid:
-        logger.debug("`%s` container is not recognised", container.name)
-        return
-
     logger.debug(
         "Streaming resources for container %s in (job, experiment) (`%s`, `%s`) ",
         container.id, job_uuid, experiment_uuid)
@@ -79,6 +86,7 @@ def get_container_resources(node, container, gpu_resources):
         stats = container.stats(decode=True, stream=False)
     except json.decoder.JSONDecodeError:
         logger.info("Error streaming states for `%s`", container.name)
+        return
     except NotFound:
         logger.debug("`%s` was not found", container.name)
         RedisJobContainers.remove_container(container.id)
@@ -147,33 +155,75 @@ def update_cluster_node(node_gpus):
         node_gpu.save()
 
 
+def collect_container_resources(containers, node, container_id, gpu_resources, job):
+    container = get_container(containers, container_id)
+    if not container:
+        return None
+    job_uuid, experiment_uuid = job
+    try:
+        payload = get_container_resources(node=node,
+                                          container=container,
+                                          gpu_resources=gpu_resources,
+                                          job_uuid=job_uuid,
+                                          experiment_uuid=experiment_uuid)
+    except KeyError:
+        return None
+    return payload.to_dict() if payload else None
+
+
 def run(containers, node, persist):
-    container_ids = RedisJobContainers.get_containers()
+    """Samples the resources of all monitored containers, returns the duration of the pass.
+
+    Docker samples the stats of a container twice to compute the cpu deltas,
+    so the containers are sampled concurrently to keep the pass within the reporting interval.
+    """
+    start = time.monotonic()
+    # Snapshot of the containers -> (job, experiment) mapping and the monitored objects
+    containers_jobs = RedisJobContainers.get_containers_jobs()
+    monitored_jobs, monitored_experiments = RedisToStream.get_monitored_resources()
     gpu_resources = get_gpu_resources()
     if gpu_resources:
         gpu_resources = {gpu_resource['index']: gpu_resource for gpu_resource in gpu_resources}
     update_cluster_node(gpu_resources)
-    for container_id in container_ids:
-        container = get_container(containers, container_id)
-        if not container:
-            continue
+    timestamp = time.time()
+    executor = get_executor()
+    futures = {
+        executor.submit(collect_container_resources,
+                        containers,
+                        node,
+                        container_id,
+                        gpu_resources,
+                        job): container_id
+        for container_id, job in containers_jobs.items()
+    }
+    payloads = []
+    latest_resources = {}
+    for future in as_completed(futures):
         try:
-            payload = get_container_resources(node, containers[container_id], gpu_resources)
-        except KeyError:
-            payload = None
+            payload = future.result()
+        except Exception as e:
+            logger.warning("Could not collect resources for container `%s`: %s",
+                           futures[future], e)
+            continue
         if payload:
-            payload = payload.to_dict()
-            logger.debug("Publishing resources event")
-            celery_app.send_task(
-                K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_RESOURCES,
-                kwargs={'payload': payload, 'persist': persist})
+            payloads.append(payload)
 
-            job_uuid = payload['job_uuid']
             # Check if we should stream the payload
-            # Check if we have this container already in place
-            experiment_uuid = RedisJobContainers.get_experiment_for_job(job_uuid)
-            set_last_resources_cond = (
-                RedisToStream.is_monitored_job_resources(job_uuid) or
-                RedisToStream.is_monitored_experiment_resources(experiment_uuid))
-            if set_last_resources_cond:
-                RedisToStream.set_latest_job_resources(job_uuid, payload)
+            stream_cond = (payload['job_uuid'] in monitored_jobs or
+                           payload['experiment_uuid'] in monitored_experiments)
+            if stream_cond:
+                latest_resources[payload['job_uuid']] = payload
+
+    RedisToStream.set_latest_jobs_resources(latest_resources)
+
+    if persist and payloads:
+        # All the payloads of this pass are persisted in a single batch
+        logger.debug("Publishing resources event")
+        celery_app.send_task(
+            K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_RESOURCES,
+            kwargs={'payloads': payloads, 'persist': persist, 'timestamp': timestamp})
+
+    duration = time.monotonic() - start
+    logger.debug("Collected resources of %s/%s containers in %.3fs",
+                 len(payloads), len(containers_jobs), duration)
+    return duration
@@ -20,9 +20,10 @@ class Command(BaseMonitorCommand):
             "log sleep interval: `{}`.".format(log_sleep_interval),
             ending='\n')
         k8s_manager = K8SManager(namespace=settings.K8S_NAMESPACE, in_cluster=True)
+        informer = monitor.PodsInformer(k8s_manager)
         while True:
             try:
-                monitor.run(k8s_manager)
+                informer.run()
             except ApiException as e:
                 monitor.logger.error(
                     "Exception when calling CoreV1Api->list_namespaced_pod: %s\n", e)
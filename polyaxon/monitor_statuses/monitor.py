@@ -1,11 +1,19 @@
+import json
 import logging
+import threading
+import time
+
+from collections import deque
 
 from kubernetes import watch
+from kubernetes.client.rest import ApiException
 
 from django.conf import settings
+from django.db import InterfaceError, connection
 
 from constants.jobs import JobLifeCycle
 from db.redis.containers import RedisJobContainers
+from db.redis.statuses import RedisStatuses
 from monitor_statuses.jobs import get_job_state
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import K8SEventsCeleryTasks
@@ -54,82 +62,373 @@ def get_label_selector():
         settings.TYPE_LABELS_RUNNER)
 
 
-def run(k8s_manager):
-    w = watch.Watch()
+def get_pod_event(pod):
+    """Returns the parts of a pod used to compute its job state, instead of the whole pod."""
+    status = pod.status
+    return {
+        'metadata': {
+            'name': pod.metadata.name,
+            'labels': pod.metadata.labels,
+            'deletion_timestamp': pod.metadata.deletion_timestamp,
+        },
+        'spec': {
+            'node_name': pod.spec.node_name if pod.spec else None,
+        },
+        'status': {
+            'phase': status.phase if status else None,
+            'conditions': ([condition.to_dict() for condition in status.conditions]
+                           if status and status.conditions else None),
+            'container_statuses': ([container_status.to_dict()
+                                    for container_status in status.container_statuses]
+                                   if status and status.container_statuses else None),
+        },
+    }
+
+
+def get_job_state_fingerprint(event, job_state):
+    """The parts of a job state that are handled: its status and its job containers."""
+    containers = [
+        (container_status['name'],
+         container_status['container_id'],
+         container_status['state']['running'] is not None)
+        for container_status in event['status']['container_statuses'] or []
+    ]
+    return json.dumps([job_state.status, job_state.message, sorted(containers)])
+
+
+def handle_job_state(event_object, job_state, experiment_jobs_statuses=None):
+    """Handles a job state, the experiment jobs statuses are sent in batches if a batch is given."""
+    status = job_state.status
+    labels = None
+    if job_state.details and job_state.details.labels:
+        labels = job_state.details.labels.to_dict()
+    logger.info("Updating job container %s, %s", status, labels)
+    logger.debug(event_object)
+    job_state = job_state.to_dict()
+    logger.debug(job_state)
+
+    experiment_job_condition = (
+        settings.CONTAINER_NAME_EXPERIMENT_JOB in job_state['details']['container_statuses']
+        or (status == PodLifeCycle.FAILED and
+            labels['app'] == settings.APP_LABELS_EXPERIMENT)
+    )
+
+    job_condition = (
+        settings.CONTAINER_NAME_JOB in job_state['details']['container_statuses'] or
+        (status == PodLifeCycle.FAILED and
+         labels['app'] == settings.APP_LABELS_EXPERIMENT)
+    )
+
+    plugin_job_condition = (
+        settings.CONTAINER_NAME_PLUGIN_JOB in job_state['details']['container_statuses'] or
+        (status == PodLifeCycle.FAILED and
+         labels['app'] == settings.APP_LABELS_EXPERIMENT)
+    )
+
+    dockerizer_job_condition = (
+        settings.CONTAINER_NAME_DOCKERIZER_JOB in job_state['details']['container_statuses']
+        or (status == PodLifeCycle.FAILED and
+            labels['app'] == settings.APP_LABELS_EXPERIMENT)
+    )
+
+    if experiment_job_condition:
+        update_job_containers(event_object, status, settings.CONTAINER_NAME_EXPERIMENT_JOB)
+        logger.info("Sending state to handler %s, %s", status, labels)
+        # Handle experiment job statuses
+        if experiment_jobs_statuses is not None:
+            experiment_jobs_statuses.append(job_state)
+        else:
+            celery_app.send_task(
+                K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES,
+                kwargs={'payload': job_state})
+
+    elif job_condition:
+        update_job_containers(event_object, status, settings.CONTAINER_NAME_JOB)
+        # Handle experiment job statuses
+        celery_app.send_task(
+            K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_JOB_STATUSES,
+            kwargs={'payload': job_state})
+
+    elif plugin_job_condition:
+        # Handle plugin job statuses
+        celery_app.send_task(
+            K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_PLUGIN_JOB_STATUSES,
+            kwargs={'payload': job_state})
+
+    elif dockerizer_job_condition:
+        # Handle dockerizer job statuses
+        celery_app.send_task(
+            K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_BUILD_JOB_STATUSES,
+            kwargs={'payload': job_state})
+    else:
+        logger.debug("Lost state %s, %s", status, job_state)
+
+
+class PodsQueue(object):
+    """A keyed work queue, the successive events of a pod are collapsed into the latest one.
+
+    A pod is processed by a single worker at a time,
+    an event received while its pod is processed is queued once the worker is done.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._keys = deque()
+        self._items = {}
+        self._processing = set()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+    @property
+    def is_idle(self):
+        with self._cond:
+            return not self._items and not self._processing
+
+    def put(self, key, item):
+        with self._cond:
+            is_queued = key in self._items
+            self._items[key] = item
+            if not is_queued and key not in self._processing:
+                self._keys.append(key)
+                self._cond.notify()
+
+    def get(self, timeout=None):
+        """Returns the next key and its latest item, or (None, None) after the timeout."""
+        with self._cond:
+            if not self._keys:
+                self._cond.wait(timeout)
+            if not self._keys:
+                return None, None
+            key = self._keys.popleft()
+            self._processing.add(key)
+            return key, self._items.pop(key)
 
-    for event in w.stream(k8s_manager.k8s_api.list_namespaced_pod,
-                          namespace=k8s_manager.namespace,
-                          label_selector=get_label_selector()):
-        logger.debug("Received event: %s", event['type'])
-        event_object = event['object'].to_dict()
+    def done(self, key):
+        with self._cond:
+            self._processing.discard(key)
+            if key in self._items:
+                self._keys.append(key)
+                self._cond.notify()
+
+    def wait_idle(self, timeout=None):
+        deadline = time.monotonic() + timeout if timeout else None
+        while not self.is_idle:
+            if deadline and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+
+class PodsInformer(object):
+    """Watches the runner pods and handles their job states with a pool of workers.
+
+     * The watch resumes from the last resource version persisted in redis,
+       the pods are only relisted if there's no resource version or if it expired.
+     * The resource version is only persisted once all the events received
+       before it were handled.
+     * Pod events are queued per pod and collapsed, the workers only handle the latest one.
+     * A job state that was already handled for a pod, e.g. after a relist,
+       is neither sent to the handlers nor updates the job containers.
+     * The experiment jobs statuses are sent to the handlers in batches,
+       of at most `batch_size` statuses, at least every checkpoint interval.
+    """
+
+    def __init__(self,
+                 k8s_manager,
+                 workers=None,
+                 watch_timeout=None,
+                 checkpoint_interval=None,
+                 batch_size=None):
+        self.k8s_manager = k8s_manager
+        self.workers = workers or settings.STATUSES_MONITOR_WORKERS
+        self.watch_timeout = watch_timeout or settings.STATUSES_MONITOR_WATCH_TIMEOUT
+        self.checkpoint_interval = (checkpoint_interval or
+                                    settings.STATUSES_MONITOR_CHECKPOINT_INTERVAL)
+        self.batch_size = batch_size or settings.STATUSES_MONITOR_BATCH_SIZE
+        self.queue = PodsQueue()
+        self._experiment_jobs_statuses = []
+        self._experiment_jobs_pods_states = {}
+        self.resource_version = None
+        self._states = None
+        self._saved_resource_version = None
+        self._checkpoint_at = 0
+        self._lock = threading.Lock()
+        self._threads = []
+
+    @property
+    def states(self):
+        if self._states is None:
+            self._states = RedisStatuses.get_pods_states()
+        return self._states
+
+    def start(self):
+        self._threads = [t for t in self._threads if t.is_alive()]
+        for _ in range(self.workers - len(self._threads)):
+            thread = threading.Thread(target=self.work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def work(self):
+        while True:
+            key, item = self.queue.get(timeout=self.checkpoint_interval)
+            if key is None:
+                self.checkpoint()
+                continue
+            event_type, event_object = item
+            try:
+                self.handle(key, event_type, event_object)
+            except InterfaceError:
+                connection.close()
+                logger.warning(
+                    "Database connection is already closed by peer, discard old connection\n")
+            except Exception as e:
+                logger.exception("Unhandled exception occurred %s\n", e)
+            finally:
+                self.queue.done(key)
+            self.checkpoint()
+
+    def handle(self, pod, event_type, event_object):
         job_state = get_job_state(
-            event_type=event['type'],
+            event_type=event_type,
             event=event_object,
             job_container_names=(settings.CONTAINER_NAME_EXPERIMENT_JOB,
                                  settings.CONTAINER_NAME_PLUGIN_JOB,
                                  settings.CONTAINER_NAME_JOB,
                                  settings.CONTAINER_NAME_DOCKERIZER_JOB),
             experiment_type_label=settings.TYPE_LABELS_RUNNER)
-
         if job_state:
-            status = job_state.status
-            labels = None
-            if job_state.details and job_state.details.labels:
-                labels = job_state.details.labels.to_dict()
-            logger.info("Updating job container %s, %s", status, labels)
-            logger.debug(event_object)
-            job_state = job_state.to_dict()
-            logger.debug(job_state)
-
-            experiment_job_condition = (
-                settings.CONTAINER_NAME_EXPERIMENT_JOB in job_state['details']['container_statuses']
-                or (status == PodLifeCycle.FAILED and
-                    labels['app'] == settings.APP_LABELS_EXPERIMENT)
-            )
-
-            job_condition = (
-                settings.CONTAINER_NAME_JOB in job_state['details']['container_statuses'] or
-                (status == PodLifeCycle.FAILED and
-                 labels['app'] == settings.APP_LABELS_EXPERIMENT)
-            )
-
-            plugin_job_condition = (
-                settings.CONTAINER_NAME_PLUGIN_JOB in job_state['details']['container_statuses'] or
-                (status == PodLifeCycle.FAILED and
-                 labels['app'] == settings.APP_LABELS_EXPERIMENT)
-            )
-
-            dockerizer_job_condition = (
-                settings.CONTAINER_NAME_DOCKERIZER_JOB in job_state['details']['container_statuses']
-                or (status == PodLifeCycle.FAILED and
-                    labels['app'] == settings.APP_LABELS_EXPERIMENT)
-            )
-
-            if experiment_job_condition:
-                update_job_containers(event_object, status, settings.CONTAINER_NAME_EXPERIMENT_JOB)
-                logger.info("Sending state to handler %s, %s", status, labels)
-                # Handle experiment job statuses
-                celery_app.send_task(
-                    K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES,
-                    kwargs={'payload': job_state})
-
-            elif job_condition:
-                update_job_containers(event_object, status, settings.CONTAINER_NAME_JOB)
-                # Handle experiment job statuses
-                celery_app.send_task(
-                    K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_JOB_STATUSES,
-                    kwargs={'payload': job_state})
-
-            elif plugin_job_condition:
-                # Handle plugin job statuses
-                celery_app.send_task(
-                    K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_PLUGIN_JOB_STATUSES,
-                    kwargs={'payload': job_state})
-
-            elif dockerizer_job_condition:
-                # Handle dockerizer job statuses
-                celery_app.send_task(
-                    K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_BUILD_JOB_STATUSES,
-                    kwargs={'payload': job_state})
-            else:
-                logger.debug("Lost state %s, %s", status, job_state)
+            fingerprint = get_job_state_fingerprint(event_object, job_state)
+            if self.states.get(pod) != fingerprint:
+                experiment_jobs_statuses = []
+                handle_job_state(event_object, job_state, experiment_jobs_statuses)
+                self.states[pod] = fingerprint
+                if experiment_jobs_statuses:
+                    # The state is saved once the statuses are sent
+                    self.add_experiment_jobs_statuses(pod=pod,
+                                                      state=fingerprint,
+                                                      payloads=experiment_jobs_statuses)
+                elif event_type != 'DELETED':
+                    RedisStatuses.set_pod_state(pod, fingerprint)
+        if event_type == 'DELETED':
+            self.states.pop(pod, None)
+            RedisStatuses.remove_pod_states([pod])
+
+    def add_experiment_jobs_statuses(self, pod, state, payloads):
+        with self._lock:
+            self._experiment_jobs_statuses += payloads
+            self._experiment_jobs_pods_states[pod] = state
+            if len(self._experiment_jobs_statuses) < self.batch_size:
+                return
+            self._send_experiment_jobs_statuses()
+
+    def _send_experiment_jobs_statuses(self):
+        """Sends the pending experiment jobs statuses, returns False if they could not be sent.
+
+        The statuses that could not be sent are kept for the next batch,
+        the states of their pods are only saved once they are sent,
+        so that a restarted monitor handles them again.
+        """
+        payloads = self._experiment_jobs_statuses
+        if not payloads:
+            return True
+        try:
+            celery_app.send_task(
+                K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_EXPERIMENT_JOBS_STATUSES,
+                kwargs={'payloads': payloads})
+        except Exception as e:
+            logger.warning('Could not send %s experiment jobs statuses, they will be retried: %s',
+                           len(payloads), e)
+            return False
+        # The pods deleted or updated since are not saved
+        pods_states = {pod: state for pod, state in self._experiment_jobs_pods_states.items()
+                       if self.states.get(pod) == state}
+        self._experiment_jobs_statuses = []
+        self._experiment_jobs_pods_states = {}
+        RedisStatuses.set_pods_states(pods_states)
+        return True
+
+    def enqueue(self, event_type, pod):
+        self.queue.put(pod.metadata.name, (event_type, get_pod_event(pod)))
+
+    def checkpoint(self, force=False):
+        """Persists the resource version once all the events received before it were handled.
+
+        The pending experiment jobs statuses are sent first,
+        the resource version is not persisted if they could not be sent.
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._checkpoint_at < self.checkpoint_interval:
+                return
+            self._checkpoint_at = time.monotonic()
+            if not self._send_experiment_jobs_statuses():
+                return
+            resource_version = self.resource_version
+            if resource_version == self._saved_resource_version or not self.queue.is_idle:
+                return
+            RedisStatuses.set_pods_resource_version(resource_version)
+            self._saved_resource_version = resource_version
+
+    def reset(self):
+        logger.info("Pods resource version expired, the pods will be relisted.")
+        with self._lock:
+            self.resource_version = None
+            self._saved_resource_version = None
+            RedisStatuses.set_pods_resource_version(None)
+
+    def list(self):
+        pods = self.k8s_manager.k8s_api.list_namespaced_pod(
+            namespace=self.k8s_manager.namespace,
+            label_selector=get_label_selector())
+        names = set()
+        for pod in pods.items:
+            names.add(pod.metadata.name)
+            self.enqueue('ADDED', pod)
+        # The pods deleted while the monitor was not watching
+        deleted = set(self.states.copy()) - names
+        for pod in deleted:
+            self.states.pop(pod, None)
+        RedisStatuses.remove_pod_states(deleted)
+        return pods.metadata.resource_version
+
+    def watch(self, resource_version):
+        w = watch.Watch()
+        kwargs = {}
+        if settings.STATUSES_MONITOR_WATCH_BOOKMARKS:
+            kwargs['allow_watch_bookmarks'] = True
+        for event in w.stream(self.k8s_manager.k8s_api.list_namespaced_pod,
+                              namespace=self.k8s_manager.namespace,
+                              label_selector=get_label_selector(),
+                              resource_version=resource_version,
+                              timeout_seconds=self.watch_timeout,
+                              **kwargs):
+            event_type = event['type']
+            logger.debug("Received event: %s", event_type)
+            if event_type == 'ERROR':
+                raw_object = event.get('raw_object') or {}
+                if raw_object.get('code') == 410:
+                    self.reset()
+                    return
+                logger.warning("Received an error event: %s", raw_object)
+                continue
+            pod = event['object']
+            if event_type != 'BOOKMARK':
+                self.enqueue(event_type, pod)
+            self.resource_version = pod.metadata.resource_version
+            self.checkpoint()
+
+    def run(self):
+        self.start()
+        resource_version = self.resource_version or RedisStatuses.get_pods_resource_version()
+        if not resource_version:
+            resource_version = self.list()
+        self.resource_version = resource_version
+        try:
+            self.watch(resource_version)
+        except ApiException as e:
+            if e.status == 410:
+                self.reset()
+                return
+            raise
+        self.checkpoint(force=True)
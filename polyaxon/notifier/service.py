@@ -22,10 +22,9 @@ class NotifierService(EventService):
             return get_project_recipients(event.instance)
         return get_instance_and_project_recipients(event.instance)
 
-    def create_notification(self, event, recipients):
+    def get_notification_event(self, event):
         actor_id = event.data.get(event.actor_id)
-        actor_id = actor_id if actor_id != user_system.USER_SYSTEM_ID else None
-        notification_event = self.notification_event.objects.create(
+        return self.notification_event(
             event_type=event.event_type,
             actor_id=actor_id if actor_id != user_system.USER_SYSTEM_ID else None,
             context=event.data,
@@ -34,11 +33,26 @@ class NotifierService(EventService):
             content_type_id=event.instance_contenttype
         )
 
+    def create_notification(self, event, recipients):
+        notification_event = self.get_notification_event(event)
+        notification_event.save()
+
         self.notification.objects.bulk_create([
             self.notification(event=notification_event, user_id=recipient.id)
             for recipient in recipients
         ])
 
+    def create_notifications(self, events_recipients):
+        """Creates the notifications of many events with two bulk inserts."""
+        # Postgres returns the ids of the inserted notification events
+        notification_events = self.notification_event.objects.bulk_create(
+            [self.get_notification_event(event) for event, _ in events_recipients])
+        self.notification.objects.bulk_create([
+            self.notification(event=notification_event, user_id=recipient.id)
+            for notification_event, (_, recipients) in zip(notification_events, events_recipients)
+            for recipient in recipients
+        ])
+
     @staticmethod
     def validate_event_instance(event):
         from django.contrib.contenttypes.models import ContentType
@@ -59,13 +73,7 @@ class NotifierService(EventService):
 
         return event
 
-    def record_event(self, event):
-        event = self.validate_event_instance(event=event)
-        if not event:  # No notification, reason is that the object is probably deleted from the db
-            return
-
-        recipients = self.get_recipients(event)
-        self.create_notification(event, recipients)
+    def execute_actions(self, event, recipients):
         for action in self.action_manager.values:
             config = None
             if action == EmailAction:
@@ -76,6 +84,25 @@ class NotifierService(EventService):
             except Exception as e:
                 action.logger.warning('Action execution failed %s', e, exc_info=True)
 
+    def record_event(self, event):
+        event = self.validate_event_instance(event=event)
+        if not event:  # No notification, reason is that the object is probably deleted from the db
+            return
+
+        recipients = self.get_recipients(event)
+        self.create_notification(event, recipients)
+        self.execute_actions(event, recipients)
+
+    def record_batch(self, events):
+        events = [self.validate_event_instance(event=event) for event in events]
+        events_recipients = [(event, self.get_recipients(event)) for event in events if event]
+        if not events_recipients:
+            return
+
+        self.create_notifications(events_recipients)
+        for event, recipients in events_recipients:
+            self.execute_actions(event, recipients)
+
     def setup(self):
         super().setup()
         # Load default event types and actions
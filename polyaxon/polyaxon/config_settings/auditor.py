@@ -0,0 +1,18 @@
+from polyaxon.config_manager import config
+
+AUDITOR_BACKEND_TASKS = 'tasks'
+AUDITOR_BACKEND_BATCH = 'batch'
+AUDITOR_BACKEND = config.get_string(
+    'POLYAXON_AUDITOR_BACKEND',
+    is_optional=True,
+    default=AUDITOR_BACKEND_TASKS,
+    options=(AUDITOR_BACKEND_TASKS, AUDITOR_BACKEND_BATCH))
+# The batch backend drains the buffered events at most every interval, in batches of this size
+AUDITOR_BATCH_INTERVAL = config.get_int(
+    'POLYAXON_AUDITOR_BATCH_INTERVAL',
+    is_optional=True,
+    default=1)
+AUDITOR_BATCH_SIZE = config.get_int(
+    'POLYAXON_AUDITOR_BATCH_SIZE',
+    is_optional=True,
+    default=500)
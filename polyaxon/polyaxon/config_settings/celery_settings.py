@@ -90,6 +90,14 @@ class Intervals(object):
         'POLYAXON_INTERVALS_CLEAN_NOTIFICATIONS',
         is_optional=True,
         default=300)
+    CLEAN_RESOURCES_METRICS = config.get_int(
+        'POLYAXON_INTERVALS_CLEAN_RESOURCES_METRICS',
+        is_optional=True,
+        default=600)
+    ARCHIVE_LOGS = config.get_int(
+        'POLYAXON_INTERVALS_ARCHIVE_LOGS',
+        is_optional=True,
+        default=600)
 
     @staticmethod
     def get_schedule(interval):
@@ -113,6 +121,18 @@ class RoutingKeys(object):
         'POLYAXON_ROUTING_KEYS_STREAM_LOGS_SIDECARS_BUILDS',
         is_optional=True,
         default='stream_logs.sidecars.builds')
+    STREAM_STATUSES_EXPERIMENTS = config.get_string(
+        'POLYAXON_ROUTING_KEYS_STREAM_STATUSES_EXPERIMENTS',
+        is_optional=True,
+        default='stream_statuses.experiments')
+    STREAM_STATUSES_JOBS = config.get_string(
+        'POLYAXON_ROUTING_KEYS_STREAM_STATUSES_JOBS',
+        is_optional=True,
+        default='stream_statuses.jobs')
+    STREAM_STATUSES_BUILDS = config.get_string(
+        'POLYAXON_ROUTING_KEYS_STREAM_STATUSES_BUILDS',
+        is_optional=True,
+        default='stream_statuses.builds')
 
     LOGS_SIDECARS = config.get_string(
         'POLYAXON_ROUTING_KEYS_LOGS_SIDECARS',
@@ -143,6 +163,8 @@ class CronsCeleryTasks(object):
     CLUSTERS_UPDATE_SYSTEM_INFO = 'clusters_update_system_info'
     CLEAN_ACTIVITY_LOGS = 'clean_activity_logs'
     CLEAN_NOTIFICATIONS = 'clean_notifications'
+    CLEAN_RESOURCES_METRICS = 'clean_resources_metrics'
+    ARCHIVE_LOGS = 'archive_logs'
 
 
 class ReposCeleryTasks(object):
@@ -183,6 +205,7 @@ class K8SEventsCeleryTasks(object):
     K8S_EVENTS_HANDLE_NAMESPACE = 'k8s_events_handle_namespace'
     K8S_EVENTS_HANDLE_RESOURCES = 'k8s_events_handle_resources'
     K8S_EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES = 'k8s_events_handle_experiment_job_statuses'
+    K8S_EVENTS_HANDLE_EXPERIMENT_JOBS_STATUSES = 'k8s_events_handle_experiment_jobs_statuses'
     K8S_EVENTS_HANDLE_JOB_STATUSES = 'k8s_events_handle_job_statuses'
     K8S_EVENTS_HANDLE_PLUGIN_JOB_STATUSES = 'k8s_events_handle_plugin_job_statuses'
     K8S_EVENTS_HANDLE_BUILD_JOB_STATUSES = 'k8s_events_handle_build_job_statuses'
@@ -197,6 +220,7 @@ class EventsCeleryTasks(object):
     EVENTS_NOTIFY = 'events_notify'
     EVENTS_TRACK = 'events_track'
     EVENTS_LOG = 'events_log'
+    EVENTS_RECORD_BATCH = 'events_record_batch'
 
 
 class LogsCeleryTasks(object):
@@ -226,8 +250,11 @@ class SchedulerCeleryTasks(object):
     EXPERIMENTS_START = 'experiments_start'
     EXPERIMENTS_STOP = 'experiments_stop'
     EXPERIMENTS_CHECK_STATUS = 'experiments_check_status'
+    EXPERIMENTS_CHECK_STATUSES = 'experiments_check_statuses'
     EXPERIMENTS_CHECK_HEARTBEAT = 'experiments_check_heartbeat'
+    EXPERIMENTS_CHECK_HEARTBEATS = 'experiments_check_heartbeats'
     EXPERIMENTS_SET_METRICS = 'experiments_set_metrics'
+    EXPERIMENTS_ARCHIVE_LOGS = 'experiments_archive_logs'
 
     EXPERIMENTS_GROUP_CREATE = 'experiments_group_create'
     EXPERIMENTS_GROUP_STOP_EXPERIMENTS = 'experiments_group_stop_experiments'
@@ -245,12 +272,15 @@ class SchedulerCeleryTasks(object):
     BUILD_JOBS_NOTIFY_DONE = 'build_jobs_notify_done'
     BUILD_JOBS_SET_DOCKERFILE = 'build_jobs_set_dockerfile'
     BUILD_JOBS_CHECK_HEARTBEAT = 'build_jobs_check_heartbeat'
+    BUILD_JOBS_CHECK_HEARTBEATS = 'build_jobs_check_heartbeats'
 
     JOBS_BUILD = 'jobs_build'
     JOBS_START = 'jobs_start'
     JOBS_STOP = 'jobs_stop'
     JOBS_NOTIFY_DONE = 'jobs_notify_done'
     JOBS_CHECK_HEARTBEAT = 'jobs_check_heartbeat'
+    JOBS_CHECK_HEARTBEATS = 'jobs_check_heartbeats'
+    JOBS_ARCHIVE_LOGS = 'jobs_archive_logs'
 
 
 class HPCeleryTasks(object):
@@ -391,10 +421,16 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
     SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS:
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
+    SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUSES:
+        {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
     SchedulerCeleryTasks.EXPERIMENTS_CHECK_HEARTBEAT:
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
+    SchedulerCeleryTasks.EXPERIMENTS_CHECK_HEARTBEATS:
+        {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
     SchedulerCeleryTasks.EXPERIMENTS_SET_METRICS:
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
+    SchedulerCeleryTasks.EXPERIMENTS_ARCHIVE_LOGS:
+        {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
 
     # Scheduler groups
     SchedulerCeleryTasks.EXPERIMENTS_GROUP_CREATE:
@@ -427,6 +463,8 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.SCHEDULER_BUILD_JOBS},
     SchedulerCeleryTasks.BUILD_JOBS_CHECK_HEARTBEAT:
         {'queue': CeleryQueues.SCHEDULER_BUILD_JOBS},
+    SchedulerCeleryTasks.BUILD_JOBS_CHECK_HEARTBEATS:
+        {'queue': CeleryQueues.SCHEDULER_BUILD_JOBS},
 
     # Scheduler jobs
     SchedulerCeleryTasks.JOBS_BUILD:
@@ -439,6 +477,10 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.SCHEDULER_JOBS},
     SchedulerCeleryTasks.JOBS_CHECK_HEARTBEAT:
         {'queue': CeleryQueues.SCHEDULER_JOBS},
+    SchedulerCeleryTasks.JOBS_CHECK_HEARTBEATS:
+        {'queue': CeleryQueues.SCHEDULER_JOBS},
+    SchedulerCeleryTasks.JOBS_ARCHIVE_LOGS:
+        {'queue': CeleryQueues.SCHEDULER_JOBS},
 
     # Crons health
     CronsCeleryTasks.CRONS_HEALTH:
@@ -465,6 +507,10 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.CRONS_CLEAN},
     CronsCeleryTasks.CLEAN_NOTIFICATIONS:
         {'queue': CeleryQueues.CRONS_CLEAN},
+    CronsCeleryTasks.CLEAN_RESOURCES_METRICS:
+        {'queue': CeleryQueues.CRONS_CLEAN},
+    CronsCeleryTasks.ARCHIVE_LOGS:
+        {'queue': CeleryQueues.CRONS_CLEAN},
 
     # HP health
     HPCeleryTasks.HP_HEALTH:
@@ -504,6 +550,8 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.EVENTS_TRACK},
     EventsCeleryTasks.EVENTS_LOG:
         {'queue': CeleryQueues.EVENTS_LOG},
+    EventsCeleryTasks.EVENTS_RECORD_BATCH:
+        {'queue': CeleryQueues.EVENTS_LOG},
 
     # K8S Events health
     K8SEventsCeleryTasks.K8S_EVENTS_HEALTH:
@@ -516,6 +564,8 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.K8S_EVENTS_RESOURCES},
     K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES:
         {'queue': CeleryQueues.K8S_EVENTS_JOB_STATUSES},
+    K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_EXPERIMENT_JOBS_STATUSES:
+        {'queue': CeleryQueues.K8S_EVENTS_JOB_STATUSES},
     K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_JOB_STATUSES:
         {'queue': CeleryQueues.K8S_EVENTS_JOB_STATUSES},
     K8SEventsCeleryTasks.K8S_EVENTS_HANDLE_PLUGIN_JOB_STATUSES:
@@ -607,4 +657,18 @@ CELERY_BEAT_SCHEDULE = {
             'expires': Intervals.get_expires(Intervals.CLEAN_NOTIFICATIONS),
         },
     },
+    CronsCeleryTasks.CLEAN_RESOURCES_METRICS + '_beat': {
+        'task': CronsCeleryTasks.CLEAN_RESOURCES_METRICS,
+        'schedule': Intervals.get_schedule(Intervals.CLEAN_RESOURCES_METRICS),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.CLEAN_RESOURCES_METRICS),
+        },
+    },
+    CronsCeleryTasks.ARCHIVE_LOGS + '_beat': {
+        'task': CronsCeleryTasks.ARCHIVE_LOGS,
+        'schedule': Intervals.get_schedule(Intervals.ARCHIVE_LOGS),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.ARCHIVE_LOGS),
+        },
+    },
 }
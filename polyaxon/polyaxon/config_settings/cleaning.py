@@ -10,3 +10,22 @@ class CleaningIntervals(object):
         'POLYAXON_CLEANING_INTERVALS_NOTIFICATIONS',
         is_optional=True,
         default=30)
+    # Raw resources metrics are rolled up to minutes after this number of hours
+    RESOURCES_METRICS_RAW = config.get_int(
+        'POLYAXON_CLEANING_INTERVALS_RESOURCES_METRICS_RAW',
+        is_optional=True,
+        default=24)
+    # Minute resources metrics are rolled up to hours after this number of days
+    RESOURCES_METRICS_MINUTE = config.get_int(
+        'POLYAXON_CLEANING_INTERVALS_RESOURCES_METRICS_MINUTE',
+        is_optional=True,
+        default=7)
+    RESOURCES_METRICS = config.get_int(
+        'POLYAXON_CLEANING_INTERVALS_RESOURCES_METRICS',
+        is_optional=True,
+        default=90)
+    # The logs of done experiments and jobs are archived after this number of minutes
+    LOGS_ARCHIVE = config.get_int(
+        'POLYAXON_CLEANING_INTERVALS_LOGS_ARCHIVE',
+        is_optional=True,
+        default=60)
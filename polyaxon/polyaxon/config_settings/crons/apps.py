@@ -2,6 +2,7 @@ from ..apps import *
 from ..auditor_apps import AUDITOR_APPS
 
 PROJECT_APPS = AUDITOR_APPS + (
+    'publisher.apps.PublisherConfig',
     'crons.apps.CronsConfig',
 )
 
@@ -1,3 +1,4 @@
+from polyaxon.config_settings.hpsearch_bo import *
 from polyaxon.config_settings.persistence_data import *
 from polyaxon.config_settings.persistence_outputs import *
 
@@ -0,0 +1,15 @@
+from polyaxon.config_manager import config
+
+# How the bayesian optimization suggests `concurrency` experiments per iteration,
+# the suggested points are fantasized either at their predicted metric or at the worst metric
+HPSEARCH_BO_BATCH_STRATEGY = config.get_string(
+    'POLYAXON_HPSEARCH_BO_BATCH_STRATEGY',
+    is_optional=True,
+    default='kriging_believer',
+    options=('kriging_believer', 'constant_liar'))
+
+# How long the state of a group's gaussian process is cached between two iterations
+HPSEARCH_BO_STATE_TTL = config.get_int(
+    'POLYAXON_HPSEARCH_BO_STATE_TTL',
+    is_optional=True,
+    default=60 * 60 * 24)
@@ -0,0 +1,26 @@
+from polyaxon.config_manager import config
+
+# The aggregator buffers the logs and flushes them per file once the buffered logs
+# reach the flush size or the oldest buffered logs reach the flush interval
+LOGS_AGGREGATOR_FLUSH_SIZE = config.get_int(
+    'POLYAXON_LOGS_AGGREGATOR_FLUSH_SIZE',
+    is_optional=True,
+    default=512 * 1024)
+LOGS_AGGREGATOR_FLUSH_INTERVAL = config.get_int(
+    'POLYAXON_LOGS_AGGREGATOR_FLUSH_INTERVAL',
+    is_optional=True,
+    default=1)
+# Max number of unacknowledged messages, messages are acknowledged once flushed
+LOGS_AGGREGATOR_PREFETCH_COUNT = config.get_int(
+    'POLYAXON_LOGS_AGGREGATOR_PREFETCH_COUNT',
+    is_optional=True,
+    default=1000)
+# TTLs of the cached experiments/jobs existence and of the streams monitored logs
+LOGS_AGGREGATOR_EXISTENCE_TTL = config.get_int(
+    'POLYAXON_LOGS_AGGREGATOR_EXISTENCE_TTL',
+    is_optional=True,
+    default=60)
+LOGS_AGGREGATOR_MONITORED_TTL = config.get_int(
+    'POLYAXON_LOGS_AGGREGATOR_MONITORED_TTL',
+    is_optional=True,
+    default=2)
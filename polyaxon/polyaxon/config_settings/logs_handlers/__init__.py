@@ -1,3 +1,4 @@
+from polyaxon.config_settings.logs_aggregator import *
 from polyaxon.config_settings.persistence_logs import *
 from polyaxon.config_settings.spawner import *
 
@@ -1,4 +1,5 @@
 from polyaxon.config_settings.k8s import *
 from polyaxon.config_settings.spawner import *
+from polyaxon.config_settings.statuses_monitor import *
 
 from .apps import *
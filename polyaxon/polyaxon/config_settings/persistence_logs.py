@@ -4,3 +4,22 @@ PERSISTENCE_LOGS = config.get_dict('POLYAXON_PERSISTENCE_LOGS')
 LOGS_MOUNT_PATH = PERSISTENCE_LOGS['mountPath']
 LOGS_HOST_PATH = PERSISTENCE_LOGS.get('host_path', LOGS_MOUNT_PATH)
 LOGS_CLAIM_NAME = PERSISTENCE_LOGS.get('existingClaim')
+
+# Logs are stored in segments, with a sparse index to read ranges and tails without a full scan
+LOGS_SEGMENT_SIZE = config.get_int(
+    'POLYAXON_LOGS_SEGMENT_SIZE',
+    is_optional=True,
+    default=256 * 1024 * 1024)
+LOGS_INDEX_INTERVAL_BYTES = config.get_int(
+    'POLYAXON_LOGS_INDEX_INTERVAL_BYTES',
+    is_optional=True,
+    default=64 * 1024)
+LOGS_INDEX_INTERVAL_SECONDS = config.get_int(
+    'POLYAXON_LOGS_INDEX_INTERVAL_SECONDS',
+    is_optional=True,
+    default=60)
+# The logs of done experiments and jobs are compressed with this gzip level
+LOGS_COMPRESSION_LEVEL = config.get_int(
+    'POLYAXON_LOGS_COMPRESSION_LEVEL',
+    is_optional=True,
+    default=6)
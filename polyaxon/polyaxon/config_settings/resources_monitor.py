@@ -0,0 +1,23 @@
+from polyaxon.config_manager import config
+
+# Number of containers sampled concurrently,
+# docker takes ~1s to sample the stats of a container
+RESOURCES_MONITOR_MAX_WORKERS = config.get_int(
+    'POLYAXON_RESOURCES_MONITOR_MAX_WORKERS',
+    is_optional=True,
+    default=10)
+
+# Node logs collector, tails the docker `json-file` logs of the containers
+LOGS_COLLECTOR_CONTAINERS_PATH = config.get_string(
+    'POLYAXON_LOGS_COLLECTOR_CONTAINERS_PATH',
+    is_optional=True,
+    default='/var/lib/docker/containers')
+LOGS_COLLECTOR_CHECKPOINT_PATH = config.get_string(
+    'POLYAXON_LOGS_COLLECTOR_CHECKPOINT_PATH',
+    is_optional=True,
+    default='/tmp/logs_collector.json')
+# Max bytes read per container and pass
+LOGS_COLLECTOR_READ_SIZE = config.get_int(
+    'POLYAXON_LOGS_COLLECTOR_READ_SIZE',
+    is_optional=True,
+    default=1024 * 1024)
@@ -14,6 +14,16 @@ BUILD_ALWAYS_PULL_LATEST = config.get_boolean('POLYAXON_BUILD_ALWAYS_PULL_LATEST
                                               is_optional=True,
                                               default=False)
 
+# Logs, the experiment jobs logs are collected by the node logs collector instead of sidecars
+LOGS_NODE_COLLECTOR = config.get_boolean('POLYAXON_LOGS_NODE_COLLECTOR',
+                                         is_optional=True,
+                                         default=False)
+# Delay before the pods of a done experiment are deleted with their log files,
+# to let the node logs collector read their last lines
+LOGS_NODE_COLLECTOR_STOP_DELAY = config.get_int('POLYAXON_LOGS_NODE_COLLECTOR_STOP_DELAY',
+                                                is_optional=True,
+                                                default=10)
+
 # Refs
 REFS_SECRETS = config.get_string('POLYAXON_REFS_SECRETS',
                                  is_optional=True,
@@ -0,0 +1,27 @@
+from polyaxon.config_manager import config
+
+# Number of workers handling the pods events
+STATUSES_MONITOR_WORKERS = config.get_int(
+    'POLYAXON_STATUSES_MONITOR_WORKERS',
+    is_optional=True,
+    default=4)
+# The watch is restarted, from the last resource version, after this timeout
+STATUSES_MONITOR_WATCH_TIMEOUT = config.get_int(
+    'POLYAXON_STATUSES_MONITOR_WATCH_TIMEOUT',
+    is_optional=True,
+    default=300)
+# Min interval in seconds between two resource version checkpoints
+STATUSES_MONITOR_CHECKPOINT_INTERVAL = config.get_int(
+    'POLYAXON_STATUSES_MONITOR_CHECKPOINT_INTERVAL',
+    is_optional=True,
+    default=1)
+# Requires a kubernetes api and client supporting watch bookmarks
+STATUSES_MONITOR_WATCH_BOOKMARKS = config.get_boolean(
+    'POLYAXON_STATUSES_MONITOR_WATCH_BOOKMARKS',
+    is_optional=True,
+    default=False)
+# Max number of experiment jobs statuses sent in a single task
+STATUSES_MONITOR_BATCH_SIZE = config.get_int(
+    'POLYAXON_STATUSES_MONITOR_BATCH_SIZE',
+    is_optional=True,
+    default=100)
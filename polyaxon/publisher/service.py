@@ -14,6 +14,12 @@ class PublisherService(Service):
     __all__ = ('publish_experiment_job_log',
                'publish_build_job_log',
                'publish_job_log',
+               'stream_experiment_job_log',
+               'stream_build_job_log',
+               'stream_job_log',
+               'publish_experiment_status',
+               'publish_build_job_status',
+               'publish_job_status',
                'setup')
 
     def __init__(self):
@@ -40,48 +46,64 @@ class PublisherService(Service):
         except RedisError:
             should_stream = False
         if should_stream:
-            self._logger.info("Streaming new log event for experiment: %s job: %s",
-                              experiment_uuid,
-                              job_uuid)
-
-            with celery_app.producer_or_acquire(None) as producer:
-                try:
-                    producer.publish(
-                        {
-                            'experiment_uuid': experiment_uuid,
-                            'job_uuid': job_uuid,
-                            'log_lines': log_lines,
-                        },
-                        retry=True,
-                        routing_key='{}.{}.{}'.format(RoutingKeys.STREAM_LOGS_SIDECARS_EXPERIMENTS,
-                                                      experiment_uuid,
-                                                      job_uuid),
-                        exchange=settings.INTERNAL_EXCHANGE,
-                    )
-                except (TimeoutError, AMQPError):
-                    pass
+            self.stream_experiment_job_log(log_lines=log_lines,
+                                           experiment_uuid=experiment_uuid,
+                                           job_uuid=job_uuid)
+
+    @staticmethod
+    def _publish(message, routing_key):
+        with celery_app.producer_or_acquire(None) as producer:
+            try:
+                producer.publish(
+                    message,
+                    retry=True,
+                    routing_key=routing_key,
+                    exchange=settings.INTERNAL_EXCHANGE,
+                )
+            except (TimeoutError, AMQPError):
+                pass
+
+    def stream_experiment_job_log(self, log_lines, experiment_uuid, job_uuid):
+        """Streams the logs without checking if the experiment/job is monitored."""
+        self._logger.info("Streaming new log event for experiment: %s job: %s",
+                          experiment_uuid,
+                          job_uuid)
+        self._publish(
+            {
+                'experiment_uuid': experiment_uuid,
+                'job_uuid': job_uuid,
+                'log_lines': log_lines,
+            },
+            routing_key='{}.{}.{}'.format(RoutingKeys.STREAM_LOGS_SIDECARS_EXPERIMENTS,
+                                          experiment_uuid,
+                                          job_uuid))
 
     def _stream_job_log(self, job_uuid, log_lines, routing_key):
+        self._logger.info("Streaming new log event for job: %s", job_uuid)
+        self._publish(
+            {
+                'job_uuid': job_uuid,
+                'log_lines': log_lines,
+            },
+            routing_key='{}.{}'.format(routing_key, job_uuid))
+
+    def stream_build_job_log(self, log_lines, job_uuid):
+        """Streams the logs without checking if the build job is monitored."""
+        self._stream_job_log(job_uuid=job_uuid,
+                             log_lines=log_lines,
+                             routing_key=RoutingKeys.STREAM_LOGS_SIDECARS_BUILDS)
+
+    def stream_job_log(self, log_lines, job_uuid):
+        """Streams the logs without checking if the job is monitored."""
+        self._stream_job_log(job_uuid=job_uuid,
+                             log_lines=to_list(log_lines),
+                             routing_key=RoutingKeys.STREAM_LOGS_SIDECARS_JOBS)
+
+    def _should_stream_job_log(self, job_uuid):
         try:
-            should_stream = RedisToStream.is_monitored_job_logs(job_uuid)
+            return RedisToStream.is_monitored_job_logs(job_uuid)
         except RedisError:
-            should_stream = False
-        if should_stream:
-            self._logger.info("Streaming new log event for job: %s", job_uuid)
-
-            with celery_app.producer_or_acquire(None) as producer:
-                try:
-                    producer.publish(
-                        {
-                            'job_uuid': job_uuid,
-                            'log_lines': log_lines,
-                        },
-                        retry=True,
-                        routing_key='{}.{}'.format(routing_key, job_uuid),
-                        exchange=settings.INTERNAL_EXCHANGE,
-                    )
-                except (TimeoutError, AMQPError):
-                    pass
+            return False
 
     def publish_build_job_log(self, log_lines, job_uuid, job_name, send_task=True):
         self._logger.info("Publishing log event for task: %s", job_uuid)
@@ -93,9 +115,8 @@ class PublisherService(Service):
                     'job_name': job_name,
                     'log_lines': log_lines
                 })
-        self._stream_job_log(job_uuid=job_uuid,
-                             log_lines=log_lines,
-                             routing_key=RoutingKeys.STREAM_LOGS_SIDECARS_BUILDS)
+        if self._should_stream_job_log(job_uuid):
+            self.stream_build_job_log(log_lines=log_lines, job_uuid=job_uuid)
 
     def publish_job_log(self, log_lines, job_uuid, job_name, send_task=True):
         log_lines = to_list(log_lines)
@@ -109,9 +130,41 @@ class PublisherService(Service):
                     'job_name': job_name,
                     'log_lines': log_lines
                 })
-        self._stream_job_log(job_uuid=job_uuid,
-                             log_lines=log_lines,
-                             routing_key=RoutingKeys.STREAM_LOGS_SIDECARS_JOBS)
+        if self._should_stream_job_log(job_uuid):
+            self.stream_job_log(log_lines=log_lines, job_uuid=job_uuid)
+
+    def _stream_status(self, object_uuid, status, routing_key, is_monitored):
+        try:
+            should_stream = is_monitored(object_uuid)
+        except RedisError:
+            should_stream = False
+        if should_stream:
+            self._logger.debug("Streaming new status `%s` for: %s", status, object_uuid)
+
+            self._publish(
+                {
+                    'status': status,
+                    'log_lines': None,
+                },
+                routing_key='{}.{}'.format(routing_key, object_uuid))
+
+    def publish_experiment_status(self, experiment_uuid, status):
+        self._stream_status(object_uuid=experiment_uuid,
+                            status=status,
+                            routing_key=RoutingKeys.STREAM_STATUSES_EXPERIMENTS,
+                            is_monitored=RedisToStream.is_monitored_experiment_logs)
+
+    def publish_build_job_status(self, job_uuid, status):
+        self._stream_status(object_uuid=job_uuid,
+                            status=status,
+                            routing_key=RoutingKeys.STREAM_STATUSES_BUILDS,
+                            is_monitored=RedisToStream.is_monitored_job_logs)
+
+    def publish_job_status(self, job_uuid, status):
+        self._stream_status(object_uuid=job_uuid,
+                            status=status,
+                            routing_key=RoutingKeys.STREAM_STATUSES_JOBS,
+                            is_monitored=RedisToStream.is_monitored_job_logs)
 
     def setup(self):
         import logging
@@ -430,7 +430,7 @@ def start_experiment(experiment):
                                 namespace=settings.K8S_NAMESPACE,
                                 in_cluster=True,
                                 job_docker_image=job_docker_image,
-                                use_sidecar=True,
+                                use_sidecar=not settings.LOGS_NODE_COLLECTOR,
                                 sidecar_config=config.get_requested_params(to_str=True),
                                 token_scope=token_scope)
         response = spawner.start_experiment()
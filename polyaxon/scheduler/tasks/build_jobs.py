@@ -3,6 +3,7 @@ import logging
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
 from db.getters.build_jobs import get_valid_build_job
+from db.models.build_jobs import BuildJob
 from db.models.experiments import Experiment
 from db.models.jobs import Job
 from db.models.notebooks import NotebookJob
@@ -180,3 +181,18 @@ def build_jobs_check_heartbeat(build_job_id):
     # BuildJob is zombie status
     build_job.set_status(JobLifeCycle.FAILED,
                          message='BuildJob is in zombie state (no heartbeat was reported).')
+
+
+@celery_app.task(name=SchedulerCeleryTasks.BUILD_JOBS_CHECK_HEARTBEATS, ignore_result=True)
+def build_jobs_check_heartbeats(build_job_ids):
+    # Some heartbeats could have been reported since the check was scheduled
+    build_job_ids = RedisHeartBeat.get_dead_builds(build_ids=build_job_ids)
+    if not build_job_ids:
+        return
+
+    build_jobs = BuildJob.objects.filter(id__in=build_job_ids,
+                                         status__status__in=JobLifeCycle.HEARTBEAT_STATUS)
+    for build_job in build_jobs:
+        # BuildJob is zombie status
+        build_job.set_status(JobLifeCycle.FAILED,
+                             message='BuildJob is in zombie state (no heartbeat was reported).')
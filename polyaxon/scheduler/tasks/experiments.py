@@ -7,12 +7,16 @@ import publisher
 from api.experiments.serializers import ExperimentMetricSerializer
 from constants.experiments import ExperimentLifeCycle
 from db.getters.experiments import get_valid_experiment
+from db.models.experiment_jobs import ExperimentJob
+from db.models.experiments import Experiment
 from db.redis.heartbeat import RedisHeartBeat
-from libs.paths.experiments import copy_experiment_outputs
+from db.redis.statuses import RedisStatuses
+from libs.paths.experiments import archive_experiment_logs, copy_experiment_outputs
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import Intervals, SchedulerCeleryTasks
 from scheduler import dockerizer_scheduler, experiment_scheduler
 from schemas.specifications import ExperimentSpecification
+from schemas.tasks import TaskType
 
 _logger = logging.getLogger('polyaxon.scheduler.experiments')
 
@@ -99,6 +103,37 @@ def experiments_check_status(experiment_uuid=None, experiment_id=None):
     experiment.update_status()
 
 
+def get_experiments_jobs_statuses(experiment_ids):
+    """Returns the master status and the jobs statuses of each experiment in a single query."""
+    jobs_statuses = ExperimentJob.objects.filter(experiment_id__in=experiment_ids).values_list(
+        'experiment_id', 'role', 'status__status').distinct()
+    experiments_statuses = {}
+    for experiment_id, role, status in jobs_statuses:
+        master_status, statuses = experiments_statuses.setdefault(experiment_id, (None, set()))
+        if role == TaskType.MASTER:
+            master_status = status
+        if status is not None:
+            statuses.add(status)
+        experiments_statuses[experiment_id] = (master_status, statuses)
+    return experiments_statuses
+
+
+@celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUSES, ignore_result=True)
+def experiments_check_statuses():
+    """Drains the experiments marked as dirty and recomputes their statuses."""
+    experiment_ids = RedisStatuses.pop_experiments()
+    if not experiment_ids:
+        return
+
+    jobs_statuses = get_experiments_jobs_statuses(experiment_ids=experiment_ids)
+    experiments = Experiment.objects.filter(id__in=jobs_statuses.keys()).exclude(
+        status__status__in=ExperimentLifeCycle.DONE_STATUS).select_related('status')
+    for experiment in experiments:
+        master_status, job_statuses = jobs_statuses[experiment.id]
+        experiment.update_status(calculated_status=experiment.get_calculated_status(
+            master_status=master_status, job_statuses=job_statuses))
+
+
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_CHECK_HEARTBEAT, ignore_result=True)
 def experiments_check_heartbeat(experiment_id):
     if RedisHeartBeat.experiment_is_alive(experiment_id=experiment_id):
@@ -113,6 +148,22 @@ def experiments_check_heartbeat(experiment_id):
                           message='Experiment is in zombie state (no heartbeat was reported).')
 
 
+@celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_CHECK_HEARTBEATS, ignore_result=True)
+def experiments_check_heartbeats(experiment_ids):
+    # Some heartbeats could have been reported since the check was scheduled
+    experiment_ids = RedisHeartBeat.get_dead_experiments(experiment_ids=experiment_ids)
+    if not experiment_ids:
+        return
+
+    experiments = Experiment.objects.filter(
+        id__in=experiment_ids,
+        status__status__in=ExperimentLifeCycle.HEARTBEAT_STATUS)
+    for experiment in experiments:
+        # Experiment is zombie status
+        experiment.set_status(ExperimentLifeCycle.FAILED,
+                              message='Experiment is in zombie state (no heartbeat was reported).')
+
+
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_SET_METRICS, ignore_result=True)
 def experiments_set_metrics(experiment_id, data):
     experiment = get_valid_experiment(experiment_id=experiment_id)
@@ -127,10 +178,21 @@ def experiments_set_metrics(experiment_id, data):
         serializer.is_valid(raise_exception=True)
     except ValidationError:
         _logger.error('Could not create metrics, a validation error was raised.')
+        return
 
     serializer.save(experiment=experiment)
 
 
+@celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_ARCHIVE_LOGS, ignore_result=True)
+def experiments_archive_logs(experiment_names):
+    for experiment_name in experiment_names:
+        try:
+            archive_experiment_logs(experiment_name=experiment_name)
+        except OSError as e:
+            _logger.warning('Could not archive the logs of experiment `%s`: %s',
+                            experiment_name, e)
+
+
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_START, ignore_result=True)
 def experiments_start(experiment_id):
     experiment = get_valid_experiment(experiment_id=experiment_id)
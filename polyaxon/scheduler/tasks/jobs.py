@@ -2,7 +2,9 @@ import logging
 
 from constants.jobs import JobLifeCycle
 from db.getters.jobs import get_valid_job
+from db.models.jobs import Job
 from db.redis.heartbeat import RedisHeartBeat
+from libs.paths.jobs import archive_job_logs
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import Intervals, SchedulerCeleryTasks
 from scheduler import dockerizer_scheduler, job_scheduler
@@ -110,3 +112,27 @@ def jobs_check_heartbeat(job_id):
     # Job is zombie status
     job.set_status(JobLifeCycle.FAILED,
                    message='Job is in zombie state (no heartbeat was reported).')
+
+
+@celery_app.task(name=SchedulerCeleryTasks.JOBS_CHECK_HEARTBEATS, ignore_result=True)
+def jobs_check_heartbeats(job_ids):
+    # Some heartbeats could have been reported since the check was scheduled
+    job_ids = RedisHeartBeat.get_dead_jobs(job_ids=job_ids)
+    if not job_ids:
+        return
+
+    jobs = Job.objects.filter(id__in=job_ids, status__status__in=JobLifeCycle.HEARTBEAT_STATUS)
+    for job in jobs:
+        # Job is zombie status
+        job.set_status(JobLifeCycle.FAILED,
+                       message='Job is in zombie state (no heartbeat was reported).')
+
+
+@celery_app.task(name=SchedulerCeleryTasks.JOBS_ARCHIVE_LOGS, ignore_result=True)
+def jobs_archive_logs(job_names):
+    """Archives the logs of jobs and build jobs, both are stored under the jobs logs."""
+    for job_name in job_names:
+        try:
+            archive_job_logs(job_name=job_name)
+        except OSError as e:
+            _logger.warning('Could not archive the logs of job `%s`: %s', job_name, e)
@@ -1,4 +1,5 @@
 import logging
+import os
 import time
 
 from hestia.logging_utils import LogSpec
@@ -8,25 +9,17 @@ from polyaxon_schemas.pod import PodLifeCycle
 from sidecar import settings
 from sidecar.celery_api import celery_app
 from sidecar.settings import LogsCelerySignals
+from sidecar.shipper import LogsShipper
 
 logger = logging.getLogger('polyaxon.monitors.sidecar')
 
 
-def _handle_log_stream(stream, publish):
-    log_lines = []
-    last_emit_time = time.time()
-    for log_line in stream:
-        log_lines.append(log_line.decode('utf-8').strip())
-        publish_cond = (
-            len(log_lines) == settings.MESSAGES_COUNT or
-            (log_lines and time.time() - last_emit_time > settings.MESSAGES_TIMEOUT_SHORT)
-        )
-        if publish_cond:
-            publish(log_lines)
-            log_lines = []
-            last_emit_time = time.time()
-    if log_lines:
-        publish(log_lines)
+def _handle_log_stream(stream, pod_id, task_name, get_kwargs):
+    shipper = LogsShipper(send=celery_app.send_task,
+                          task_name=task_name,
+                          get_kwargs=get_kwargs,
+                          spool_path=os.path.join(settings.LOGS_SPOOL_PATH, pod_id))
+    return shipper.run(stream=stream)
 
 
 def run_for_experiment_job(k8s_manager,
@@ -44,20 +37,20 @@ def run_for_experiment_job(k8s_manager,
         follow=True,
         _preload_content=False)
 
-    def publish(log_lines):
+    def get_kwargs(log_lines):
         log_lines = [LogSpec(log_line=log_line, name='{}.{}'.format(task_type, int(task_idx) + 1))
                      for log_line in log_lines]
-        celery_app.send_task(
-            LogsCelerySignals.LOGS_SIDECARS_EXPERIMENTS,
-            kwargs={
-                'experiment_name': experiment_name,
-                'experiment_uuid': experiment_uuid,
-                'job_uuid': job_uuid,
-                'log_lines': '\n'.join(log_lines)
-            }
-        )
+        return {
+            'experiment_name': experiment_name,
+            'experiment_uuid': experiment_uuid,
+            'job_uuid': job_uuid,
+            'log_lines': '\n'.join(log_lines)
+        }
 
-    _handle_log_stream(stream=raw.stream(), publish=publish)
+    _handle_log_stream(stream=raw.stream(),
+                       pod_id=pod_id,
+                       task_name=LogsCelerySignals.LOGS_SIDECARS_EXPERIMENTS,
+                       get_kwargs=get_kwargs)
 
 
 def run_for_job(k8s_manager,
@@ -72,18 +65,18 @@ def run_for_job(k8s_manager,
         follow=True,
         _preload_content=False)
 
-    def publish(log_lines):
+    def get_kwargs(log_lines):
         log_lines = [LogSpec(log_line=log_line) for log_line in log_lines]
-        celery_app.send_task(
-            LogsCelerySignals.LOGS_SIDECARS_JOBS,
-            kwargs={
-                'job_name': job_name,
-                'job_uuid': job_uuid,
-                'log_lines': '\n'.join(log_lines)
-            }
-        )
-
-    _handle_log_stream(stream=raw.stream(), publish=publish)
+        return {
+            'job_name': job_name,
+            'job_uuid': job_uuid,
+            'log_lines': '\n'.join(log_lines)
+        }
+
+    _handle_log_stream(stream=raw.stream(),
+                       pod_id=pod_id,
+                       task_name=LogsCelerySignals.LOGS_SIDECARS_JOBS,
+                       get_kwargs=get_kwargs)
 
 
 def can_log(k8s_manager, pod_id, log_sleep_interval):
@@ -56,6 +56,35 @@ MESSAGES_TIMEOUT_SHORT = config.get_string('POLYAXON_MESSAGES_TIMEOUT_SHORT',
                                            is_optional=True,
                                            default=2)
 
+# Logs shipping
+LOGS_QUEUE_SIZE = config.get_int('POLYAXON_LOGS_QUEUE_SIZE',
+                                 is_optional=True,
+                                 default=10000)
+LOGS_QUEUE_PUT_TIMEOUT = config.get_int('POLYAXON_LOGS_QUEUE_PUT_TIMEOUT',
+                                        is_optional=True,
+                                        default=5)
+LOGS_BATCH_MIN_SIZE = config.get_int('POLYAXON_LOGS_BATCH_MIN_SIZE',
+                                     is_optional=True,
+                                     default=50)
+LOGS_BATCH_MAX_SIZE = config.get_int('POLYAXON_LOGS_BATCH_MAX_SIZE',
+                                     is_optional=True,
+                                     default=2000)
+LOGS_COMPRESSION_MIN_SIZE = config.get_int('POLYAXON_LOGS_COMPRESSION_MIN_SIZE',
+                                           is_optional=True,
+                                           default=1024)
+LOGS_SPOOL_PATH = config.get_string('POLYAXON_LOGS_SPOOL_PATH',
+                                    is_optional=True,
+                                    default='/tmp/sidecar/spool')
+LOGS_SPOOL_MAX_SIZE = config.get_int('POLYAXON_LOGS_SPOOL_MAX_SIZE',
+                                     is_optional=True,
+                                     default=100 * 1024 * 1024)
+LOGS_RETRY_INTERVAL = config.get_int('POLYAXON_LOGS_RETRY_INTERVAL',
+                                     is_optional=True,
+                                     default=5)
+LOGS_STATS_INTERVAL = config.get_int('POLYAXON_LOGS_STATS_INTERVAL',
+                                     is_optional=True,
+                                     default=60)
+
 CELERY_TRACK_STARTED = True
 
 AMQP_URL = config.get_string('POLYAXON_AMQP_URL')
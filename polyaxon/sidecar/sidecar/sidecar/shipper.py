@@ -0,0 +1,257 @@
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from sidecar import settings
+
+logger = logging.getLogger('polyaxon.monitors.sidecar')
+
+_END_OF_STREAM = object()
+
+
+class ShipperStats(object):
+    """Counters of a sidecar logs shipper."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.lines = 0
+        self.bytes = 0
+        self.batches = 0
+        self.drops = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.lag = 0.
+
+    def incr(self, **values):
+        with self._lock:
+            for key, value in values.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'lines': self.lines,
+                'bytes': self.bytes,
+                'batches': self.batches,
+                'drops': self.drops,
+                'spooled': self.spooled,
+                'replayed': self.replayed,
+                'lag': round(self.lag, 3),
+            }
+
+
+class LogsReader(threading.Thread):
+    """Reads a logs stream into a bounded queue.
+
+    If the queue stays full for the put timeout, i.e. the shipper cannot keep up,
+    the line is dropped instead of blocking the stream indefinitely.
+    """
+
+    def __init__(self, stream, logs_queue, stats, put_timeout=None):
+        super().__init__(daemon=True)
+        self.stream = stream
+        self.queue = logs_queue
+        self.stats = stats
+        self.put_timeout = put_timeout or settings.LOGS_QUEUE_PUT_TIMEOUT
+
+    def run(self):
+        try:
+            for log_line in self.stream:
+                try:
+                    self.queue.put((log_line, time.monotonic()), timeout=self.put_timeout)
+                except queue.Full:
+                    self.stats.incr(drops=1)
+        except Exception as e:
+            logger.warning('Logs stream stopped: %s', e)
+        finally:
+            self.queue.put(_END_OF_STREAM)
+
+
+class LogsSpool(object):
+    """Keeps the batches that could not be sent on disk, to replay them in order."""
+
+    def __init__(self, path, stats, max_size=None):
+        self.path = path
+        self.stats = stats
+        self.max_size = max_size or settings.LOGS_SPOOL_MAX_SIZE
+        self._sequence = 0
+        os.makedirs(self.path, exist_ok=True)
+        files = self.get_files()
+        if files:
+            self._sequence = int(files[-1].split('.')[0]) + 1
+
+    def get_files(self):
+        return sorted(f for f in os.listdir(self.path) if f.endswith('.json.gz'))
+
+    def get_size(self):
+        return sum(os.path.getsize(os.path.join(self.path, f)) for f in self.get_files())
+
+    @property
+    def is_empty(self):
+        return not self.get_files()
+
+    def push(self, task_name, kwargs, lines):
+        data = gzip.compress(json.dumps({
+            'task_name': task_name,
+            'kwargs': kwargs,
+            'lines': lines}).encode('utf-8'))
+        if self.get_size() + len(data) > self.max_size:
+            self.stats.incr(drops=lines)
+            logger.warning('Logs spool is full, dropped %s lines.', lines)
+            return
+        filepath = os.path.join(self.path, '{:012d}.json.gz'.format(self._sequence))
+        with open(filepath + '.tmp', 'wb') as f:
+            f.write(data)
+        os.rename(filepath + '.tmp', filepath)
+        self._sequence += 1
+        self.stats.incr(spooled=lines)
+
+    def replay(self, send):
+        """Sends the spooled batches in order, stops at the first failure."""
+        for filename in self.get_files():
+            filepath = os.path.join(self.path, filename)
+            with open(filepath, 'rb') as f:
+                batch = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+            send(batch['task_name'], batch['kwargs'])
+            os.remove(filepath)
+            self.stats.incr(replayed=batch['lines'])
+
+
+class AdaptiveBatchSize(object):
+    """Sizes the batches to the logs throughput.
+
+    The batch size targets the lines read during a flush interval,
+    bounded between the min and the max batch size.
+    """
+
+    def __init__(self, interval, min_size=None, max_size=None, smoothing=0.3):
+        self.interval = interval
+        self.min_size = min_size or settings.LOGS_BATCH_MIN_SIZE
+        self.max_size = max_size or settings.LOGS_BATCH_MAX_SIZE
+        self.smoothing = smoothing
+        self.rate = None
+        self.size = self.min_size
+
+    def update(self, lines, duration):
+        rate = lines / max(duration, 1e-3)
+        if self.rate is None:
+            self.rate = rate
+        else:
+            self.rate = self.smoothing * rate + (1 - self.smoothing) * self.rate
+        self.size = int(min(max(self.rate * self.interval, self.min_size), self.max_size))
+        return self.size
+
+
+class LogsShipper(object):
+    """Ships a logs stream in batches without blocking the stream on the broker.
+
+    A reader thread feeds a bounded queue, the shipper drains it in batches
+    sized to the throughput, compresses the large batches,
+    and spools the batches to disk while the broker is unreachable,
+    the spooled batches are replayed, in order, once it's reachable again.
+    """
+
+    def __init__(self,
+                 send,
+                 task_name,
+                 get_kwargs,
+                 spool_path,
+                 interval=None,
+                 queue_size=None,
+                 retry_interval=None,
+                 stats_interval=None):
+        self._send = send
+        self.task_name = task_name
+        self.get_kwargs = get_kwargs
+        self.interval = interval or settings.MESSAGES_TIMEOUT_SHORT
+        self.retry_interval = retry_interval or settings.LOGS_RETRY_INTERVAL
+        self.stats_interval = stats_interval or settings.LOGS_STATS_INTERVAL
+        self.stats = ShipperStats()
+        self.queue = queue.Queue(maxsize=queue_size or settings.LOGS_QUEUE_SIZE)
+        self.spool = LogsSpool(path=spool_path, stats=self.stats)
+        self.batch_size = AdaptiveBatchSize(interval=self.interval)
+        self._next_retry_at = None
+        self._last_stats_at = time.monotonic()
+
+    @staticmethod
+    def get_compression(log_lines):
+        if len(log_lines) >= settings.LOGS_COMPRESSION_MIN_SIZE:
+            return 'gzip'
+        return None
+
+    def send(self, task_name, kwargs):
+        self._send(task_name,
+                   kwargs=kwargs,
+                   compression=self.get_compression(kwargs['log_lines']),
+                   retry=False)
+
+    @property
+    def is_broker_down(self):
+        return self._next_retry_at is not None
+
+    def _replay(self):
+        if self.is_broker_down and time.monotonic() < self._next_retry_at:
+            return False
+        try:
+            self.spool.replay(send=self.send)
+        except Exception as e:
+            logger.warning('Could not replay the spooled logs: %s', e)
+            self._next_retry_at = time.monotonic() + self.retry_interval
+            return False
+        self._next_retry_at = None
+        return True
+
+    def ship(self, batch):
+        log_lines = [log_line.decode('utf-8').strip() for log_line, _ in batch]
+        kwargs = self.get_kwargs(log_lines)
+        self.stats.incr(lines=len(batch), bytes=len(kwargs['log_lines']), batches=1)
+        if self.spool.is_empty or self._replay():
+            try:
+                self.send(self.task_name, kwargs)
+                self.stats.lag = time.monotonic() - batch[0][1]
+                return
+            except Exception as e:
+                logger.warning('Could not send the logs, spooling them: %s', e)
+                self._next_retry_at = time.monotonic() + self.retry_interval
+        self.spool.push(task_name=self.task_name, kwargs=kwargs, lines=len(batch))
+
+    def log_stats(self, force=False):
+        if force or time.monotonic() - self._last_stats_at >= self.stats_interval:
+            logger.info('Logs shipping stats: %s', self.stats.as_dict())
+            self._last_stats_at = time.monotonic()
+
+    def run(self, stream):
+        LogsReader(stream=stream, logs_queue=self.queue, stats=self.stats).start()
+        batch = []
+        started_at = time.monotonic()
+        done = False
+        while not done:
+            timeout = max(self.interval - (time.monotonic() - started_at), 0)
+            try:
+                item = self.queue.get(timeout=timeout)
+                if item is _END_OF_STREAM:
+                    done = True
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                pass
+            duration = time.monotonic() - started_at
+            if batch and (done or len(batch) >= self.batch_size.size or duration >= self.interval):
+                self.batch_size.update(lines=len(batch), duration=duration)
+                self.ship(batch)
+                batch = []
+                started_at = time.monotonic()
+            elif not batch and duration >= self.interval:
+                if not self.spool.is_empty:
+                    self._replay()
+                started_at = time.monotonic()
+            self.log_stats()
+        if not self.spool.is_empty:
+            self._next_retry_at = None
+            self._replay()
+        self.log_stats(force=True)
+        return self.stats
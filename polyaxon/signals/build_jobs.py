@@ -6,6 +6,7 @@ from django.db.models.signals import post_delete, post_save, pre_delete, pre_sav
 from django.dispatch import receiver
 
 import auditor
+import publisher
 
 from constants.jobs import JobLifeCycle
 from db.models.build_jobs import BuildJob, BuildJobStatus
@@ -61,6 +62,7 @@ def build_job_status_post_save(sender, **kwargs):
     auditor.record(event_type=BUILD_JOB_NEW_STATUS,
                    instance=job,
                    previous_status=previous_status)
+    publisher.publish_build_job_status(job_uuid=job.uuid.hex, status=instance.status)
     if instance.status == JobLifeCycle.STOPPED:
         auditor.record(event_type=BUILD_JOB_STOPPED,
                        instance=job,
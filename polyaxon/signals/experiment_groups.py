@@ -8,6 +8,7 @@ import auditor
 
 from constants.experiment_groups import ExperimentGroupLifeCycle
 from db.models.experiment_groups import ExperimentGroup, ExperimentGroupStatus, GroupTypes
+from db.redis.hpsearch import RedisHPSearchStates
 from event_manager.events.experiment_group import (
     EXPERIMENT_GROUP_CREATED,
     EXPERIMENT_GROUP_DELETED,
@@ -98,6 +99,8 @@ def experiment_group_post_delete(sender, **kwargs):
     auditor.record(event_type=EXPERIMENT_GROUP_DELETED,
                    instance=instance)
     remove_bookmarks(object_id=instance.id, content_type='experimentgroup')
+    if instance.search_algorithm == SearchAlgorithms.BO:
+        RedisHPSearchStates.clear_state(experiment_group_id=instance.id)
 
 
 @receiver(post_save, sender=ExperimentGroupStatus, dispatch_uid="experiment_group_status_post_save")
@@ -133,3 +136,5 @@ def experiment_group_status_post_save(sender, **kwargs):
         auditor.record(event_type=EXPERIMENT_GROUP_DONE,
                        instance=experiment_group,
                        previous_status=previous_status)
+        if experiment_group.search_algorithm == SearchAlgorithms.BO:
+            RedisHPSearchStates.clear_state(experiment_group_id=experiment_group.id)
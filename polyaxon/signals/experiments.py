@@ -2,10 +2,12 @@ import logging
 
 from hestia.decorators import check_specification, ignore_raw, ignore_updates, ignore_updates_pre
 
+from django.conf import settings
 from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 
 import auditor
+import publisher
 
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
@@ -13,12 +15,12 @@ from db.models.cloning_strategies import CloningStrategy
 from db.models.experiment_groups import ExperimentGroup
 from db.models.experiment_jobs import ExperimentJob, ExperimentJobStatus
 from db.models.experiments import Experiment, ExperimentMetric, ExperimentStatus
+from db.redis.statuses import RedisStatuses
 from db.redis.tll import RedisTTL
 from event_manager.events.experiment import (
     EXPERIMENT_DELETED,
     EXPERIMENT_DONE,
     EXPERIMENT_FAILED,
-    EXPERIMENT_NEW_METRIC,
     EXPERIMENT_NEW_STATUS,
     EXPERIMENT_STOPPED,
     EXPERIMENT_SUCCEEDED
@@ -125,10 +127,11 @@ def experiment_job_status_post_save(sender, **kwargs):
     if experiment.is_done:
         return
 
-    celery_app.send_task(
-        SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
-        kwargs={'experiment_id': experiment.id},
-        countdown=1)
+    # The status is recomputed once for all the jobs updates happening in a short period
+    if RedisStatuses.mark_experiment(experiment_id=experiment.id):
+        celery_app.send_task(
+            SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUSES,
+            countdown=1)
 
 
 @receiver(post_save, sender=ExperimentStatus, dispatch_uid="experiment_status_post_save")
@@ -151,6 +154,8 @@ def experiment_status_post_save(sender, **kwargs):
     auditor.record(event_type=EXPERIMENT_NEW_STATUS,
                    instance=experiment,
                    previous_status=previous_status)
+    publisher.publish_experiment_status(experiment_uuid=experiment.uuid.hex,
+                                        status=instance.status)
 
     if instance.status == ExperimentLifeCycle.SUCCEEDED:
         # update all workers with succeeded status, since we will trigger a stop mechanism
@@ -181,18 +186,8 @@ def experiment_status_post_save(sender, **kwargs):
 @ignore_raw
 def experiment_metric_post_save(sender, **kwargs):
     instance = kwargs['instance']
-    experiment = instance.experiment
-
     # update experiment last_metric
-    def update_metric(last_metrics, metrics):
-        last_metrics.update(metrics)
-        return last_metrics
-
-    experiment.last_metric = update_metric(last_metrics=experiment.last_metric,
-                                           metrics=instance.values)
-    experiment.save(update_fields=['last_metric'])
-    auditor.record(event_type=EXPERIMENT_NEW_METRIC,
-                   instance=experiment)
+    instance.experiment.update_last_metric(metrics=[instance.values])
 
 
 @receiver(post_save, sender=Experiment, dispatch_uid="start_new_experiment")
@@ -253,6 +248,9 @@ def handle_new_experiment_status(sender, **kwargs):
                      'send signal to other workers to stop.', experiment.unique_name)
         # Schedule stop for this experiment because other jobs may be still running
         group = experiment.experiment_group
+        countdown = RedisTTL.get_for_experiment(experiment_id=experiment.id)
+        if settings.LOGS_NODE_COLLECTOR:
+            countdown = max(countdown, settings.LOGS_NODE_COLLECTOR_STOP_DELAY)
         celery_app.send_task(
             SchedulerCeleryTasks.EXPERIMENTS_STOP,
             kwargs={
@@ -265,4 +263,4 @@ def handle_new_experiment_status(sender, **kwargs):
                 'specification': experiment.config,
                 'update_status': False
             },
-            countdown=RedisTTL.get_for_experiment(experiment_id=experiment.id))
+            countdown=countdown)
@@ -6,6 +6,7 @@ from django.db.models.signals import post_delete, post_save, pre_delete, pre_sav
 from django.dispatch import receiver
 
 import auditor
+import publisher
 
 from constants.jobs import JobLifeCycle
 from db.models.jobs import Job, JobStatus
@@ -83,6 +84,7 @@ def job_status_post_save(sender, **kwargs):
     auditor.record(event_type=JOB_NEW_STATUS,
                    instance=job,
                    previous_status=previous_status)
+    publisher.publish_job_status(job_uuid=job.uuid.hex, status=instance.status)
     if instance.status == JobLifeCycle.STOPPED:
         auditor.record(event_type=JOB_STOPPED,
                        instance=job,
@@ -1,5 +1,6 @@
 from sanic import Sanic
 
+from streams.broker import LogsBroker
 from streams.resources.builds import build_logs
 from streams.resources.experiment_jobs import experiment_job_logs, experiment_job_resources
 from streams.resources.experiments import experiment_logs, experiment_resources
@@ -43,21 +44,12 @@ add_url(endpoint=build_logs, base_url=BUILD_URL, url='logs')
 async def notify_server_started(app, loop):  # pylint:disable=redefined-outer-name
     app.job_resources_ws_mangers = {}
     app.experiment_resources_ws_mangers = {}
-    app.job_logs_consumers = {}
-    app.experiment_logs_consumers = {}
+    app.logs_broker = LogsBroker(loop=loop)
+    app.logs_broker.run()
 
 
 @app.listener('after_server_stop')
 async def notify_server_stopped(app, loop):  # pylint:disable=redefined-outer-name
     app.job_resources_ws_mangers = {}
     app.experiment_resources_ws_manger = {}
-
-    consumer_keys = list(app.job_logs_consumers.keys())
-    for consumer_key in consumer_keys:
-        consumer = app.job_logs_consumers.pop(consumer_key, None)
-        consumer.stop()
-
-    consumer_keys = list(app.experiment_logs_consumers.keys())
-    for consumer_key in consumer_keys:
-        consumer = app.experiment_logs_consumers.pop(consumer_key, None)
-        consumer.stop()
+    app.logs_broker.stop()
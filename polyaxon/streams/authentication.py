@@ -3,6 +3,8 @@ from functools import wraps
 from rest_framework.authentication import TokenAuthentication
 from sanic.response import json
 
+from streams.executor import run_sync
+
 
 class SanicTokenAuthentication(TokenAuthentication):
     AUTHORIZATION_HEADER = 'Authorization'
@@ -32,7 +34,7 @@ def authorized():
     def decorator(f):
         @wraps(f)
         async def decorated_function(request, *args, **kwargs):
-            authorization = SanicTokenAuthentication().authenticate(request)
+            authorization = await run_sync(SanicTokenAuthentication().authenticate, request)
 
             if authorization is not None:
                 # the user is authorized.
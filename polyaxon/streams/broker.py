@@ -0,0 +1,165 @@
+import asyncio
+import json
+import logging
+import uuid
+
+from polyaxon.settings import CeleryQueues, RoutingKeys
+from streams.constants import SUBSCRIPTION_QUEUE_SIZE
+from streams.consumers import Consumer
+
+_logger = logging.getLogger("polyaxon.streams.broker")
+
+
+def get_topic(*parts):
+    return '.'.join(parts)
+
+
+class Subscription(object):
+    """A subscription holds the messages routed to one websocket for a given topic.
+
+    The topic is a routing key prefix, e.g. subscribing to
+    `stream_logs.sidecars.experiments.<xp_uuid>` receives the logs of all jobs of the experiment.
+
+    The status topic is optional, if provided the subscription receives the status changes
+    of the subscribed object, and keeps track of the latest one.
+    """
+
+    def __init__(self, topic, status_topic=None, maxsize=SUBSCRIPTION_QUEUE_SIZE, loop=None):
+        self.topic = topic
+        self.status_topic = status_topic
+        self.status = None
+        self.queue = asyncio.Queue(maxsize=maxsize, loop=loop)
+
+    def put(self, message):
+        if self.queue.full():
+            # Drop the oldest message, a slow socket should not hold the broker back
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    def set_status(self, status, message):
+        self.status = status
+        self.put(message)
+
+    def get_messages(self):
+        messages = []
+        while not self.queue.empty():
+            messages.append(self.queue.get_nowait())
+        return messages
+
+    async def wait_messages(self, timeout):
+        """Waits until at least one message is available, and returns all pending messages."""
+        try:
+            message = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+        return [message] + self.get_messages()
+
+
+class LogsBroker(Consumer):
+    """A single multiplexed consumer per streams worker.
+
+    The broker binds one exclusive queue with wildcard routing keys,
+    and dispatches every message it receives to the subscriptions matching its routing key.
+    """
+
+    ROUTING_KEYS = (
+        RoutingKeys.STREAM_LOGS_SIDECARS_EXPERIMENTS + '.#',
+        RoutingKeys.STREAM_LOGS_SIDECARS_JOBS + '.#',
+        RoutingKeys.STREAM_LOGS_SIDECARS_BUILDS + '.#',
+        RoutingKeys.STREAM_STATUSES_EXPERIMENTS + '.*',
+        RoutingKeys.STREAM_STATUSES_JOBS + '.*',
+        RoutingKeys.STREAM_STATUSES_BUILDS + '.*',
+    )
+    STATUSES_ROUTING_KEYS = (
+        RoutingKeys.STREAM_STATUSES_EXPERIMENTS,
+        RoutingKeys.STREAM_STATUSES_JOBS,
+        RoutingKeys.STREAM_STATUSES_BUILDS,
+    )
+
+    def __init__(self, routing_keys=None, loop=None):
+        self._routing_keys = list(routing_keys or self.ROUTING_KEYS)
+        self._pending_routing_keys = []
+        self._subscriptions = {}
+        self._status_subscriptions = {}
+        super().__init__(routing_key=None,
+                         queue='{}.{}'.format(CeleryQueues.STREAM_LOGS_SIDECARS, uuid.uuid4().hex),
+                         loop=loop)
+
+    def subscribe(self, topic, status_topic=None):
+        subscription = Subscription(topic=topic, status_topic=status_topic, loop=self._loop)
+        self._subscriptions.setdefault(topic, set()).add(subscription)
+        if status_topic:
+            self._status_subscriptions.setdefault(status_topic, set()).add(subscription)
+        return subscription
+
+    @staticmethod
+    def _remove_subscription(subscriptions, topic, subscription):
+        topic_subscriptions = subscriptions.get(topic)
+        if topic_subscriptions is None:
+            return
+        topic_subscriptions.discard(subscription)
+        if not topic_subscriptions:
+            subscriptions.pop(topic, None)
+
+    def unsubscribe(self, subscription):
+        self._remove_subscription(subscriptions=self._subscriptions,
+                                  topic=subscription.topic,
+                                  subscription=subscription)
+        if subscription.status_topic:
+            self._remove_subscription(subscriptions=self._status_subscriptions,
+                                      topic=subscription.status_topic,
+                                      subscription=subscription)
+
+    def has_subscriptions(self, topic):
+        return bool(self._subscriptions.get(topic))
+
+    def dispatch(self, routing_key, message):
+        """Puts the message in the queue of every subscription matching a prefix of the key."""
+        parts = routing_key.split('.')
+        for i in range(len(parts), 0, -1):
+            for subscription in self._subscriptions.get(get_topic(*parts[:i]), ()):
+                subscription.put(message)
+
+    def dispatch_status(self, routing_key, message):
+        subscriptions = self._status_subscriptions.get(routing_key)
+        if not subscriptions:
+            return
+        status = json.loads(message.decode('utf-8')).get('status')
+        for subscription in subscriptions:
+            subscription.set_status(status=status, message=message)
+
+    def is_status_routing_key(self, routing_key):
+        return routing_key.rsplit('.', 1)[0] in self.STATUSES_ROUTING_KEYS
+
+    def setup_queue(self, queue_name):
+        """The queue is specific to this worker, it's removed once the worker disconnects."""
+        _logger.debug('Declaring queue %s', queue_name)
+        self._channel.queue_declare(self.on_queue_declareok,
+                                    queue_name,
+                                    exclusive=True,
+                                    auto_delete=True)
+
+    def on_queue_declareok(self, method_frame):
+        self._pending_routing_keys = self._routing_keys[:]
+        self.bind_next_routing_key(method_frame)
+
+    def bind_next_routing_key(self, unused_frame):
+        """Binds the routing keys one by one, and starts consuming once they are all bound."""
+        if not self._pending_routing_keys:
+            self.on_bindok(unused_frame)
+            return
+
+        routing_key = self._pending_routing_keys.pop(0)
+        _logger.info('Binding %s to %s with %s', self.EXCHANGE, self._queue, routing_key)
+        self._channel.queue_bind(self.bind_next_routing_key, self._queue,
+                                 self.EXCHANGE, routing_key)
+
+    def on_message(self, unused_channel, basic_deliver, properties, body):
+        _logger.debug('Received message # %s from %s with %s',
+                      basic_deliver.delivery_tag, properties.app_id, basic_deliver.routing_key)
+        if body:
+            if self.is_status_routing_key(basic_deliver.routing_key):
+                self.dispatch_status(routing_key=basic_deliver.routing_key, message=body)
+            else:
+                self.dispatch(routing_key=basic_deliver.routing_key, message=body)
+        self.acknowledge_message(basic_deliver.delivery_tag)
@@ -2,3 +2,5 @@ SOCKET_SLEEP = 2
 MAX_RETRIES = 7
 RESOURCES_CHECK = 7
 CHECK_DELAY = 5
+SUBSCRIPTION_QUEUE_SIZE = 1000
+DB_EXECUTOR_MAX_WORKERS = 8
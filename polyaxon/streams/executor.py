@@ -0,0 +1,31 @@
+import asyncio
+import functools
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+from streams.constants import DB_EXECUTOR_MAX_WORKERS
+
+_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_MAX_WORKERS)
+
+
+def _run_with_connection(func, *args, **kwargs):
+    # The db connections are bound to the executor's threads,
+    # we make sure that stale/broken connections are not reused.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_sync(func, *args, **kwargs):
+    """Runs a blocking function, e.g. an ORM call, in the bounded db executor.
+
+    The event loop keeps serving the other sockets while the database answers.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        _executor,
+        functools.partial(_run_with_connection, func, *args, **kwargs))
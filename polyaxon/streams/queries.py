@@ -0,0 +1,45 @@
+import auditor
+
+from db.models.build_jobs import BuildJob
+from db.models.experiment_jobs import ExperimentJob
+from db.models.experiments import Experiment
+from db.models.jobs import Job
+from streams.executor import run_sync
+
+
+def _get_status(model, object_id):
+    return model.objects.filter(id=object_id).values_list('status__status', flat=True).first()
+
+
+def _get_experiment_jobs(experiment_id):
+    jobs = []
+    query = ExperimentJob.objects.filter(experiment_id=experiment_id).values('uuid', 'role', 'id')
+    for job in query:
+        job['uuid'] = job['uuid'].hex
+        job['name'] = '{}.{}'.format(job.pop('role'), job.pop('id'))
+        jobs.append(job)
+    return jobs
+
+
+async def get_experiment_status(experiment_id):
+    return await run_sync(_get_status, Experiment, experiment_id)
+
+
+async def get_experiment_job_status(job_id):
+    return await run_sync(_get_status, ExperimentJob, job_id)
+
+
+async def get_job_status(job_id):
+    return await run_sync(_get_status, Job, job_id)
+
+
+async def get_build_job_status(build_id):
+    return await run_sync(_get_status, BuildJob, build_id)
+
+
+async def get_experiment_jobs(experiment_id):
+    return await run_sync(_get_experiment_jobs, experiment_id)
+
+
+async def record_event(**kwargs):
+    await run_sync(auditor.record, **kwargs)
@@ -1,16 +1,14 @@
-import asyncio
-
-import auditor
-
 from constants.jobs import JobLifeCycle
 from db.redis.to_stream import RedisToStream
 from event_manager.events.build_job import BUILD_JOB_LOGS_VIEWED
-from polyaxon.settings import CeleryQueues, RoutingKeys
+from polyaxon.settings import RoutingKeys
 from streams.authentication import authorized
+from streams.broker import get_topic
 from streams.constants import CHECK_DELAY, MAX_RETRIES, SOCKET_SLEEP
-from streams.consumers import Consumer
+from streams.executor import run_sync
 from streams.logger import logger
-from streams.resources.utils import get_error_message, get_status_message, notify
+from streams.queries import get_build_job_status, record_event
+from streams.resources.utils import get_error_message, get_status_message, send_messages
 from streams.validation.build import validate_build
 
 
@@ -20,7 +18,8 @@ async def build_logs(request,  # pylint:disable=too-many-branches
                      username,
                      project_name,
                      build_id):
-    job, message = validate_build(request=request,
+    job, message = await run_sync(validate_build,
+                                  request=request,
                                   username=username,
                                   project_name=project_name,
                                   build_id=build_id)
@@ -30,83 +29,61 @@ async def build_logs(request,  # pylint:disable=too-many-branches
 
     job_uuid = job.uuid.hex
 
-    auditor.record(event_type=BUILD_JOB_LOGS_VIEWED,
-                   instance=job,
-                   actor_id=request.app.user.id,
-                   actor_name=request.app.user.username)
+    await record_event(event_type=BUILD_JOB_LOGS_VIEWED,
+                       instance=job,
+                       actor_id=request.app.user.id,
+                       actor_name=request.app.user.username)
 
     if not RedisToStream.is_monitored_job_logs(job_uuid=job_uuid):
         logger.info('Job uuid `%s` logs is now being monitored', job_uuid)
         RedisToStream.monitor_job_logs(job_uuid=job_uuid)
 
-    # start consumer
-    if job_uuid in request.app.job_logs_consumers:
-        consumer = request.app.job_logs_consumers[job_uuid]
-    else:
-        logger.info('Add job log consumer for %s', job_uuid)
-        consumer = Consumer(
-            routing_key='{}.{}'.format(RoutingKeys.STREAM_LOGS_SIDECARS_BUILDS, job_uuid),
-            queue='{}.{}'.format(CeleryQueues.STREAM_LOGS_SIDECARS, job_uuid))
-        request.app.job_logs_consumers[job_uuid] = consumer
-        consumer.run()
+    topic = get_topic(RoutingKeys.STREAM_LOGS_SIDECARS_BUILDS, job_uuid)
+    subscription = request.app.logs_broker.subscribe(
+        topic=topic,
+        status_topic=get_topic(RoutingKeys.STREAM_STATUSES_BUILDS, job_uuid))
 
-    def should_disconnect():
-        if not consumer.ws:
+    def unsubscribe():
+        request.app.logs_broker.unsubscribe(subscription)
+        if not request.app.logs_broker.has_subscriptions(topic):
             logger.info('Stopping logs monitor for job uuid %s', job_uuid)
             RedisToStream.remove_job_logs(job_uuid=job_uuid)
-            # if job_uuid in request.app.job_logs_consumers:
-            #     consumer = request.app.job_logs_consumers.pop(job_uuid, None)
-            #     if consumer:
-            #         consumer.stop()
-            return True
-        return False
 
-    # add socket manager
-    consumer.add_socket(ws)
-    should_quite = False
-    num_message_retries = 0
+    try:
+        # The subscription is already receiving status changes,
+        # we only need to get the current status once.
+        status = await get_build_job_status(build_id=job.id)
+        if not await send_messages(ws=ws, messages=[get_status_message(status)]):
+            return
+        if JobLifeCycle.is_done(status):
+            return
 
-    # Stream phase changes
-    status = None
-    while status != JobLifeCycle.RUNNING and not JobLifeCycle.is_done(status):
-        job.refresh_from_db()
-        if status != job.last_status:
-            status = job.last_status
-            await notify(consumer=consumer, message=get_status_message(status))
-            if should_disconnect():
+        num_message_retries = 0
+        while True:
+            num_message_retries += 1
+            messages = await subscription.wait_messages(timeout=SOCKET_SLEEP)
+            if messages:
+                num_message_retries = 0
+                if not await send_messages(ws=ws, messages=messages):
+                    return
+
+            if JobLifeCycle.is_done(subscription.status):
+                logger.info('Quitting logs socket because the job `%s` is done', job_uuid)
                 return
-        await asyncio.sleep(SOCKET_SLEEP)
-
-    if JobLifeCycle.is_done(status):
-        await notify(consumer=consumer, message=get_status_message(status))
-        RedisToStream.remove_job_logs(job_uuid=job_uuid)
-        return
 
-    while True:
-        num_message_retries += 1
-        for message in consumer.get_messages():
-            num_message_retries = 0
-            await notify(consumer=consumer, message=message)
-
-        # After trying a couple of time, we must check the status of the experiment
-        if num_message_retries > MAX_RETRIES:
-            job.refresh_from_db()
-            if job.is_done:
-                logger.info('removing all socket because the job `%s` is done', job_uuid)
-                consumer.ws = set([])
-            else:
+            # After trying a couple of time, we must check the status of the job,
+            # in case a status change was not streamed
+            if num_message_retries > MAX_RETRIES:
+                status = await get_build_job_status(build_id=job.id)
+                if JobLifeCycle.is_done(status):
+                    logger.info('Quitting logs socket because the job `%s` is done', job_uuid)
+                    await send_messages(ws=ws, messages=[get_status_message(status)])
+                    return
                 num_message_retries -= CHECK_DELAY
 
-        # Just to check if connection closed
-        if ws._connection_lost:  # pylint:disable=protected-access
-            logger.info('Quitting logs socket for job uuid %s', job_uuid)
-            consumer.remove_sockets({ws, })
-            should_quite = True
-
-        if should_disconnect():
-            should_quite = True
-
-        if should_quite:
-            return
-
-        await asyncio.sleep(SOCKET_SLEEP)
+            # Just to check if connection closed
+            if ws._connection_lost:  # pylint:disable=protected-access
+                logger.info('Quitting logs socket for job uuid %s', job_uuid)
+                return
+    finally:
+        unsubscribe()
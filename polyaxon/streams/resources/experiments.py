@@ -1,36 +1,40 @@
 import asyncio
 
-from websockets import ConnectionClosed
-
-import auditor
-
 from constants.experiments import ExperimentLifeCycle
 from db.redis.to_stream import RedisToStream
 from event_manager.events.experiment import EXPERIMENT_LOGS_VIEWED, EXPERIMENT_RESOURCES_VIEWED
-from polyaxon.settings import CeleryQueues, RoutingKeys
+from polyaxon.settings import RoutingKeys
 from streams.authentication import authorized
-from streams.constants import CHECK_DELAY, MAX_RETRIES, RESOURCES_CHECK, SOCKET_SLEEP
-from streams.consumers import Consumer
+from streams.broker import get_topic
+from streams.constants import CHECK_DELAY, MAX_RETRIES, SOCKET_SLEEP
+from streams.executor import run_sync
 from streams.logger import logger
-from streams.resources.utils import get_error_message, get_status_message, notify
-from streams.socket_manager import SocketManager
+from streams.queries import get_experiment_jobs, get_experiment_status, record_event
+from streams.resources.utils import (
+    broadcast_resources,
+    get_error_message,
+    get_status_message,
+    send_messages
+)
+from streams.socket_manager import BroadcastSocketManager
 from streams.validation.experiment import validate_experiment
 
 
 @authorized()
 async def experiment_resources(request, ws, username, project_name, experiment_id):
-    experiment, message = validate_experiment(request=request,
-                                              username=username,
-                                              project_name=project_name,
-                                              experiment_id=experiment_id)
+    experiment, message = await run_sync(validate_experiment,
+                                         request=request,
+                                         username=username,
+                                         project_name=project_name,
+                                         experiment_id=experiment_id)
     if experiment is None:
         await ws.send(get_error_message(message))
         return
     experiment_uuid = experiment.uuid.hex
-    auditor.record(event_type=EXPERIMENT_RESOURCES_VIEWED,
-                   instance=experiment,
-                   actor_id=request.app.user.id,
-                   actor_name=request.app.user.username)
+    await record_event(event_type=EXPERIMENT_RESOURCES_VIEWED,
+                       instance=experiment,
+                       actor_id=request.app.user.id,
+                       actor_name=request.app.user.username)
 
     if not RedisToStream.is_monitored_experiment_resources(experiment_uuid=experiment_uuid):
         logger.info('Experiment resource with uuid `%s` is now being monitored', experiment_uuid)
@@ -39,7 +43,7 @@ async def experiment_resources(request, ws, username, project_name, experiment_i
     if experiment_uuid in request.app.experiment_resources_ws_mangers:
         ws_manager = request.app.experiment_resources_ws_mangers[experiment_uuid]
     else:
-        ws_manager = SocketManager()
+        ws_manager = BroadcastSocketManager()
         request.app.experiment_resources_ws_mangers[experiment_uuid] = ws_manager
 
     def handle_experiment_disconnected_ws(ws):
@@ -51,42 +55,26 @@ async def experiment_resources(request, ws, username, project_name, experiment_i
 
         logger.info('Quitting resources socket for uuid %s', experiment_uuid)
 
-    jobs = []
-    for job in experiment.jobs.values('uuid', 'role', 'id'):
-        job['uuid'] = job['uuid'].hex
-        job['name'] = '{}.{}'.format(job.pop('role'), job.pop('id'))
-        jobs.append(job)
-    ws_manager.add_socket(ws)
-    should_check = 0
-    while True:
-        resources = RedisToStream.get_latest_experiment_resources(jobs)
-        should_check += 1
-
-        # After trying a couple of time, we must check the status of the experiment
-        if should_check > RESOURCES_CHECK:
-            experiment.refresh_from_db()
-            if experiment.is_done:
-                logger.info(
-                    'removing all socket because the experiment `%s` is done', experiment_uuid)
-                ws_manager.ws = set([])
-                handle_experiment_disconnected_ws(ws)
-                return
-            else:
-                should_check -= CHECK_DELAY
-
-        if resources:
-            try:
-                await ws.send(resources)
-            except ConnectionClosed:
-                handle_experiment_disconnected_ws(ws)
-                return
-
-        # Just to check if connection closed
-        if ws._connection_lost:  # pylint:disable=protected-access
-            handle_experiment_disconnected_ws(ws)
-            return
+    async def is_done():
+        status = await get_experiment_status(experiment_id=experiment.id)
+        if ExperimentLifeCycle.is_done(status):
+            logger.info(
+                'removing all socket because the experiment `%s` is done', experiment_uuid)
+            return True
+        return False
 
+    ws_manager.add_socket(ws)
+    if not ws_manager.is_running:
+        # The resources are fetched once per tick for all sockets of this experiment
+        jobs = await get_experiment_jobs(experiment_id=experiment.id)
+        ws_manager.start(broadcast_resources,
+                         get_resources=lambda: RedisToStream.get_latest_experiment_resources(jobs),
+                         is_done=is_done)
+
+    # Keep the socket open while the broadcast task is streaming the resources
+    while ws in ws_manager.ws and not ws._connection_lost:  # pylint:disable=protected-access
         await asyncio.sleep(SOCKET_SLEEP)
+    handle_experiment_disconnected_ws(ws)
 
 
 @authorized()
@@ -95,95 +83,74 @@ async def experiment_logs(request,  # pylint:disable=too-many-branches
                           username,
                           project_name,
                           experiment_id):
-    experiment, message = validate_experiment(request=request,
-                                              username=username,
-                                              project_name=project_name,
-                                              experiment_id=experiment_id)
+    experiment, message = await run_sync(validate_experiment,
+                                         request=request,
+                                         username=username,
+                                         project_name=project_name,
+                                         experiment_id=experiment_id)
     if experiment is None:
         await ws.send(get_error_message(message))
         return
 
     experiment_uuid = experiment.uuid.hex
 
-    auditor.record(event_type=EXPERIMENT_LOGS_VIEWED,
-                   instance=experiment,
-                   actor_id=request.app.user.id,
-                   actor_name=request.app.user.username)
+    await record_event(event_type=EXPERIMENT_LOGS_VIEWED,
+                       instance=experiment,
+                       actor_id=request.app.user.id,
+                       actor_name=request.app.user.username)
 
     if not RedisToStream.is_monitored_experiment_logs(experiment_uuid=experiment_uuid):
         logger.info('Experiment uuid `%s` logs is now being monitored', experiment_uuid)
         RedisToStream.monitor_experiment_logs(experiment_uuid=experiment_uuid)
 
-    # start consumer
-    if experiment_uuid in request.app.experiment_logs_consumers:
-        consumer = request.app.experiment_logs_consumers[experiment_uuid]
-    else:
-        logger.info('Add experiment log consumer for %s', experiment_uuid)
-        consumer = Consumer(
-            routing_key='{}.{}.*'.format(RoutingKeys.STREAM_LOGS_SIDECARS_EXPERIMENTS,
-                                         experiment_uuid),
-            queue='{}.{}'.format(CeleryQueues.STREAM_LOGS_SIDECARS, experiment_uuid))
-        request.app.experiment_logs_consumers[experiment_uuid] = consumer
-        consumer.run()
-
-    def should_disconnect():
-        if not consumer.ws:
+    topic = get_topic(RoutingKeys.STREAM_LOGS_SIDECARS_EXPERIMENTS, experiment_uuid)
+    subscription = request.app.logs_broker.subscribe(
+        topic=topic,
+        status_topic=get_topic(RoutingKeys.STREAM_STATUSES_EXPERIMENTS, experiment_uuid))
+
+    def unsubscribe():
+        request.app.logs_broker.unsubscribe(subscription)
+        if not request.app.logs_broker.has_subscriptions(topic):
             logger.info('Stopping logs monitor for experiment uuid %s', experiment_uuid)
             RedisToStream.remove_experiment_logs(experiment_uuid=experiment_uuid)
-            # if experiment_uuid in request.app.experiment_logs_consumers:
-            #     consumer = request.app.experiment_logs_consumers.pop(experiment_uuid, None)
-            #     if consumer:
-            #         consumer.stop()
-            return True
-        return False
 
-    # add socket manager
-    consumer.add_socket(ws)
-    should_quite = False
-    num_message_retries = 0
-
-    # Stream phase changes
-    status = None
-    while status != ExperimentLifeCycle.RUNNING and not ExperimentLifeCycle.is_done(status):
-        experiment.refresh_from_db()
-        if status != experiment.last_status:
-            status = experiment.last_status
-            await notify(consumer=consumer, message=get_status_message(status))
-            if should_disconnect():
-                return
-        await asyncio.sleep(SOCKET_SLEEP)
+    try:
+        # The subscription is already receiving status changes,
+        # we only need to get the current status once.
+        status = await get_experiment_status(experiment_id=experiment.id)
+        if not await send_messages(ws=ws, messages=[get_status_message(status)]):
+            return
+        if ExperimentLifeCycle.is_done(status):
+            return
 
-    if ExperimentLifeCycle.is_done(status):
-        await notify(consumer=consumer, message=get_status_message(status))
-        RedisToStream.remove_experiment_logs(experiment_uuid=experiment_uuid)
-        return
+        num_message_retries = 0
+        while True:
+            num_message_retries += 1
+            messages = await subscription.wait_messages(timeout=SOCKET_SLEEP)
+            if messages:
+                num_message_retries = 0
+                if not await send_messages(ws=ws, messages=messages):
+                    return
+
+            if ExperimentLifeCycle.is_done(subscription.status):
+                logger.info('Quitting logs socket because the experiment `%s` is done',
+                            experiment_uuid)
+                return
 
-    while True:
-        num_message_retries += 1
-        for message in consumer.get_messages():
-            num_message_retries = 0
-            await notify(consumer=consumer, message=message)
-
-        # After trying a couple of time, we must check the status of the experiment
-        if num_message_retries > MAX_RETRIES:
-            experiment.refresh_from_db()
-            if experiment.is_done:
-                logger.info(
-                    'removing all socket because the experiment `%s` is done', experiment_uuid)
-                consumer.ws = set([])
-            else:
+            # After trying a couple of time, we must check the status of the experiment,
+            # in case a status change was not streamed
+            if num_message_retries > MAX_RETRIES:
+                status = await get_experiment_status(experiment_id=experiment.id)
+                if ExperimentLifeCycle.is_done(status):
+                    logger.info('Quitting logs socket because the experiment `%s` is done',
+                                experiment_uuid)
+                    await send_messages(ws=ws, messages=[get_status_message(status)])
+                    return
                 num_message_retries -= CHECK_DELAY
 
-        # Just to check if connection closed
-        if ws._connection_lost:  # pylint:disable=protected-access
-            logger.info('Quitting logs socket for experiment uuid %s', experiment_uuid)
-            consumer.remove_sockets({ws, })
-            should_quite = True
-
-        if should_disconnect():
-            should_quite = True
-
-        if should_quite:
-            return
-
-        await asyncio.sleep(SOCKET_SLEEP)
+            # Just to check if connection closed
+            if ws._connection_lost:  # pylint:disable=protected-access
+                logger.info('Quitting logs socket for experiment uuid %s', experiment_uuid)
+                return
+    finally:
+        unsubscribe()
@@ -1,7 +1,10 @@
+import asyncio
 import json
 
 from websockets import ConnectionClosed
 
+from streams.constants import CHECK_DELAY, RESOURCES_CHECK, SOCKET_SLEEP
+
 
 def get_error_message(message):
     return json.dumps({'status': 'error', 'log_lines': [message]})
@@ -19,3 +22,40 @@ async def notify(consumer, message):
         except ConnectionClosed:
             disconnected_ws.add(_ws)
     consumer.remove_sockets(disconnected_ws)
+
+
+async def send_messages(ws, messages):
+    """Sends the messages to the socket, returns False if the connection is closed."""
+    try:
+        for message in messages:
+            await ws.send(message)
+    except ConnectionClosed:
+        return False
+    return True
+
+
+async def broadcast_resources(ws_manager, get_resources, is_done):
+    """Computes the resources once per tick and sends the same snapshot to all sockets.
+
+    The loop stops when the manager has no more sockets or when `is_done` returns True.
+    """
+    should_check = 0
+    while ws_manager.ws:
+        # Remove sockets that lost their connection
+        ws_manager.remove_sockets({
+            _ws for _ws in ws_manager.ws if _ws._connection_lost  # pylint:disable=protected-access
+        })
+
+        should_check += 1
+        # After trying a couple of time, we must check the status of the object
+        if should_check > RESOURCES_CHECK:
+            if await is_done():
+                ws_manager.ws = set([])
+                return
+            should_check -= CHECK_DELAY
+
+        resources = get_resources()
+        if resources:
+            await notify(consumer=ws_manager, message=resources)
+
+        await asyncio.sleep(SOCKET_SLEEP)
@@ -1,3 +1,8 @@
+import asyncio
+
+from streams.logger import logger
+
+
 class SocketManager(object):
     def __init__(self):
         self.ws = set()
@@ -9,3 +14,36 @@ class SocketManager(object):
         if not isinstance(disconnected_ws, set):
             disconnected_ws = {disconnected_ws, }
         self.ws -= disconnected_ws
+
+
+class BroadcastSocketManager(SocketManager):
+    """A socket manager with a single task computing and sending the same message to all sockets."""
+
+    def __init__(self):
+        self.task = None
+        super().__init__()
+
+    @property
+    def is_running(self):
+        return self.task is not None and not self.task.done()
+
+    def start(self, func, *args, **kwargs):
+        """Starts the broadcast task, unless it's already running.
+
+        A task that returned, e.g. because the object is done, or failed,
+        is started again for the sockets that joined the manager since.
+        """
+        if not self.is_running:
+            self.task = asyncio.ensure_future(self._run(func, *args, **kwargs))
+
+    async def _run(self, func, *args, **kwargs):
+        try:
+            await func(self, *args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception('The broadcast task failed, closing its sockets.')
+            # The sockets handlers would otherwise wait for messages that never come
+            self.ws = set()
+        finally:
+            self.task = None
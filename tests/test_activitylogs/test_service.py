@@ -3,6 +3,7 @@ import pytest
 
 import activitylogs
 
+from activitylogs.manager import default_manager
 from db.models.activitylogs import ActivityLog
 from event_manager.events.experiment import EXPERIMENT_DELETED_TRIGGERED
 from event_manager.events.user import USER_ACTIVATED
@@ -46,3 +47,21 @@ class ActivityLogsTest(BaseTest):
         assert activity.event_type == EXPERIMENT_DELETED_TRIGGERED
         assert activity.content_object == self.experiment
         assert activity.actor == self.admin
+
+    def test_record_events_creates_activities_in_bulk(self):
+        events = [
+            default_manager.get(USER_ACTIVATED).from_instance(
+                self.user, actor_id=self.admin.id, actor_name=self.admin.username),
+            default_manager.get(EXPERIMENT_DELETED_TRIGGERED).from_instance(
+                self.experiment, actor_id=self.admin.id, actor_name=self.admin.username),
+        ]
+        events = [event.serialize(dumps=False, include_instance_info=True) for event in events]
+        events.append({'type': 'unknown'})
+
+        assert ActivityLog.objects.count() == 0
+        activitylogs.record_events(events)
+        assert ActivityLog.objects.count() == 2
+        assert [(activity.event_type, activity.content_object, activity.actor)
+                for activity in ActivityLog.objects.order_by('id')] == [
+            (USER_ACTIVATED, self.user, self.admin),
+            (EXPERIMENT_DELETED_TRIGGERED, self.experiment, self.admin)]
@@ -0,0 +1,37 @@
+# pylint:disable=ungrouped-imports
+
+from unittest.mock import patch
+
+import pytest
+
+from auditor.batch_auditor import BatchAuditorService
+from event_manager.events import user as user_events
+from factories.factory_users import UserFactory
+from polyaxon.settings import EventsCeleryTasks
+from tests.utils import BaseTest
+
+
+@pytest.mark.auditor_mark
+class BatchAuditorTest(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.auditor = BatchAuditorService()
+        self.auditor.setup()
+
+    @patch('polyaxon.celery_api.celery_app.send_task')
+    @patch('db.redis.auditor.RedisAuditor.push_event')
+    def test_record_buffers_the_events(self, push_event, send_task):
+        push_event.side_effect = [True, False]
+        self.auditor.record(event_type=user_events.USER_REGISTERED, instance=self.user)
+        self.auditor.record(event_type=user_events.USER_REGISTERED, instance=self.user)
+
+        assert push_event.call_count == 2
+        event = push_event.call_args[0][0]
+        assert event['type'] == user_events.USER_REGISTERED
+        assert event['instance_id'] == self.user.id
+        # A single drain is scheduled
+        assert send_task.call_count == 1
+        assert send_task.call_args[0][0] == EventsCeleryTasks.EVENTS_RECORD_BATCH
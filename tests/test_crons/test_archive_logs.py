@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from mock import patch
+
+from django.utils import timezone
+
+from crons.tasks.logs import archive_logs
+from db.models.build_jobs import BuildJob
+from db.models.experiments import Experiment
+from db.models.jobs import Job
+from factories.factory_build_jobs import BuildJobFactory
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_jobs import JobFactory
+from libs.logs_store import get_logs_store
+from libs.paths.experiments import create_experiment_logs_path, get_experiment_logs_path
+from polyaxon.settings import CleaningIntervals
+from scheduler.tasks.experiments import experiments_archive_logs
+from tests.utils import BaseTest
+
+
+@pytest.mark.crons_mark
+class TestArchiveLogsCrons(BaseTest):
+    DISABLE_RUNNER = True
+
+    def test_archive_logs(self):
+        finished_at = datetime.now(tz=timezone.utc) - timedelta(
+            minutes=CleaningIntervals.LOGS_ARCHIVE + 1)
+        experiment1 = ExperimentFactory()
+        experiment2 = ExperimentFactory()
+        Experiment.objects.filter(id=experiment1.id).update(finished_at=finished_at)
+        # Recently finished, its logs could still be written
+        Experiment.objects.filter(id=experiment2.id).update(
+            finished_at=datetime.now(tz=timezone.utc))
+        job = JobFactory()
+        Job.objects.filter(id=job.id).update(finished_at=finished_at)
+        build = BuildJobFactory()
+        BuildJob.objects.filter(id=build.id).update(finished_at=finished_at)
+        # Archived by previous passes
+        old_job = JobFactory()
+        Job.objects.filter(id=old_job.id).update(finished_at=finished_at - timedelta(days=1))
+
+        with patch('scheduler.tasks.experiments.experiments_archive_logs.apply_async') as mock_xp:
+            with patch('scheduler.tasks.jobs.jobs_archive_logs.apply_async') as mock_job:
+                archive_logs()
+
+        assert mock_xp.call_count == 1
+        assert mock_xp.call_args[0][1] == {'experiment_names': [experiment1.unique_name]}
+        assert mock_job.call_count == 1
+        assert mock_job.call_args[0][1] == {'job_names': [job.unique_name, build.unique_name]}
+
+    def test_experiments_archive_logs(self):
+        experiment = ExperimentFactory()
+        create_experiment_logs_path(experiment_name=experiment.unique_name)
+        log_path = get_experiment_logs_path(experiment.unique_name)
+        logs_store = get_logs_store(log_path)
+        logs_store.append('first line')
+        logs_store.append('second line')
+
+        experiments_archive_logs(experiment_names=[experiment.unique_name, 'user.project.1000'])
+
+        segments = logs_store.get_segments()
+        assert len(segments) == 1
+        assert logs_store.is_compressed(segments[0])
+        assert logs_store.tail(2) == ['first line', 'second line']
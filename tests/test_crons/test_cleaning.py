@@ -2,12 +2,20 @@ from datetime import timedelta
 
 import pytest
 
-from crons.tasks.cleaning import clean_activity_logs, clean_notifications
+from django.utils import timezone
+
+from crons.tasks.cleaning import (
+    clean_activity_logs,
+    clean_notifications,
+    clean_resources_metrics
+)
 from db.models.activitylogs import ActivityLog
 from db.models.notification import Notification, NotificationEvent
+from db.models.resources_metrics import ResourcesMetric, ResourcesMetricResolution
 from event_manager.events.experiment import EXPERIMENT_SUCCEEDED
-from factories.factory_experiments import ExperimentFactory
+from factories.factory_experiments import ExperimentFactory, ExperimentJobFactory
 from factories.factory_users import UserFactory
+from libs.resources_metrics import create_resources_metrics
 from polyaxon.config_settings import CleaningIntervals
 from tests.utils import BaseTest
 
@@ -80,3 +88,36 @@ class TestCleaningCrons(BaseTest):
         assert ActivityLog.objects.count() == actvity_logs_count + 1
         assert NotificationEvent.objects.count() == notification_events_counts + 1
         assert Notification.objects.count() == notifications_counts + 1
+
+    def test_clean_resources_metrics(self):
+        job = ExperimentJobFactory(experiment=self.experiment)
+        now = timezone.now()
+
+        def create_metrics(created_at, cpu_percentage):
+            create_resources_metrics(payloads=[{
+                'job_uuid': job.uuid.hex,
+                'cpu_percentage': cpu_percentage,
+                'n_cpus': 2,
+                'memory_used': 100,
+                'memory_limit': 1000,
+            }], timestamp=created_at.timestamp())
+
+        # Recent samples are kept as is
+        create_metrics(now, 0.5)
+        # Old samples are rolled up in one minute bucket
+        old_date = (now - timedelta(hours=CleaningIntervals.RESOURCES_METRICS_RAW + 1)).replace(
+            second=10)
+        create_metrics(old_date, 0.2)
+        create_metrics(old_date + timedelta(seconds=10), 0.4)
+        # Expired samples are removed
+        create_metrics(now - timedelta(days=CleaningIntervals.RESOURCES_METRICS + 1), 0.2)
+        assert ResourcesMetric.objects.count() == 4
+
+        clean_resources_metrics()
+
+        assert ResourcesMetric.objects.count() == 2
+        assert ResourcesMetric.objects.filter(resolution=ResourcesMetricResolution.RAW).count() == 1
+        rollup = ResourcesMetric.objects.get(resolution=ResourcesMetricResolution.MINUTE)
+        assert rollup.created_at == old_date.replace(second=0, microsecond=0)
+        assert rollup.cpu_percentage == pytest.approx(0.3)
+        assert rollup.cpu_percentage_max == 0.4
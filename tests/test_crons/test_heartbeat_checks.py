@@ -5,6 +5,7 @@ from mock import patch
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
 from crons.tasks.heartbeats import heartbeat_builds, heartbeat_experiments, heartbeat_jobs
+from db.redis.heartbeat import RedisHeartBeat
 from factories.factory_build_jobs import BuildJobFactory, BuildJobStatusFactory
 from factories.factory_experiments import ExperimentFactory, ExperimentStatusFactory
 from factories.factory_jobs import JobFactory, JobStatusFactory
@@ -25,11 +26,21 @@ class TestHeartBeatCrons(BaseTest):
         experiment4 = ExperimentFactory()
         ExperimentStatusFactory(experiment=experiment4, status=ExperimentLifeCycle.RUNNING)
 
+        RedisHeartBeat.experiment_ping(experiment_id=experiment4.id)
+
         with patch('scheduler.tasks.experiments'
-                   '.experiments_check_heartbeat.apply_async') as mock_fct:
+                   '.experiments_check_heartbeats.apply_async') as mock_fct:
             heartbeat_experiments()
 
-        assert mock_fct.call_count == 2
+        assert mock_fct.call_count == 1
+        assert mock_fct.call_args[0][1] == {'experiment_ids': [experiment1.id]}
+
+        RedisHeartBeat.experiment_ping(experiment_id=experiment1.id)
+        with patch('scheduler.tasks.experiments'
+                   '.experiments_check_heartbeats.apply_async') as mock_fct:
+            heartbeat_experiments()
+
+        assert mock_fct.call_count == 0
 
     def test_heartbeat_jobs(self):
         job1 = JobFactory()
@@ -41,10 +52,13 @@ class TestHeartBeatCrons(BaseTest):
         job4 = JobFactory()
         JobStatusFactory(job=job4, status=JobLifeCycle.RUNNING)
 
-        with patch('scheduler.tasks.jobs.jobs_check_heartbeat.apply_async') as mock_fct:
+        RedisHeartBeat.job_ping(job_id=job4.id)
+
+        with patch('scheduler.tasks.jobs.jobs_check_heartbeats.apply_async') as mock_fct:
             heartbeat_jobs()
 
-        assert mock_fct.call_count == 2
+        assert mock_fct.call_count == 1
+        assert mock_fct.call_args[0][1] == {'job_ids': [job1.id]}
 
     def test_heartbeat_builds(self):
         build1 = BuildJobFactory()
@@ -56,7 +70,11 @@ class TestHeartBeatCrons(BaseTest):
         build4 = BuildJobFactory()
         BuildJobStatusFactory(job=build4, status=JobLifeCycle.RUNNING)
 
-        with patch('scheduler.tasks.build_jobs.build_jobs_check_heartbeat.apply_async') as mock_fct:
+        RedisHeartBeat.build_ping(build_id=build4.id)
+
+        with patch('scheduler.tasks.build_jobs'
+                   '.build_jobs_check_heartbeats.apply_async') as mock_fct:
             heartbeat_builds()
 
-        assert mock_fct.call_count == 2
+        assert mock_fct.call_count == 1
+        assert mock_fct.call_args[0][1] == {'build_job_ids': [build1.id]}
@@ -2,7 +2,13 @@ from unittest.mock import patch
 
 import pytest
 
-from events_handlers.tasks.record import events_log, events_notify, events_track
+from events_handlers.tasks.record import (
+    events_log,
+    events_notify,
+    events_record_batch,
+    events_track
+)
+from polyaxon.settings import EventsCeleryTasks
 from tests.utils import BaseTest
 
 
@@ -25,3 +31,48 @@ class BaseTestEventsHandling(BaseTest):
             events_track(None)
 
         self.assertEqual(mock_fct.call_count, 1)
+
+    def test_events_record_batch(self):
+        batches = [[{'type': 'foo'}, {'type': 'bar'}], [{'type': 'foo'}], []]
+        with patch('db.redis.auditor.RedisAuditor.release') as mock_release:
+            mock_release.return_value = False
+            with patch('db.redis.auditor.RedisAuditor.get_events') as mock_get:
+                mock_get.side_effect = batches
+                with patch('db.redis.auditor.RedisAuditor.remove_events') as mock_remove:
+                    with patch('auditor.notify_events') as mock_notify:
+                        with patch('auditor.log_events') as mock_log:
+                            with patch('auditor.track_events') as mock_track:
+                                with patch('polyaxon.celery_api.celery_app.send_task') as mock_send:
+                                    events_record_batch()
+
+        assert mock_release.call_count == 1
+        assert mock_get.call_count == 3
+        assert [args[0][0] for args in mock_remove.call_args_list] == [2, 1]
+        for mock_fct in [mock_notify, mock_log, mock_track]:
+            assert mock_fct.call_count == 2
+            assert mock_fct.call_args_list[0][0][0] == batches[0]
+        assert mock_send.call_count == 0
+
+    def test_events_record_batch_failing_consumer(self):
+        batches = [[{'type': 'foo'}, {'type': 'bar'}], []]
+        with patch('db.redis.auditor.RedisAuditor.release') as mock_release:
+            mock_release.return_value = True
+            with patch('db.redis.auditor.RedisAuditor.get_events') as mock_get:
+                mock_get.side_effect = batches
+                with patch('db.redis.auditor.RedisAuditor.remove_events') as mock_remove:
+                    with patch('auditor.notify_events') as mock_notify:
+                        with patch('auditor.log_events') as mock_log:
+                            mock_log.side_effect = ValueError
+                            with patch('auditor.track_events') as mock_track:
+                                with patch('polyaxon.celery_api.celery_app.send_task') as mock_send:
+                                    events_record_batch()
+
+        # The other consumers still handle the batch, which is removed once handled
+        assert mock_notify.call_count == 1
+        assert mock_track.call_count == 1
+        assert mock_remove.call_count == 1
+        # The failed batch is logged event by event, and a new drain is scheduled
+        assert [call[0][0] for call in mock_send.call_args_list] == [
+            EventsCeleryTasks.EVENTS_LOG,
+            EventsCeleryTasks.EVENTS_LOG,
+            EventsCeleryTasks.EVENTS_RECORD_BATCH]
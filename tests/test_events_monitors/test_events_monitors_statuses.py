@@ -16,6 +16,7 @@ from factories.factory_jobs import JobFactory
 from factories.factory_plugins import NotebookJobFactory, TensorboardJobFactory
 from factories.factory_projects import ProjectFactory
 from k8s_events_handlers.tasks.statuses import (
+    handle_experiment_jobs_statuses,
     k8s_events_handle_build_job_statuses,
     k8s_events_handle_experiment_job_statuses,
     k8s_events_handle_job_statuses,
@@ -164,3 +165,57 @@ class TestEventsDockerizerJobsStatusesHandling(TestEventsBaseJobsStatusesHandlin
 
 # Prevent this base class from running tests
 del TestEventsBaseJobsStatusesHandling
+
+
+@pytest.mark.monitors_mark
+class TestEventsExperimentJobsStatusesBatchHandling(BaseTest):
+    DISABLE_RUNNER = True
+
+    @staticmethod
+    def get_payload(event, job):
+        job_state = get_job_state(
+            event_type=event['type'],
+            event=event['object'],
+            job_container_names=(settings.CONTAINER_NAME_EXPERIMENT_JOB,),
+            experiment_type_label=settings.TYPE_LABELS_RUNNER)
+        payload = job_state.to_dict()
+        payload['details']['labels']['job_uuid'] = job.uuid.hex
+        return payload
+
+    def test_handle_experiment_jobs_statuses(self):
+        job1 = ExperimentJobFactory()
+        job2 = ExperimentJobFactory()
+        payloads = [
+            self.get_payload(status_experiment_job_event, job1),
+            self.get_payload(status_experiment_job_event_with_conditions, job1),
+            self.get_payload(status_experiment_job_event_with_conditions, job2),
+            # Not a valid transition for a done job
+            self.get_payload(status_experiment_job_event, job2),
+        ]
+        assert ExperimentJobStatus.objects.count() == 2
+
+        with patch('db.redis.statuses.RedisStatuses.mark_experiments') as mock_mark:
+            mock_mark.return_value = False
+            deferred = handle_experiment_jobs_statuses(payloads)
+
+        assert deferred == []
+        assert mock_mark.call_count == 1
+        assert mock_mark.call_args[1]['experiment_ids'] == {job1.experiment_id,
+                                                            job2.experiment_id}
+        statuses = ExperimentJobStatus.objects.filter(job=job1).values_list('status', flat=True)
+        assert list(statuses) == [JobLifeCycle.CREATED, JobLifeCycle.UNKNOWN, JobLifeCycle.FAILED]
+        statuses = ExperimentJobStatus.objects.filter(job=job2).values_list('status', flat=True)
+        assert list(statuses) == [JobLifeCycle.CREATED, JobLifeCycle.FAILED]
+
+        for job in [job1, job2]:
+            job.refresh_from_db()
+            assert job.last_status == JobLifeCycle.FAILED
+            assert job.status == ExperimentJobStatus.objects.filter(job=job).last()
+            assert job.finished_at is not None
+
+    def test_handle_experiment_jobs_statuses_ignores_missing_jobs(self):
+        job = ExperimentJobFactory()
+        payload = self.get_payload(status_experiment_job_event, job)
+        job.delete()
+        assert handle_experiment_jobs_statuses([payload]) == []
+        assert ExperimentJobStatus.objects.count() == 0
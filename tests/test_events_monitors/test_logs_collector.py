@@ -0,0 +1,213 @@
+import json
+import os
+import tempfile
+
+from unittest.mock import patch
+
+import pytest
+
+from django.conf import settings
+from django.test import override_settings
+
+from factories.factory_experiments import ExperimentJobFactory
+from monitor_resources.logs import ContainerLogFile, LogsCollector, parse_log_line
+from polyaxon.settings import LogsCeleryTasks
+from tests.utils import BaseTest
+
+
+def json_line(log):
+    return json.dumps({'log': log, 'stream': 'stdout', 'time': '2018-11-01T10:00:00Z'}) + '\n'
+
+
+@pytest.mark.monitors_mark
+class TestLogsCollector(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.containers_path = tempfile.mkdtemp()
+        self.checkpoint_path = os.path.join(tempfile.mkdtemp(), 'checkpoint.json')
+        self.job = ExperimentJobFactory()
+        self.container_id = 'container1'
+        os.makedirs(os.path.join(self.containers_path, self.container_id))
+        self.log_path = os.path.join(self.containers_path,
+                                     self.container_id,
+                                     '{}-json.log'.format(self.container_id))
+        self.settings = override_settings(LOGS_COLLECTOR_CONTAINERS_PATH=self.containers_path)
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+        super().tearDown()
+
+    def write(self, data):
+        with open(self.log_path, 'a') as f:
+            f.write(data)
+
+    def get_collector(self):
+        return LogsCollector(checkpoint_path=self.checkpoint_path, read_size=1024)
+
+    def run_collector(self, collector, containers_jobs=None):
+        if containers_jobs is None:
+            containers_jobs = {self.container_id: (self.job.uuid.hex,
+                                                   self.job.experiment.uuid.hex)}
+        with patch('db.redis.containers.RedisJobContainers.get_containers_jobs') as mock_jobs:
+            mock_jobs.return_value = containers_jobs
+            with patch('monitor_resources.logs.celery_app.send_task') as mock_send:
+                count = collector.run()
+        return count, mock_send
+
+    def test_parse_log_line(self):
+        assert parse_log_line(json_line('foo\n').strip().encode()) == ('foo', False)
+        assert parse_log_line(json_line('foo').strip().encode()) == ('foo', True)
+        assert parse_log_line(b'2018-11-01T10:00:00Z stdout F bar') == ('bar', False)
+        assert parse_log_line(b'2018-11-01T10:00:00Z stdout P bar') == ('bar', True)
+        assert parse_log_line(b'raw') == ('raw', False)
+
+    def read(self, log_file):
+        log_lines, log_file.offset = log_file.read(1024)
+        return log_lines
+
+    def test_log_file_reads_complete_lines(self):
+        self.write(json_line('line1\n') + json_line('line') + json_line('2\n') + '{"log": "li')
+        log_file = ContainerLogFile(container_id=self.container_id, path=self.log_path)
+        assert self.read(log_file) == ['line1', 'line2']
+        self.write('ne3\\n"}\n')
+        assert self.read(log_file) == ['line3']
+        assert self.read(log_file) == []
+
+        # The offset is only committed by the caller
+        self.write(json_line('line4\n'))
+        assert log_file.read(1024)[0] == ['line4']
+        assert log_file.read(1024)[0] == ['line4']
+
+        # Partial lines are read again until they are complete
+        log_file.offset = os.path.getsize(self.log_path)
+        self.write(json_line('line') + json_line('5'))
+        assert self.read(log_file) == []
+        self.write(json_line('\n'))
+        assert self.read(log_file) == ['line5']
+
+        # Truncated files are read from the start
+        open(self.log_path, 'w').close()
+        self.write(json_line('line6\n'))
+        assert self.read(log_file) == ['line6']
+
+    def test_run_sends_one_task_per_job(self):
+        collector = self.get_collector()
+        self.write(json_line('line1\n') + json_line('line2\n'))
+        count, mock_send = self.run_collector(collector)
+        assert count == 2
+        assert mock_send.call_count == 1
+        task_name = mock_send.call_args[0][0]
+        kwargs = mock_send.call_args[1]['kwargs']
+        assert task_name == LogsCeleryTasks.LOGS_SIDECARS_EXPERIMENTS
+        assert kwargs['experiment_uuid'] == self.job.experiment.uuid.hex
+        assert kwargs['experiment_name'] == self.job.experiment.unique_name
+        assert kwargs['job_uuid'] == self.job.uuid.hex
+        assert 'line1' in kwargs['log_lines'] and 'line2' in kwargs['log_lines']
+
+        # Nothing new
+        count, mock_send = self.run_collector(collector)
+        assert count == 0
+        assert mock_send.call_count == 0
+
+    def test_run_reads_the_lines_again_when_they_are_not_sent(self):
+        collector = self.get_collector()
+        self.write(json_line('line1\n'))
+        with patch('db.redis.containers.RedisJobContainers.get_containers_jobs') as mock_jobs:
+            mock_jobs.return_value = {self.container_id: (self.job.uuid.hex, None)}
+            with patch('monitor_resources.logs.celery_app.send_task') as mock_send:
+                mock_send.side_effect = OSError
+                assert collector.run() == 0
+
+        # Neither the offset in memory nor the checkpoint moved
+        count, mock_send = self.run_collector(self.get_collector())
+        assert count == 1
+        count, mock_send = self.run_collector(collector)
+        assert count == 1
+        assert 'line1' in mock_send.call_args[1]['kwargs']['log_lines']
+
+    def test_run_keeps_the_lines_of_jobs_not_found(self):
+        collector = self.get_collector()
+        self.write(json_line('line1\n'))
+        with patch('monitor_resources.logs.ExperimentJob.objects.filter') as mock_filter:
+            mock_filter.return_value.select_related.return_value = []
+            count, mock_send = self.run_collector(collector)
+        assert count == 0
+        assert mock_send.call_count == 0
+
+        count, mock_send = self.run_collector(collector)
+        assert count == 1
+        assert 'line1' in mock_send.call_args[1]['kwargs']['log_lines']
+
+    def test_run_resumes_from_checkpoint(self):
+        self.write(json_line('line1\n'))
+        self.run_collector(self.get_collector())
+        self.write(json_line('line2\n'))
+
+        count, mock_send = self.run_collector(self.get_collector())
+        assert count == 1
+        assert 'line1' not in mock_send.call_args[1]['kwargs']['log_lines']
+
+    def test_run_reads_stopped_containers_until_their_log_file_is_deleted(self):
+        collector = self.get_collector()
+        self.write(json_line('line1\n'))
+        self.run_collector(collector)
+        self.write(json_line('line2\n') + json_line('line3\n'))
+
+        collector.read_size = len(json_line('line2\n'))
+        count, _ = self.run_collector(collector, containers_jobs={})
+        assert count == 2
+        assert list(collector.files) == [self.container_id]
+
+        # The container is dropped once its pod and its log file are deleted
+        os.remove(self.log_path)
+        count, _ = self.run_collector(collector, containers_jobs={})
+        assert count == 0
+        assert collector.files == {}
+        assert collector.jobs == {}
+
+    def test_run_drains_containers_stopped_while_down(self):
+        self.write(json_line('line1\n'))
+        self.run_collector(self.get_collector())
+        self.write(json_line('line2\n'))
+
+        count, mock_send = self.run_collector(self.get_collector(), containers_jobs={})
+        assert count == 1
+        assert mock_send.call_args[1]['kwargs']['job_uuid'] == self.job.uuid.hex
+        assert 'line1' not in mock_send.call_args[1]['kwargs']['log_lines']
+
+    def write_config(self, container_name, env):
+        config_path = os.path.join(self.containers_path, self.container_id, 'config.v2.json')
+        with open(config_path, 'w') as f:
+            json.dump({'Config': {
+                'Labels': {'io.kubernetes.container.name': container_name},
+                'Env': ['{}={}'.format(key, value) for key, value in env.items()]}}, f)
+
+    def test_run_finds_the_job_of_containers_not_monitored(self):
+        self.write(json_line('line1\n'))
+        self.write_config(container_name=settings.CONTAINER_NAME_EXPERIMENT_JOB, env={
+            'POLYAXON_EXPERIMENT_INFO': json.dumps(
+                {'experiment_uuid': self.job.experiment.uuid.hex}),
+            'POLYAXON_TASK_INFO': json.dumps({'type': self.job.role, 'index': 0}),
+        })
+        count, mock_send = self.run_collector(self.get_collector(), containers_jobs={})
+        assert count == 1
+        assert mock_send.call_args[1]['kwargs']['job_uuid'] == self.job.uuid.hex
+
+    def test_run_ignores_other_containers(self):
+        self.write(json_line('line1\n'))
+        self.write_config(container_name='other', env={})
+        collector = self.get_collector()
+        count, mock_send = self.run_collector(collector, containers_jobs={})
+        assert count == 0
+        assert mock_send.call_count == 0
+        assert collector.ignored_containers == {self.container_id}
+
+    def test_run_ignores_containers_not_on_the_node(self):
+        collector = self.get_collector()
+        count, mock_send = self.run_collector(
+            collector, containers_jobs={'container2': (self.job.uuid.hex, None)})
+        assert count == 0
+        assert mock_send.call_count == 0
@@ -0,0 +1,123 @@
+import copy
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from monitor_statuses.monitor import PodsInformer, PodsQueue
+from tests.fixtures import status_experiment_job_event, status_experiment_job_event_with_conditions
+from tests.utils import BaseTest
+
+
+@pytest.mark.monitors_mark
+class TestPodsQueue(BaseTest):
+    DISABLE_RUNNER = True
+
+    def test_collapses_events_per_key(self):
+        queue = PodsQueue()
+        queue.put('pod1', 1)
+        queue.put('pod2', 1)
+        queue.put('pod1', 2)
+        assert len(queue) == 2
+        assert queue.get(timeout=0) == ('pod1', 2)
+        assert queue.get(timeout=0) == ('pod2', 1)
+        assert queue.get(timeout=0) == (None, None)
+
+    def test_key_processed_by_one_worker_at_a_time(self):
+        queue = PodsQueue()
+        queue.put('pod1', 1)
+        assert queue.get(timeout=0) == ('pod1', 1)
+        queue.put('pod1', 2)
+        queue.put('pod1', 3)
+        # pod1 is still processed
+        assert queue.get(timeout=0) == (None, None)
+        assert not queue.is_idle
+        queue.done('pod1')
+        assert queue.get(timeout=0) == ('pod1', 3)
+        queue.done('pod1')
+        assert queue.is_idle
+
+
+@pytest.mark.monitors_mark
+class TestPodsInformer(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.informer = PodsInformer(k8s_manager=MagicMock(),
+                                     workers=1,
+                                     watch_timeout=1,
+                                     checkpoint_interval=1,
+                                     batch_size=100)
+        self.informer._states = {}
+
+    def handle(self, event, event_type=None):
+        event = copy.deepcopy(event)
+        with patch('monitor_statuses.monitor.handle_job_state') as mock_handle:
+            with patch('db.redis.statuses.RedisStatuses.set_pod_state') as mock_set:
+                with patch('db.redis.statuses.RedisStatuses.remove_pod_states'):
+                    self.informer.handle(event['object']['metadata']['name'],
+                                         event_type or event['type'],
+                                         event['object'])
+        return mock_handle.call_count, mock_set.call_count
+
+    def test_handle_skips_already_handled_states(self):
+        assert self.handle(status_experiment_job_event) == (1, 1)
+        assert self.handle(status_experiment_job_event) == (0, 0)
+        assert self.handle(status_experiment_job_event, event_type='MODIFIED') == (0, 0)
+        assert self.handle(status_experiment_job_event_with_conditions) == (1, 1)
+        assert self.handle(status_experiment_job_event_with_conditions) == (0, 0)
+
+    def test_handle_deleted_pods_clears_their_state(self):
+        self.handle(status_experiment_job_event)
+        assert self.informer.states
+        self.handle(status_experiment_job_event_with_conditions, event_type='DELETED')
+        assert self.informer.states == {}
+
+    def test_checkpoint_waits_for_the_queue(self):
+        self.informer.queue.put('pod1', ('ADDED', {}))
+        self.informer.resource_version = '10'
+        with patch('db.redis.statuses.RedisStatuses.set_pods_resource_version') as mock_set:
+            self.informer.checkpoint(force=True)
+            assert mock_set.call_count == 0
+
+            key, _ = self.informer.queue.get(timeout=0)
+            self.informer.queue.done(key)
+            self.informer.checkpoint(force=True)
+            mock_set.assert_called_once_with('10')
+
+            self.informer.checkpoint(force=True)
+            assert mock_set.call_count == 1
+
+    def test_expired_resource_version_resets_the_watch(self):
+        self.informer.resource_version = '10'
+        with patch('monitor_statuses.monitor.watch.Watch') as mock_watch:
+            mock_watch.return_value.stream.return_value = [
+                {'type': 'ERROR', 'object': None, 'raw_object': {'code': 410}}]
+            with patch('db.redis.statuses.RedisStatuses.set_pods_resource_version') as mock_set:
+                with patch('monitor_statuses.monitor.settings') as mock_settings:
+                    mock_settings.STATUSES_MONITOR_WATCH_BOOKMARKS = False
+                    self.informer.watch('10')
+        mock_set.assert_called_once_with(None)
+        assert self.informer.resource_version is None
+
+    def test_failed_statuses_batch_is_kept_and_states_saved_once_sent(self):
+        self.informer.states['pod1'] = 'state1'
+        with patch('monitor_statuses.monitor.celery_app.send_task') as mock_send:
+            mock_send.side_effect = ConnectionError()
+            with patch('db.redis.statuses.RedisStatuses.set_pods_states') as mock_set:
+                self.informer.add_experiment_jobs_statuses(pod='pod1',
+                                                           state='state1',
+                                                           payloads=[{'status': 'running'}])
+                self.informer.checkpoint(force=True)
+        assert mock_send.call_count == 1
+        assert mock_set.call_count == 0
+        assert self.informer._experiment_jobs_statuses == [{'status': 'running'}]
+
+        with patch('monitor_statuses.monitor.celery_app.send_task') as mock_send:
+            with patch('db.redis.statuses.RedisStatuses.set_pods_states') as mock_set:
+                with patch('db.redis.statuses.RedisStatuses.set_pods_resource_version'):
+                    self.informer.checkpoint(force=True)
+        assert mock_send.call_args[1]['kwargs'] == {'payloads': [{'status': 'running'}]}
+        mock_set.assert_called_once_with({'pod1': 'state1'})
+        assert self.informer._experiment_jobs_statuses == []
@@ -170,7 +170,7 @@ class TestBOIterationManagers(BaseTest):
         ]
         assert iteration.data['experiments_metrics'] == experiment_iter1_metrics
 
-        # Creating a new iteration uses data from previous iteration
+        # Creating a new iteration does not copy the data of the previous iteration
         experiment_iter2_ids = [experiment.id for experiment in self.experiments_iter2]
         experiments_iter2_configs = [[experiment.id, experiment.declarations]
                                      for experiment in self.experiments_iter2]
@@ -181,9 +181,9 @@ class TestBOIterationManagers(BaseTest):
         assert self.experiment_group.current_iteration == 2
         assert iteration.data == {
             'iteration': 1,
-            'old_experiment_ids': experiment_iter1_ids,
-            'old_experiments_configs': experiments_iter1_configs,
-            'old_experiments_metrics': experiment_iter1_metrics,
+            'old_experiment_ids': None,
+            'old_experiments_configs': None,
+            'old_experiments_metrics': None,
             'experiment_ids': experiment_iter2_ids,
             'experiments_configs': experiments_iter2_configs,
             'experiments_metrics': None
@@ -201,7 +201,7 @@ class TestBOIterationManagers(BaseTest):
         ]
         assert iteration.data['experiments_metrics'] == experiment_iter2_metrics
 
-        # Creating a new iteration uses data from previous iteration
+        # Creating a new iteration does not copy the data of the previous iterations
         experiment_iter3_ids = [experiment.id for experiment in self.experiments_iter3]
         experiments_iter3_configs = [[experiment.id, experiment.declarations]
                                      for experiment in self.experiments_iter3]
@@ -212,14 +212,24 @@ class TestBOIterationManagers(BaseTest):
         assert self.experiment_group.current_iteration == 3
         assert iteration.data == {
             'iteration': 2,
-            'old_experiment_ids': experiment_iter1_ids + experiment_iter2_ids,
-            'old_experiments_configs': experiments_iter1_configs + experiments_iter2_configs,
-            'old_experiments_metrics': experiment_iter1_metrics + experiment_iter2_metrics,
+            'old_experiment_ids': None,
+            'old_experiments_configs': None,
+            'old_experiments_metrics': None,
             'experiment_ids': experiment_iter3_ids,
             'experiments_configs': experiments_iter3_configs,
             'experiments_metrics': None
         }
 
+        # The observations of the previous iterations are read from the experiments
+        iteration_config = self.iteration_manager.add_old_observations(
+            self.experiment_group.iteration_config)
+        assert iteration_config.old_experiment_ids == experiment_iter1_ids + experiment_iter2_ids
+        assert iteration_config.old_experiments_configs == (experiments_iter1_configs +
+                                                            experiments_iter2_configs)
+        assert iteration_config.old_experiments_metrics == (
+            [[experiment_id, 0.8] for experiment_id in experiment_iter1_ids] +
+            [[experiment_id, 0.9] for experiment_id in experiment_iter2_ids])
+
         # Update iteration
         for experiment_id in experiment_iter3_ids:
             ExperimentMetric.objects.create(
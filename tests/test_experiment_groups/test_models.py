@@ -300,6 +300,33 @@ class TestExperimentGroupModel(BaseTest):
         assert len(  # pylint:disable=len-as-condition
             [m for m in experiment_metrics if m[1] is not None]) == 0
 
+    @patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async')
+    def test_experiments_stats(self, _):
+        experiment_group = ExperimentGroupFactory()
+        for status in [ExperimentLifeCycle.CREATED,
+                       ExperimentLifeCycle.SCHEDULED,
+                       ExperimentLifeCycle.RUNNING,
+                       ExperimentLifeCycle.FAILED,
+                       ExperimentLifeCycle.SUCCEEDED,
+                       ExperimentLifeCycle.SUCCEEDED]:
+            ExperimentStatusFactory(experiment=ExperimentFactory(experiment_group=experiment_group),
+                                    status=status)
+        # Other group
+        ExperimentFactory()
+
+        experiment_group = ExperimentGroup.objects.get(id=experiment_group.id)
+        with self.assertNumQueries(1):
+            assert experiment_group.experiments_stats == {
+                'num_experiments': 6,
+                'num_pending_experiments': 1,
+                'num_running_experiments': 2,
+                'num_scheduled_experiments': 1,
+                'num_succeeded_experiments': 2,
+                'num_failed_experiments': 1,
+                'num_stopped_experiments': 0,
+            }
+            assert experiment_group.experiments_stats['num_experiments'] == 6
+
     @patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async')
     def test_managers(self, _):
         experiment_group = ExperimentGroupFactory(content=None, hptuning=None)
@@ -404,6 +431,19 @@ class TestExperimentGroupModel(BaseTest):
         assert experiment_group.running_experiments.count() == 0
         assert experiment_group.succeeded_experiments.count() == 1
 
+    def test_group_experiments_are_created_in_bulk(self):
+        with patch('hpsearch.tasks.grid.hp_grid_search_start.apply_async') as _:  # noqa
+            experiment_group = ExperimentGroupFactory()
+
+        experiments = Experiment.objects.filter(experiment_group=experiment_group)
+        assert experiments.count() == 2
+        assert len({tuple(experiment.declarations.items()) for experiment in experiments}) == 2
+        for experiment in experiments:
+            assert experiment.last_status == ExperimentLifeCycle.CREATED
+            assert experiment.statuses.count() == 1
+            assert experiment.declarations == experiment.specification.declarations
+            assert experiment.persistence is not None
+
     def test_experiment_group_deletion_triggers_stopping_for_running_experiment(self):
         with patch('hpsearch.tasks.grid.hp_grid_search_start.apply_async') as mock_fct:
             experiment_group = ExperimentGroupFactory()
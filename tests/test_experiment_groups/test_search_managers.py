@@ -6,6 +6,7 @@ from unittest.mock import patch
 import pytest
 
 from db.models.experiment_groups import ExperimentGroupIteration
+from db.redis.hpsearch import RedisHPSearchStates
 from factories.factory_experiment_groups import ExperimentGroupFactory
 from factories.fixtures import (
     experiment_group_spec_content_bo,
@@ -20,7 +21,7 @@ from hpsearch.search_managers import (
     RandomSearchManager,
     get_search_algorithm_manager
 )
-from hpsearch.search_managers.bayesian_optimization.optimizer import BOOptimizer
+from hpsearch.search_managers.bayesian_optimization.optimizer import BOOptimizer, BatchStrategies
 from hpsearch.search_managers.bayesian_optimization.space import SearchSpace
 from schemas.hptuning import HPTuningConfig, MatrixConfig
 from tests.utils import BaseTest
@@ -80,6 +81,21 @@ class TestGridSearchManager(BaseTest):
         manager = GridSearchManager(hptuning_config=hptuning_config)
         assert len(manager.get_suggestions()) == 10
 
+    def test_iter_suggestions(self):
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'grid_search': {'n_experiments': 5},
+            'matrix': {
+                'feature1': {'range': [0, 1000, 1]},
+                'feature2': {'range': [0, 1000, 1]},
+                'feature3': {'range': [0, 1000, 1]}
+            }
+        })
+        manager = GridSearchManager(hptuning_config=hptuning_config)
+        suggestions = manager.iter_suggestions()
+        assert next(suggestions) == {'feature1': 0, 'feature2': 0, 'feature3': 0}
+        assert len(list(suggestions)) == 4
+
     def test_get_suggestions_calls_to_numpy(self):
         hptuning_config = HPTuningConfig.from_dict({
             'concurrency': 2,
@@ -147,10 +163,10 @@ class TestRandomSearchManager(BaseTest):
         manager = RandomSearchManager(hptuning_config=hptuning_config)
         assert len(manager.get_suggestions()) == 10
 
-    def test_get_suggestions_calls_sample(self):
+    def test_get_suggestions_samples_every_dimension_once(self):
         hptuning_config = HPTuningConfig.from_dict({
             'concurrency': 2,
-            'random_search': {'n_experiments': 1},
+            'random_search': {'n_experiments': 10},
             'matrix': {
                 'feature1': {'values': [1, 2, 3]},
                 'feature2': {'linspace': [1, 2, 5]},
@@ -158,14 +174,17 @@ class TestRandomSearchManager(BaseTest):
             }
         })
         manager = RandomSearchManager(hptuning_config=hptuning_config)
-        with patch.object(MatrixConfig, 'sample') as sample_mock:
-            manager.get_suggestions()
+        with patch.object(MatrixConfig, 'sample', autospec=True,
+                          side_effect=MatrixConfig.sample) as sample_mock:
+            suggestions = manager.get_suggestions()
 
-        assert sample_mock.call_count == 3
+        # The discrete dimensions are sampled as indices of their values
+        assert sample_mock.call_count == 0
+        assert len({tuple(suggestion.items()) for suggestion in suggestions}) == 10
 
         hptuning_config = HPTuningConfig.from_dict({
             'concurrency': 2,
-            'random_search': {'n_experiments': 1},
+            'random_search': {'n_experiments': 10},
             'matrix': {
                 'feature1': {'pvalues': [(1, 0.3), (2, 0.3), (3, 0.3)]},
                 'feature2': {'uniform': [0, 1]},
@@ -174,10 +193,29 @@ class TestRandomSearchManager(BaseTest):
             }
         })
         manager = RandomSearchManager(hptuning_config=hptuning_config)
-        with patch.object(MatrixConfig, 'sample') as sample_mock:
-            manager.get_suggestions()
+        with patch.object(MatrixConfig, 'sample', autospec=True,
+                          side_effect=MatrixConfig.sample) as sample_mock:
+            suggestions = manager.get_suggestions()
 
-        assert sample_mock.call_count == 4
+        # The distributions are sampled once for all the suggestions
+        assert sample_mock.call_count == 3
+        assert len(suggestions) == 10
+
+    def test_get_suggestions_exhausts_discrete_space(self):
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'random_search': {'n_experiments': 100},
+            'seed': 1,
+            'matrix': {
+                'feature1': {'range': [0, 10, 1]},
+                'feature2': {'range': [0, 10, 1]}
+            }
+        })
+        manager = RandomSearchManager(hptuning_config=hptuning_config)
+        suggestions = manager.get_suggestions()
+        assert len(suggestions) == 100
+        assert len({tuple(suggestion.items()) for suggestion in suggestions}) == 100
+        assert suggestions == manager.get_suggestions()
 
 
 @pytest.mark.experiment_groups_mark
@@ -707,10 +745,57 @@ class TestBOSearchManager(BaseTest):
             'experiments_configs': [[4, {'feature1': 2, 'feature2': 1.5, 'feature3': 4}]],
             'experiments_metrics': [[4, 4]]
         })
-        with patch.object(BOOptimizer, 'get_suggestion') as get_suggestion_mock:
+        with patch.object(BOOptimizer, 'get_suggestions') as get_suggestions_mock:
             self.manager1.get_suggestions(iteration_config)
 
-        assert get_suggestion_mock.call_count == 1
+        assert get_suggestions_mock.call_count == 1
+        # One suggestion per concurrent experiment
+        assert get_suggestions_mock.call_args[1]['n_suggestions'] == 2
+        assert get_suggestions_mock.call_args[1]['pending_configs'] == []
+
+    def test_iteration_suggestions_fill_the_concurrency(self):
+        iteration_config = BOIterationConfig.from_dict({
+            'iteration': 2,
+            'old_experiment_ids': [1, 2, 3],
+            'old_experiments_configs': [[1, {'feature1': 1, 'feature2': 1, 'feature3': 1}],
+                                        [2, {'feature1': 2, 'feature2': 1.2, 'feature3': 2}],
+                                        [3, {'feature1': 3, 'feature2': 1.3, 'feature3': 3}]],
+            'old_experiments_metrics': [[1, 1], [2, 2], [3, 3]],
+            'experiment_ids': [4],
+            'experiments_configs': [[4, {'feature1': 2, 'feature2': 1.5, 'feature3': 4}]],
+            'experiments_metrics': [[4, 4]]
+        })
+        suggestions = self.manager1.get_suggestions(iteration_config)
+        assert len(suggestions) == 2
+        assert suggestions[0] != suggestions[1]
+
+    def test_iteration_state_is_kept_in_redis(self):
+        iteration_config = BOIterationConfig.from_dict({
+            'iteration': 2,
+            'old_experiment_ids': [1, 2, 3],
+            'old_experiments_configs': [[1, {'feature1': 1, 'feature2': 1, 'feature3': 1}],
+                                        [2, {'feature1': 2, 'feature2': 1.2, 'feature3': 2}],
+                                        [3, {'feature1': 3, 'feature2': 1.3, 'feature3': 3}]],
+            'old_experiments_metrics': [[1, 1], [2, 2], [3, 3]],
+            'experiment_ids': [4],
+            'experiments_configs': [[4, {'feature1': 2, 'feature2': 1.5, 'feature3': 4}]],
+            'experiments_metrics': [[4, 4]]
+        })
+        experiment_group_id = 1000
+        RedisHPSearchStates.clear_state(experiment_group_id=experiment_group_id)
+        self.manager1.get_suggestions(iteration_config, experiment_group_id=experiment_group_id)
+        state = RedisHPSearchStates.get_state(experiment_group_id=experiment_group_id)
+        assert state is not None
+
+        # The next iteration starts from the state of the previous one
+        with patch('hpsearch.search_managers.bayesian_optimization.manager.BOOptimizer',
+                   wraps=BOOptimizer) as optimizer_mock:
+            self.manager1.get_suggestions(iteration_config,
+                                          experiment_group_id=experiment_group_id)
+        assert optimizer_mock.call_args[1]['state'] is not None
+
+        RedisHPSearchStates.clear_state(experiment_group_id=experiment_group_id)
+        assert RedisHPSearchStates.get_state(experiment_group_id=experiment_group_id) is None
 
     def test_space_search(self):
         # Space 1
@@ -935,6 +1020,93 @@ class TestBOSearchManager(BaseTest):
         assert 1 <= suggestion['feature4'] <= 5
         assert suggestion['feature5'] in ['a', 'b', 'c']
 
+    def test_optimizer_get_suggestions_batch(self):
+        configs = [
+            {'feature1': 1, 'feature2': 1, 'feature3': 1},
+            {'feature1': 2, 'feature2': 1.2, 'feature3': 2},
+            {'feature1': 3, 'feature2': 1.3, 'feature3': 3},
+            {'feature1': 2, 'feature2': 1.5, 'feature3': 4},
+        ]
+        metrics = [1, 2, 3, 4]
+        pending_configs = [{'feature1': 3, 'feature2': 2, 'feature3': 5}]
+        for strategy in BatchStrategies.VALUES:
+            optimizer = BOOptimizer(hptuning_config=self.manager1.hptuning_config)
+            optimizer.add_observations(configs=configs, metrics=metrics)
+            suggestions = optimizer.get_suggestions(n_suggestions=4,
+                                                    strategy=strategy,
+                                                    pending_configs=pending_configs)
+            assert 1 <= len(suggestions) <= 4
+            x_suggestions = [tuple(x) for x in optimizer.space.parse_x(suggestions)]
+            assert len(set(x_suggestions)) == len(x_suggestions)
+            x_known = {tuple(x) for x in optimizer.space.parse_x(configs + pending_configs)}
+            assert not x_known & set(x_suggestions)
+
+    def test_utility_function_gradients(self):
+        random_state = np.random.RandomState(0)
+        x_train = random_state.uniform(0, 5, size=(20, 3))
+        y_train = np.sin(x_train).sum(axis=1)
+        x = random_state.uniform(0, 5, size=(5, 3))
+        for manager in [self.manager1, self.manager2]:
+            utility_function = BOOptimizer(
+                hptuning_config=manager.hptuning_config).utility_function
+            utility_function.gaussian_process.fit(x_train, y_train)
+            values, gradients = utility_function.compute_with_gradient(x, y_max=y_train.max())
+            assert np.allclose(values, utility_function.compute(x, y_max=y_train.max()))
+            assert gradients.shape == x.shape
+
+            # Finite differences
+            for i in range(3):
+                step = np.zeros(3)
+                step[i] = 1e-6
+                expected = (utility_function.compute(x + step, y_max=y_train.max()) -
+                            utility_function.compute(x - step, y_max=y_train.max())) / 2e-6
+                assert np.allclose(gradients[:, i], expected, rtol=1e-4, atol=1e-6)
+
+    def test_utility_function_fit_with_state(self):
+        random_state = np.random.RandomState(0)
+        x_train = random_state.uniform(0, 5, size=(22, 3))
+        y_train = np.sin(x_train).sum(axis=1)
+        x = random_state.uniform(0, 5, size=(5, 3))
+        utility_function = BOOptimizer(
+            hptuning_config=self.manager1.hptuning_config).utility_function
+        state = utility_function.fit(x_train[:20], y_train[:20])
+        assert state['n_optimized'] == 20
+
+        # The new observations update the previous fit
+        state = utility_function.fit(x_train, y_train, state=state)
+        assert state['n_optimized'] == 20
+        mean, std = utility_function.gaussian_process.predict(x, return_std=True)
+        utility_function.condition(x_train, y_train)
+        expected_mean, expected_std = utility_function.gaussian_process.predict(
+            x, return_std=True)
+        assert np.allclose(mean, expected_mean)
+        assert np.allclose(std, expected_std)
+
+        # The kernel hyperparameters are optimized again once the observations grew enough
+        state = utility_function.fit(x_train, y_train, state=dict(state, n_optimized=10))
+        assert state['n_optimized'] == 22
+
+    def test_utility_function_max_compute_candidates(self):
+        random_state = np.random.RandomState(0)
+        x_train = random_state.uniform(0, 5, size=(20, 3))
+        y_train = np.sin(x_train).sum(axis=1)
+        bounds = np.array([[0, 5], [0, 5], [0, 5]], dtype=float)
+        utility_function = BOOptimizer(
+            hptuning_config=self.manager1.hptuning_config).utility_function
+        utility_function.gaussian_process.fit(x_train, y_train)
+        x_optima, ys = utility_function.max_compute_candidates(y_max=y_train.max(),
+                                                               bounds=bounds,
+                                                               n_warmup=100,
+                                                               n_iter=20)
+        assert len(x_optima) == len(ys) <= 22
+        assert np.all(np.diff(ys) <= 0)
+        assert np.all(x_optima >= 0) and np.all(x_optima <= 5)
+        x_max = utility_function.max_compute(y_max=y_train.max(),
+                                             bounds=bounds,
+                                             n_warmup=100,
+                                             n_iter=20)
+        assert x_max.shape == (3,)
+
     @pytest.mark.filterwarnings('ignore::UserWarning')
     def test_concrete_example(self):
         hptuning_config = HPTuningConfig.from_dict({
@@ -36,7 +36,11 @@ from factories.fixtures import (
     experiment_spec_content
 )
 from libs.paths.experiments import create_experiment_outputs_path, get_experiment_outputs_path
-from scheduler.tasks.experiments import copy_experiment, experiments_set_metrics
+from scheduler.tasks.experiments import (
+    copy_experiment,
+    experiments_set_metrics,
+    get_experiments_jobs_statuses
+)
 from schemas.specifications import ExperimentSpecification
 from schemas.tasks import TaskType
 from tests.fixtures import start_experiment_value
@@ -348,15 +352,25 @@ class TestExperimentModel(BaseTest):
 
         assert experiment.metrics.count() == 1
 
-        experiments_set_metrics(experiment_id=experiment.id,
-                                data=[{
-                                    'created_at': create_at,
-                                    'values': {'accuracy': 0.9, 'precision': 0.9}
-                                }, {
-                                    'created_at': create_at,
-                                    'values': {'accuracy': 0.9, 'precision': 0.9}
-                                }])
+        with patch('auditor.record') as auditor_record:
+            experiments_set_metrics(experiment_id=experiment.id,
+                                    data=[{
+                                        'created_at': create_at,
+                                        'values': {'accuracy': 0.8, 'precision': 0.9}
+                                    }, {
+                                        'created_at': create_at,
+                                        'values': {'accuracy': 0.95, 'loss': 0.1}
+                                    }])
+
+        assert experiment.metrics.count() == 3
+        # A single event is recorded for the whole batch
+        assert auditor_record.call_count == 1
+        experiment.refresh_from_db()
+        assert experiment.last_metric == {'accuracy': 0.95, 'precision': 0.9, 'loss': 0.1}
 
+        # Invalid batches are not saved
+        experiments_set_metrics(experiment_id=experiment.id,
+                                data=[{'created_at': create_at}])
         assert experiment.metrics.count() == 3
 
     def test_master_success_influences_other_experiment_workers_status(self):
@@ -407,7 +421,7 @@ class TestExperimentModel(BaseTest):
 
         # Mock sync experiments and jobs constants
         with patch('scheduler.tasks.experiments.'
-                   'experiments_check_status.apply_async') as check_status_mock:
+                   'experiments_check_statuses.apply_async') as check_status_mock:
             experiments_sync_jobs_statuses()
 
         assert check_status_mock.call_count == 1
@@ -422,6 +436,19 @@ class TestExperimentModel(BaseTest):
         assert no_jobs_xp.last_status is None
         assert xp_with_jobs.last_status == ExperimentLifeCycle.RUNNING
 
+    def test_get_experiments_jobs_statuses(self):
+        with patch.object(Experiment, 'set_status') as _:  # noqa
+            experiment1 = ExperimentFactory()
+            experiment2 = ExperimentFactory()
+            master = ExperimentJobFactory(experiment=experiment1, role=TaskType.MASTER)
+            worker = ExperimentJobFactory(experiment=experiment1, role=TaskType.WORKER)
+            ExperimentJobStatusFactory(job=master, status=JobLifeCycle.RUNNING)
+            ExperimentJobStatusFactory(job=worker, status=JobLifeCycle.FAILED)
+
+        assert get_experiments_jobs_statuses([experiment1.id, experiment2.id]) == {
+            experiment1.id: (JobLifeCycle.RUNNING, {JobLifeCycle.RUNNING, JobLifeCycle.FAILED})
+        }
+
     def test_copying_an_experiment(self):
         with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
             experiment1 = ExperimentFactory()
@@ -24,7 +24,8 @@ from api.experiments.serializers import (
     ExperimentLastMetricSerializer,
     ExperimentMetricSerializer,
     ExperimentSerializer,
-    ExperimentStatusSerializer
+    ExperimentStatusSerializer,
+    ResourcesMetricSerializer
 )
 from api.utils.views.protected import ProtectedView
 from constants.experiments import ExperimentLifeCycle
@@ -40,6 +41,7 @@ from db.models.experiments import (
     ExperimentStatus
 )
 from db.models.repos import CodeReference
+from db.models.resources_metrics import ResourcesMetric, ResourcesMetricResolution
 from db.redis.ephemeral_tokens import RedisEphemeralTokens
 from db.redis.heartbeat import RedisHeartBeat
 from db.redis.tll import RedisTTL
@@ -59,12 +61,14 @@ from factories.fixtures import (
     exec_experiment_outputs_refs_parsed_content,
     exec_experiment_spec_parsed_content
 )
+from libs.logs_store import get_logs_store
 from libs.paths.experiments import (
     create_experiment_logs_path,
     create_experiment_outputs_path,
     get_experiment_logs_path,
     get_experiment_outputs_path
 )
+from libs.resources_metrics import create_resources_metrics
 from schemas.specifications import ExperimentSpecification
 from tests.utils import BaseFilesViewTest, BaseViewTest, EphemeralClient
 
@@ -1310,6 +1314,51 @@ class TestExperimentMetricListViewV1(BaseViewTest):
         assert last_object.experiment == self.experiment
         assert last_object.values == data['values']
 
+    def test_get_selected_metrics(self):
+        self.factory_class(experiment=self.experiment, values={'loss': 0.1, 'step': 1})
+        resp = self.auth_client.get('{}?metrics=loss,step'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 1
+        assert resp.data['results'][0]['values'] == {'loss': 0.1, 'step': 1}
+
+        resp = self.auth_client.get('{}?metrics=loss'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['results'][0]['values'] == {'loss': 0.1}
+
+    def test_get_range(self):
+        created_at = self.objects[1].created_at
+        resp = self.auth_client.get(self.url, {'start': created_at.isoformat()})
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == self.num_objects - 1
+
+        resp = self.auth_client.get(self.url, {'end': created_at.isoformat()})
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 2
+
+        resp = self.auth_client.get(self.url, {'start': 'foo'})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_downsampled(self):
+        for i in range(20):
+            self.factory_class(experiment=self.experiment, values={'accuracy': (i % 2) / 10})
+        resp = self.auth_client.get('{}?max_points=5'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 5
+
+        resp = self.auth_client.get('{}?max_points=6&downsampling=minmax'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] <= 6
+
+        resp = self.auth_client.get('{}?max_points=100'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == self.num_objects + 20
+
+        resp = self.auth_client.get('{}?max_points=foo'.format(self.url))
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+        resp = self.auth_client.get('{}?max_points=5&downsampling=foo'.format(self.url))
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
 
 @pytest.mark.experiments_mark
 class TestExperimentStatusDetailViewV1(BaseViewTest):
@@ -1893,13 +1942,13 @@ class TestExperimentOutputsLogsViewV1(BaseViewTest):
             project.name,
             experiment.id)
 
-        log_path = get_experiment_logs_path(experiment.unique_name)
+        self.log_path = get_experiment_logs_path(experiment.unique_name)
         create_experiment_logs_path(experiment_name=experiment.unique_name)
         fake = Faker()
         self.logs = []
         for _ in range(self.num_log_lines):
             self.logs.append(fake.sentence())
-        with open(log_path, 'w') as file:
+        with open(self.log_path, 'w') as file:
             for line in self.logs:
                 file.write(line)
                 file.write('\n')
@@ -1913,6 +1962,42 @@ class TestExperimentOutputsLogsViewV1(BaseViewTest):
         assert len(data) == len(self.logs)
         assert data == self.logs
 
+    def get_lines(self, url):
+        resp = self.auth_client.get(url)
+        assert resp.status_code == status.HTTP_200_OK
+        return [d for d in b''.join(resp.streaming_content).decode('utf-8').split('\n') if d]
+
+    def test_get_tail(self):
+        assert self.get_lines(self.url + '?tail=3') == self.logs[-3:]
+        assert self.get_lines(self.url + '?tail=100') == self.logs
+        assert self.get_lines(self.url + '?tail=0') == []
+
+    def test_get_range(self):
+        assert self.get_lines(self.url + '?start_line=2&end_line=5') == self.logs[2:5]
+        assert self.get_lines(self.url + '?start_line=8') == self.logs[8:]
+        assert self.get_lines(self.url + '?end_line=2') == self.logs[:2]
+
+    def test_get_since(self):
+        assert self.get_lines(self.url + '?since=0') == self.logs
+
+    def test_get_archived(self):
+        get_logs_store(self.log_path).archive()
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        data = b''.join(resp.streaming_content).decode('utf-8')
+        assert int(resp['Content-Length']) == len(data)
+        assert [d for d in data.split('\n') if d] == self.logs
+        assert self.get_lines(self.url + '?tail=3') == self.logs[-3:]
+        assert self.get_lines(self.url + '?start_line=2&end_line=5') == self.logs[2:5]
+
+    def test_get_invalid_selection(self):
+        resp = self.auth_client.get(self.url + '?tail=foo')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        resp = self.auth_client.get(self.url + '?since=foo')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        resp = self.auth_client.get(self.url + '?tail=2&start_line=1')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_post_logs(self):
         resp = self.auth_client.post(self.url)
         assert resp.status_code == status.HTTP_400_BAD_REQUEST
@@ -2287,3 +2372,92 @@ class TestExperimentHeartBeatViewV1(BaseViewTest):
         resp = self.internal_client.post(self.url)
         assert resp.status_code == status.HTTP_200_OK
         self.assertEqual(RedisHeartBeat.experiment_is_alive(self.experiment.id), True)
+
+
+@pytest.mark.experiments_mark
+class TestExperimentResourcesMetricListViewV1(BaseViewTest):
+    serializer_class = ResourcesMetricSerializer
+    model_class = ResourcesMetric
+    HAS_AUTH = True
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        project = ProjectFactory(user=self.auth_client.user)
+        self.experiment = ExperimentFactory(project=project)
+        self.job1 = ExperimentJobFactory(experiment=self.experiment)
+        self.job2 = ExperimentJobFactory(experiment=self.experiment)
+        self.url = '/{}/{}/{}/experiments/{}/resources/'.format(API_V1,
+                                                                project.user.username,
+                                                                project.name,
+                                                                self.experiment.id)
+        self.job_url = '/{}/{}/{}/experiments/{}/jobs/{}/resources/'.format(
+            API_V1,
+            project.user.username,
+            project.name,
+            self.experiment.id,
+            self.job1.id)
+        payloads = [{
+            'job_uuid': job.uuid.hex,
+            'cpu_percentage': 0.6,
+            'n_cpus': 2,
+            'memory_used': 84467712,
+            'memory_limit': 2096160768,
+            'gpu_resources': None,
+        } for job in [self.job1, self.job2]]
+        self.start = time.time()
+        create_resources_metrics(payloads=payloads, timestamp=self.start)
+        create_resources_metrics(payloads=payloads, timestamp=self.start + 60)
+        # Another experiment
+        create_resources_metrics(payloads=[{
+            'job_uuid': ExperimentJobFactory().uuid.hex,
+            'cpu_percentage': 0.6,
+            'n_cpus': 2,
+            'memory_used': 84467712,
+            'memory_limit': 2096160768,
+        }])
+        self.queryset = self.model_class.objects.filter(
+            job__experiment=self.experiment).order_by('created_at')
+
+    def test_get(self):
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['next'] is None
+        assert resp.data['count'] == 4
+
+        data = resp.data['results']
+        assert data == self.serializer_class(self.queryset, many=True).data
+
+    def test_get_job(self):
+        resp = self.auth_client.get(self.job_url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 2
+
+        data = resp.data['results']
+        assert data == self.serializer_class(self.queryset.filter(job=self.job1),
+                                             many=True).data
+
+    def test_get_filter(self):
+        queryset = self.queryset.filter(created_at__gte=self.queryset.last().created_at)
+        resp = self.auth_client.get('{}?start={}'.format(
+            self.url, queryset.first().created_at.isoformat().replace('+', '%2B')))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 2
+        assert resp.data['results'] == self.serializer_class(queryset, many=True).data
+
+        resp = self.auth_client.get('{}?resolution=hour'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 0
+
+        resp = self.auth_client.get('{}?resolution=raw'.format(self.url))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 4
+        assert all(r['resolution'] == ResourcesMetricResolution.RAW
+                   for r in resp.data['results'])
+
+    def test_get_filter_wrong_values(self):
+        resp = self.auth_client.get('{}?start=foo'.format(self.url))
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+        resp = self.auth_client.get('{}?resolution=day'.format(self.url))
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,52 @@
+import pytest
+
+from libs.downsampling import (
+    DownsamplingMethods,
+    downsample,
+    lttb,
+    min_max,
+    min_max_buckets
+)
+from tests.utils import BaseTest
+
+
+@pytest.mark.libs_mark
+class TestDownsampling(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.points = [(i, 0) for i in range(100)]
+        # A spike that should be kept by both methods
+        self.points[50] = (50, 10)
+
+    def test_lttb(self):
+        assert lttb(self.points, 200) == list(range(100))
+        assert lttb(self.points, 2) == [0, 99]
+        indices = lttb(self.points, 10)
+        assert len(indices) == 10
+        assert indices == sorted(set(indices))
+        assert indices[0] == 0
+        assert indices[-1] == 99
+        assert 50 in indices
+
+    def test_min_max(self):
+        assert min_max(self.points, 200) == list(range(100))
+        indices = min_max(self.points, 10)
+        assert len(indices) <= 10
+        assert indices == sorted(set(indices))
+        assert 50 in indices
+        assert min_max(self.points, 1) == [0]
+        assert len(min_max(self.points, 3)) <= 3
+
+    def test_min_max_buckets(self):
+        # 10 buckets of 10 points
+        points = ((i // 10, i, y) for i, (_, y) in enumerate(self.points))
+        keys = min_max_buckets(points)
+        assert len(keys) <= 20
+        assert 50 in keys
+        assert min_max_buckets([]) == set()
+
+    def test_downsample(self):
+        assert downsample(self.points, 10) == lttb(self.points, 10)
+        assert downsample(self.points, 10, DownsamplingMethods.MIN_MAX) == min_max(self.points, 10)
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import time
+
+import pytest
+
+from libs.logs_store import LogsStore
+from tests.utils import BaseTest
+
+
+@pytest.mark.libs_mark
+class TestLogsStore(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.log_path = os.path.join(tempfile.mkdtemp(), '1')
+        self.store = LogsStore(log_path=self.log_path,
+                               segment_size=200,
+                               index_interval_bytes=30,
+                               index_interval_seconds=1000)
+        self.lines = ['line {}'.format(i) for i in range(50)]
+        for line in self.lines:
+            self.store.append(line)
+
+    def test_append_seals_segments(self):
+        assert len(self.store.get_sealed_segments()) > 0
+        assert self.store.get_segments()[-1] == self.log_path
+        assert self.store.read_index(self.log_path)
+        for segment in self.store.get_sealed_segments():
+            assert os.path.getsize(segment) >= 200
+            assert self.store.read_index(segment)
+
+        content = b''.join(self.store.iter_chunks()).decode('utf-8')
+        assert content.splitlines() == self.lines
+        assert self.store.get_size() == len(content)
+
+    def test_tail(self):
+        assert self.store.tail(0) == []
+        assert self.store.tail(3) == self.lines[-3:]
+        assert self.store.tail(40) == self.lines[-40:]
+        assert self.store.tail(100) == self.lines
+
+    def test_read_range(self):
+        assert list(self.store.read_range(10, 15)) == self.lines[10:15]
+        assert list(self.store.read_range(20, 45)) == self.lines[20:45]
+        assert list(self.store.read_range(45)) == self.lines[45:]
+        assert list(self.store.read_range(end_line=3)) == self.lines[:3]
+        assert list(self.store.read_range(60)) == []
+
+    def test_read_since(self):
+        assert list(self.store.read_since(0)) == self.lines
+        lines = list(self.store.read_since(time.time() + 10))
+        assert len(lines) < len(self.lines)
+        assert lines == self.lines[len(self.lines) - len(lines):]
+
+    def test_unindexed_logs(self):
+        self.store.delete()
+        with open(self.log_path, 'w') as log_file:
+            log_file.write('a\nb\nc\n')
+
+        assert self.store.tail(2) == ['b', 'c']
+        assert list(self.store.read_range(1)) == ['b', 'c']
+        self.store.append('d')
+        assert self.store.read_index(self.log_path)[0].line == 3
+        assert list(self.store.read_range(2)) == ['c', 'd']
+
+    def test_archive(self):
+        size = self.store.get_size()
+        self.store.archive()
+
+        segments = self.store.get_segments()
+        assert os.path.exists(self.log_path) is False
+        assert all(self.store.is_compressed(segment) for segment in segments)
+        assert self.store.get_size() == size
+        content = b''.join(self.store.iter_chunks()).decode('utf-8')
+        assert content.splitlines() == self.lines
+        assert self.store.tail(3) == self.lines[-3:]
+        assert self.store.tail(100) == self.lines
+        assert list(self.store.read_range(10, 15)) == self.lines[10:15]
+        assert list(self.store.read_range(45)) == self.lines[45:]
+        assert list(self.store.read_since(0)) == self.lines
+
+        # Archiving again is a no-op
+        self.store.archive()
+        assert self.store.get_segments() == segments
+
+        # Logs appended after the archive are still readable
+        self.store.append('new line')
+        assert self.store.tail(2) == [self.lines[-1], 'new line']
+        assert list(self.store.read_range(49)) == [self.lines[-1], 'new line']
+
+    def test_append_and_archive_after_an_archive(self):
+        self.store.archive()
+        num_segments = len(self.store.get_sealed_segments())
+
+        # Late lines seal new segments numbered after the compressed ones
+        late_lines = ['late line {}'.format(i) for i in range(30)]
+        for line in late_lines:
+            self.store.append(line)
+        assert len(self.store.get_sealed_segments()) > num_segments
+
+        self.store.archive()
+        segments = self.store.get_segments()
+        assert all(self.store.is_compressed(segment) for segment in segments)
+        content = b''.join(self.store.iter_chunks()).decode('utf-8')
+        assert content.splitlines() == self.lines + late_lines
+        assert list(self.store.read_range(48, 52)) == self.lines[48:] + late_lines[:2]
+
+    def test_archive_unindexed_logs(self):
+        self.store.delete()
+        self.store.MAX_MEMBER_SIZE = 20
+        lines = ['a' * 5, 'b' * 70, 'c' * 3, 'd' * 45, 'e']
+        with open(self.log_path, 'w') as log_file:
+            log_file.write('\n'.join(lines) + '\n')
+
+        self.store.archive()
+        # A member per line boundary, lines longer than the member size are not split
+        assert [entry.line for entry in self.store.read_index(self.log_path + '.1.gz')] == [
+            0, 1, 3, 5]
+        for start_line in range(len(lines)):
+            assert list(self.store.read_range(start_line)) == lines[start_line:]
+        assert self.store.tail(2) == lines[-2:]
+
+    def test_delete(self):
+        assert self.store.exists()
+        self.store.archive()
+        self.store.append('new line')
+        self.store.delete()
+        assert self.store.exists() is False
+        assert os.listdir(os.path.dirname(self.log_path)) == []
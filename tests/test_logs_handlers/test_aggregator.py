@@ -0,0 +1,200 @@
+import uuid
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from db.redis.to_stream import RedisToStream
+from factories.factory_build_jobs import BuildJobFactory
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_jobs import JobFactory
+from libs.paths.experiments import get_experiment_logs_path
+from libs.paths.jobs import get_job_logs_path
+from logs_handlers.aggregator import LogsAggregator, LogsAggregatorConsumer
+from polyaxon.settings import LogsCeleryTasks
+from tests.utils import BaseTest
+
+
+@pytest.mark.logs_heandlers_mark
+class TestLogsAggregator(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.job = JobFactory()
+        self.build = BuildJobFactory()
+        self.aggregator = LogsAggregator(flush_size=1000,
+                                         flush_interval=60,
+                                         existence_ttl=60,
+                                         monitored_ttl=60)
+
+    def add_experiment_logs(self, log_lines, experiment=None, job_uuid=None):
+        experiment = experiment or self.experiment
+        return self.aggregator.add(
+            task_name=LogsCeleryTasks.LOGS_SIDECARS_EXPERIMENTS,
+            kwargs={'experiment_name': experiment.unique_name,
+                    'experiment_uuid': experiment.uuid.hex,
+                    'job_uuid': job_uuid or uuid.uuid4().hex,
+                    'log_lines': log_lines})
+
+    @staticmethod
+    def read_logs(log_path):
+        with open(log_path, 'r') as log_file:
+            return log_file.read().splitlines()
+
+    def test_add(self):
+        assert self.aggregator.is_empty is True
+        assert self.aggregator.add(task_name='foo', kwargs={'log_lines': 'foo'}) is False
+        assert self.add_experiment_logs('') is False
+        assert self.aggregator.add(task_name=LogsCeleryTasks.LOGS_HANDLE_JOB,
+                                   kwargs={'log_lines': 'foo'}) is False
+        assert self.aggregator.is_empty is True
+
+        assert self.add_experiment_logs('foo') is True
+        assert self.aggregator.is_empty is False
+        assert self.aggregator.should_flush() is False
+
+        self.add_experiment_logs('a' * 1000)
+        assert self.aggregator.should_flush() is True
+
+        self.aggregator.clear()
+        self.aggregator.flush_interval = 0
+        self.add_experiment_logs('foo')
+        assert self.aggregator.should_flush() is True
+
+    def test_flush_writes_logs_per_file(self):
+        self.add_experiment_logs('xp line 1')
+        self.aggregator.add(task_name=LogsCeleryTasks.LOGS_SIDECARS_JOBS,
+                            kwargs={'job_name': self.job.unique_name,
+                                    'job_uuid': self.job.uuid.hex,
+                                    'log_lines': 'job line 1'})
+        self.add_experiment_logs('xp line 2\nxp line 3')
+        self.aggregator.add(task_name=LogsCeleryTasks.LOGS_HANDLE_BUILD_JOB,
+                            kwargs={'job_name': self.build.unique_name,
+                                    'job_uuid': self.build.uuid.hex,
+                                    'log_lines': ['build line 1', 'build line 2']})
+
+        self.aggregator.flush()
+        assert self.aggregator.is_empty is True
+        assert self.read_logs(get_experiment_logs_path(self.experiment.unique_name)) == [
+            'xp line 1', 'xp line 2', 'xp line 3']
+        assert self.read_logs(get_job_logs_path(self.job.unique_name)) == ['job line 1']
+        assert self.read_logs(get_job_logs_path(self.build.unique_name)) == [
+            'build line 1', 'build line 2']
+
+        # One write per file
+        self.add_experiment_logs('xp line 4')
+        self.add_experiment_logs('xp line 5')
+        with patch('logs_handlers.utils._lock_log') as mock_lock_log:
+            self.aggregator.flush()
+        assert mock_lock_log.call_count == 1
+        assert mock_lock_log.call_args[0][1] == 'xp line 4\nxp line 5'
+
+    def test_flush_skips_non_existing_objects(self):
+        experiment = ExperimentFactory()
+        experiment_name = experiment.unique_name
+        experiment.delete()
+        self.add_experiment_logs('foo', experiment=experiment)
+        self.add_experiment_logs('bar')
+        self.aggregator.flush()
+
+        assert self.read_logs(get_experiment_logs_path(self.experiment.unique_name)) == ['bar']
+        with self.assertRaises(FileNotFoundError):
+            self.read_logs(get_experiment_logs_path(experiment_name))
+
+    def test_existence_is_cached(self):
+        self.add_experiment_logs('foo')
+        self.aggregator.flush()
+
+        self.add_experiment_logs('bar')
+        with self.assertNumQueries(0):
+            self.aggregator.flush()
+        assert self.read_logs(get_experiment_logs_path(self.experiment.unique_name)) == [
+            'foo', 'bar']
+
+    def test_flush_streams_monitored_logs(self):
+        job_uuid = uuid.uuid4().hex
+        RedisToStream.monitor_job_logs(job_uuid)
+        RedisToStream.monitor_job_logs(self.job.uuid.hex)
+        self.add_experiment_logs('foo', job_uuid=job_uuid)
+        self.add_experiment_logs('bar', job_uuid=job_uuid)
+        self.add_experiment_logs('not monitored')
+        self.aggregator.add(task_name=LogsCeleryTasks.LOGS_SIDECARS_JOBS,
+                            kwargs={'job_name': self.job.unique_name,
+                                    'job_uuid': self.job.uuid.hex,
+                                    'log_lines': 'job line'})
+        self.aggregator.add(task_name=LogsCeleryTasks.LOGS_HANDLE_JOB,
+                            kwargs={'job_name': self.job.unique_name,
+                                    'job_uuid': self.job.uuid.hex,
+                                    'log_lines': 'posted job line'})
+
+        with patch('publisher.stream_experiment_job_log') as mock_stream_experiment:
+            with patch('publisher.stream_job_log') as mock_stream_job:
+                self.aggregator.flush()
+
+        # The logs of the same job are coalesced
+        assert mock_stream_experiment.call_count == 1
+        assert mock_stream_experiment.call_args[1] == {
+            'log_lines': 'foo\nbar',
+            'experiment_uuid': self.experiment.uuid.hex,
+            'job_uuid': job_uuid
+        }
+        assert mock_stream_job.call_count == 1
+        assert mock_stream_job.call_args[1] == {'log_lines': 'job line',
+                                                'job_uuid': self.job.uuid.hex}
+        assert self.read_logs(get_job_logs_path(self.job.unique_name)) == ['job line',
+                                                                           'posted job line']
+
+
+@pytest.mark.logs_heandlers_mark
+class TestLogsAggregatorConsumer(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.consumer = LogsAggregatorConsumer(
+            connection=None,
+            aggregator=LogsAggregator(flush_size=1000,
+                                      flush_interval=60,
+                                      existence_ttl=60,
+                                      monitored_ttl=60),
+            prefetch_count=10)
+
+    def get_message(self, log_lines):
+        message = MagicMock(headers={'task': LogsCeleryTasks.LOGS_HANDLE_EXPERIMENT_JOB})
+        body = [[], {'experiment_name': self.experiment.unique_name,
+                     'experiment_uuid': self.experiment.uuid.hex,
+                     'log_lines': log_lines}, {}]
+        return body, message
+
+    def test_get_task(self):
+        body, message = self.get_message('foo')
+        assert self.consumer.get_task(body, message) == (
+            LogsCeleryTasks.LOGS_HANDLE_EXPERIMENT_JOB, body[1])
+        assert self.consumer.get_task({'task': 'foo', 'kwargs': {'a': 1}}, message) == (
+            'foo', {'a': 1})
+
+    def test_messages_are_acknowledged_after_flush(self):
+        body1, message1 = self.get_message('foo')
+        body2, message2 = self.get_message('bar')
+        self.consumer.on_message(body1, message1)
+        self.consumer.on_message(body2, message2)
+        self.consumer.on_iteration()
+        assert message1.ack.call_count == 0
+        assert message2.ack.call_count == 0
+
+        self.consumer.aggregator.flush_interval = 0
+        self.consumer.on_iteration()
+        assert message1.ack.call_count == 1
+        assert message2.ack.call_count == 1
+        log_path = get_experiment_logs_path(self.experiment.unique_name)
+        with open(log_path, 'r') as log_file:
+            assert log_file.read().splitlines() == ['foo', 'bar']
+
+    def test_unexpected_messages_are_acknowledged(self):
+        message = MagicMock(headers={'task': 'foo'})
+        self.consumer.on_message([[], {}, {}], message)
+        assert message.ack.call_count == 1
+        assert self.consumer.aggregator.is_empty is True
@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from django.http import Http404
+
+from api.utils.serializers.bookmarks import get_request_bookmarks
+from constants import content_types
+from db.models.bookmarks import Bookmark
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_projects import ProjectFactory
+from libs.permissions.projects import get_permissible_project
+from tests.utils import BaseTest
+
+
+class Request(object):
+    method = 'GET'
+
+    def __init__(self, user):
+        self.user = user
+
+
+@pytest.mark.projects_mark
+class TestPermissibleProject(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory()
+
+    def get_view(self, project_name=None):
+        view = MagicMock(permission_classes=())
+        view.kwargs = {'username': self.project.user.username,
+                       'name': project_name or self.project.name}
+        view.request = Request(user=self.project.user)
+        return view
+
+    def test_project_is_resolved_once_per_request(self):
+        view = self.get_view()
+        with self.assertNumQueries(1):
+            assert get_permissible_project(view=view) == self.project
+            assert get_permissible_project(view=view) == self.project
+
+    def test_project_is_not_cached_across_requests(self):
+        get_permissible_project(view=self.get_view())
+        self.project.is_public = False
+        self.project.save()
+        with self.assertNumQueries(1):
+            assert get_permissible_project(view=self.get_view()).is_public is False
+
+        self.project.delete()
+        with self.assertRaises(Http404):
+            get_permissible_project(view=self.get_view())
+
+    def test_permissions_are_checked_for_the_project(self):
+        self.project.is_public = False
+        self.project.save()
+        view = self.get_view()
+        view.request = Request(user=ExperimentFactory().user)
+        get_permissible_project(view=view)
+        assert view.permission_denied.call_count == 1
+
+
+@pytest.mark.projects_mark
+class TestRequestBookmarks(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.user = self.experiment.user
+
+    def test_bookmarks_are_fetched_once(self):
+        Bookmark.objects.create(user=self.user, content_object=self.experiment)
+        request = Request(user=self.user)
+        with self.assertNumQueries(1):
+            assert get_request_bookmarks(request, content_types.EXPERIMENT) == {
+                self.experiment.id}
+            assert get_request_bookmarks(request, content_types.EXPERIMENT) == {
+                self.experiment.id}
+
+    def test_bookmarks_are_not_cached_across_requests(self):
+        assert get_request_bookmarks(Request(user=self.user), content_types.EXPERIMENT) == set()
+        bookmark = Bookmark.objects.create(user=self.user, content_object=self.experiment)
+        assert get_request_bookmarks(Request(user=self.user), content_types.EXPERIMENT) == {
+            self.experiment.id}
+        bookmark.delete()
+        assert get_request_bookmarks(Request(user=self.user), content_types.EXPERIMENT) == set()
@@ -72,3 +72,12 @@ class TestRedisHeartBeat(BaseTest):
         RedisHeartBeat.build_ping(1)
         self.assertEqual(heartbeat.is_alive(), True)
         self.assertEqual(RedisHeartBeat.build_is_alive(1), True)
+
+    def test_redis_heartbeat_get_dead(self):
+        assert RedisHeartBeat.get_dead_experiments([]) == []
+        RedisHeartBeat.experiment_ping(1)
+        RedisHeartBeat.job_ping(2)
+        RedisHeartBeat.build_ping(3)
+        assert RedisHeartBeat.get_dead_experiments([1, 2, 3]) == [2, 3]
+        assert RedisHeartBeat.get_dead_jobs([1, 2, 3]) == [1, 3]
+        assert RedisHeartBeat.get_dead_builds([1, 2, 3]) == [1, 2]
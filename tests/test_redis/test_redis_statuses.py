@@ -0,0 +1,22 @@
+import pytest
+
+from db.redis.statuses import RedisStatuses
+from tests.utils import BaseTest
+
+
+@pytest.mark.redis_mark
+class TestRedisStatuses(BaseTest):
+    def test_mark_and_pop_experiments(self):
+        assert RedisStatuses.pop_experiments() == []
+        assert RedisStatuses.mark_experiments([]) is False
+
+        # Only the first mark should schedule a drain
+        assert RedisStatuses.mark_experiment(1) is True
+        assert RedisStatuses.mark_experiment(1) is False
+        assert RedisStatuses.mark_experiments([2, 3]) is False
+
+        assert sorted(RedisStatuses.pop_experiments()) == [1, 2, 3]
+        assert RedisStatuses.pop_experiments() == []
+
+        # Once drained a new drain could be scheduled
+        assert RedisStatuses.mark_experiment(1) is True
@@ -105,3 +105,52 @@ class TestRedisToStream(BaseTest):
         assert RedisToStream.is_monitored_experiment_logs(experiment_uuid) is True
         RedisToStream.remove_experiment_logs(experiment_uuid)
         assert RedisToStream.is_monitored_experiment_logs(experiment_uuid) is False
+
+    def test_get_latest_jobs_resources(self):
+        job_uuid1 = uuid.uuid4().hex
+        job_uuid2 = uuid.uuid4().hex
+        job_uuid3 = uuid.uuid4().hex
+        RedisToStream.set_latest_job_resources(job_uuid1, {'cpu_percentage': 0.5})
+        RedisToStream.set_latest_job_resources(job_uuid2, {'cpu_percentage': 0.2})
+        jobs = [{'uuid': job_uuid1, 'name': 'master.1'},
+                {'uuid': job_uuid2, 'name': 'worker.2'},
+                {'uuid': job_uuid3, 'name': 'worker.3'}]
+
+        assert RedisToStream.get_latest_jobs_resources([]) == []
+        assert RedisToStream.get_latest_jobs_resources(jobs) == [
+            {'cpu_percentage': 0.5, 'job_name': 'master.1'},
+            {'cpu_percentage': 0.2, 'job_name': 'worker.2'},
+        ]
+        assert RedisToStream.get_latest_experiment_resources(jobs, as_json=True) == [
+            {'cpu_percentage': 0.5, 'job_name': 'master.1'},
+            {'cpu_percentage': 0.2, 'job_name': 'worker.2'},
+        ]
+
+    def test_get_monitored_resources(self):
+        job_uuid = uuid.uuid4().hex
+        experiment_uuid = uuid.uuid4().hex
+        assert RedisToStream.get_monitored_resources() == (set(), set())
+        RedisToStream.monitor_job_resources(job_uuid)
+        RedisToStream.monitor_experiment_resources(experiment_uuid)
+        RedisToStream.monitor_job_logs(uuid.uuid4().hex)
+        assert RedisToStream.get_monitored_resources() == ({job_uuid}, {experiment_uuid})
+
+    def test_get_monitored_logs(self):
+        job_uuid = uuid.uuid4().hex
+        experiment_uuid = uuid.uuid4().hex
+        assert RedisToStream.get_monitored_logs() == (set(), set())
+        RedisToStream.monitor_job_logs(job_uuid)
+        RedisToStream.monitor_experiment_logs(experiment_uuid)
+        RedisToStream.monitor_job_resources(uuid.uuid4().hex)
+        assert RedisToStream.get_monitored_logs() == ({job_uuid}, {experiment_uuid})
+
+    def test_set_latest_jobs_resources(self):
+        job_uuid1 = uuid.uuid4().hex
+        job_uuid2 = uuid.uuid4().hex
+        RedisToStream.set_latest_jobs_resources({})
+        RedisToStream.set_latest_jobs_resources({job_uuid1: {'cpu_percentage': 0.5},
+                                                 job_uuid2: {'cpu_percentage': 0.2}})
+        assert RedisToStream.get_latest_job_resources(job_uuid1, 'master.1', True) == {
+            'cpu_percentage': 0.5, 'job_name': 'master.1'}
+        assert RedisToStream.get_latest_job_resources(job_uuid2, 'worker.2', True) == {
+            'cpu_percentage': 0.2, 'job_name': 'worker.2'}
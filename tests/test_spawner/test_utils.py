@@ -82,3 +82,6 @@ class TestSpawner(BaseTest):
         job_uuid, experiment_uuid = RedisJobContainers.get_job(container_id)
         assert job.uuid.hex == job_uuid
         assert job.experiment.uuid.hex == experiment_uuid
+        assert RedisJobContainers.get_containers_jobs() == {
+            container_id: (job.uuid.hex, job.experiment.uuid.hex)
+        }